@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from alembic import op
+
+revision = "0015_add_transcript_cache_lookup_index"
+down_revision = "0014_add_external_sources"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_session_extractions_session_kind_model_created",
+        "session_extractions",
+        ["session_id", "kind", "model", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_session_extractions_session_kind_model_created",
+        table_name="session_extractions",
+    )
@@ -27,12 +27,12 @@ async def release_transcript_cache_activity(payload: dict) -> dict:
     if not settings.enable_explicit_cache or not _should_release(status):
         return {"run_id": run_id, "released": 0, "skipped": True}
 
-    from google import genai
+    from dnd_summary.llm_cache import genai_client
 
     if not settings.gemini_api_key:
         return {"run_id": run_id, "released": 0, "skipped": True}
 
-    client = genai.Client(api_key=settings.gemini_api_key)
+    client = genai_client()
     released = 0
     now = datetime.now(timezone.utc).isoformat()
 
@@ -195,7 +195,7 @@ async def extract_session_facts_activity(payload: dict) -> dict:
             client = LLMClient()
             start = time.monotonic()
             try:
-                raw_json, usage = client.generate_json_schema(
+                raw_json, usage = await client.agenerate_json_schema(
                     prompt,
                     schema=session_facts_schema(),
                     cached_content=cache_name,
@@ -302,7 +302,7 @@ async def extract_session_facts_activity(payload: dict) -> dict:
                 quote_usage_meta = {**transcript_stats, **quote_prompt_stats, **base_usage}
                 start = time.monotonic()
                 try:
-                    quote_json, usage = client.generate_json_schema(
+                    quote_json, usage = await client.agenerate_json_schema(
                         quote_prompt,
                         schema=quotes_schema(),
                         cached_content=cache_name,
@@ -407,7 +407,7 @@ async def extract_session_facts_activity(payload: dict) -> dict:
                 event_usage_meta = {**transcript_stats, **event_prompt_stats, **base_usage}
                 start = time.monotonic()
                 try:
-                    event_json, usage = client.generate_json_schema(
+                    event_json, usage = await client.agenerate_json_schema(
                         event_prompt,
                         schema=events_schema(),
                         cached_content=cache_name,
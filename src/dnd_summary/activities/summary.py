@@ -263,7 +263,7 @@ async def plan_summary_activity(payload: dict) -> dict:
             client = LLMClient()
             start = time.monotonic()
             try:
-                raw_json, usage = client.generate_json_schema(
+                raw_json, usage = await client.agenerate_json_schema(
                     prompt,
                     schema=summary_plan_schema(),
                     cached_content=cache_name,
@@ -441,14 +441,32 @@ async def write_summary_activity(payload: dict) -> dict:
             client = LLMClient()
             summaries: dict[str, str] = {}
 
-            for variant in SUMMARY_VARIANTS:
-                prompt = _load_prompt(variant["prompt"]).format(
+            prompts = [
+                _load_prompt(variant["prompt"]).format(
                     summary_plan=plan_json,
                     session_facts=facts_json,
                     quote_bank=quote_bank or "[none]",
                     character_map=json.dumps(character_map, sort_keys=True),
                     transcript_block=transcript_block,
                 )
+                for variant in SUMMARY_VARIANTS
+            ]
+            # Variants share the cached transcript and don't depend on each other, so
+            # their requests overlap. When the cache is mandatory one variant goes first,
+            # so a miss fails after a single uncached call rather than one per variant.
+            if settings.require_transcript_cache:
+                results = await client.generate_many(prompts[:1], cached_content=cache_name)
+                probe = results[0]
+                if probe.error is None and cache_hit_from_usage(probe.usage, cache_name):
+                    results += await client.generate_many(prompts[1:], cached_content=cache_name)
+            else:
+                results = await client.generate_many(prompts, cached_content=cache_name)
+
+            # Record every call before failing, so usage from variants that did complete
+            # is kept; the first failure is raised once all of them are added.
+            first_error: Exception | None = None
+            completed: list[tuple[dict, str]] = []
+            for variant, prompt, result in zip(SUMMARY_VARIANTS, prompts, results):
                 prompt_stats = build_text_metrics("prompt", prompt)
                 usage_meta = {
                     **transcript_stats,
@@ -460,61 +478,33 @@ async def write_summary_activity(payload: dict) -> dict:
                     "summary_variant": variant["kind"],
                 }
 
-                start = time.monotonic()
-                try:
-                    summary_text, usage = client.generate_text(
-                        prompt,
-                        cached_content=cache_name,
-                        return_usage=True,
-                    )
-                    latency_ms = int((time.monotonic() - start) * 1000)
-                    cache_hit = cache_hit_from_usage(usage, cache_name)
-                    if settings.require_transcript_cache and not cache_hit:
-                        session.add(
-                            LLMCall(
-                                run_id=run.id,
-                                session_id=session_id,
-                                kind=variant["kind"],
-                                model=settings.gemini_model,
-                                prompt_id=variant["prompt"],
-                                prompt_version=variant["prompt_version"],
-                                input_hash=sha256(prompt.encode("utf-8")).hexdigest(),
-                                output_hash=sha256(b"").hexdigest(),
-                                latency_ms=latency_ms,
-                                status="error",
-                                error=f"Transcript cache miss for {variant['kind']}.",
-                                created_at=datetime.utcnow(),
-                            )
-                        )
-                        record_llm_usage(
-                            session,
-                            run_id=run.id,
-                            session_id=session_id,
-                            prompt_id=variant["prompt"],
-                            prompt_version=variant["prompt_version"],
-                            call_kind=variant["kind"],
-                            usage=usage,
-                            cache_name=cache_name,
-                            metadata=usage_meta,
-                        )
-                        raise CacheRequiredError(
-                            f"Transcript cache miss for {variant['kind']}."
-                        )
-                    session.add(
-                        LLMCall(
-                            run_id=run.id,
-                            session_id=session_id,
-                            kind=variant["kind"],
-                            model=settings.gemini_model,
-                            prompt_id=variant["prompt"],
-                            prompt_version=variant["prompt_version"],
-                            input_hash=sha256(prompt.encode("utf-8")).hexdigest(),
-                            output_hash=sha256(summary_text.encode("utf-8")).hexdigest(),
-                            latency_ms=latency_ms,
-                            status="success",
-                            created_at=datetime.utcnow(),
-                        )
+                summary_text, usage, latency_ms = result.text, result.usage, result.latency_ms
+                error = result.error
+                if (
+                    error is None
+                    and settings.require_transcript_cache
+                    and not cache_hit_from_usage(usage, cache_name)
+                ):
+                    error = CacheRequiredError(f"Transcript cache miss for {variant['kind']}.")
+                session.add(
+                    LLMCall(
+                        run_id=run.id,
+                        session_id=session_id,
+                        kind=variant["kind"],
+                        model=settings.gemini_model,
+                        prompt_id=variant["prompt"],
+                        prompt_version=variant["prompt_version"],
+                        input_hash=sha256(prompt.encode("utf-8")).hexdigest(),
+                        output_hash=sha256(
+                            summary_text.encode("utf-8") if error is None else b""
+                        ).hexdigest(),
+                        latency_ms=latency_ms,
+                        status="success" if error is None else "error",
+                        error=None if error is None else str(error)[:2000],
+                        created_at=datetime.utcnow(),
                     )
+                )
+                if error is None or isinstance(error, CacheRequiredError):
                     record_llm_usage(
                         session,
                         run_id=run.id,
@@ -526,30 +516,15 @@ async def write_summary_activity(payload: dict) -> dict:
                         cache_name=cache_name,
                         metadata=usage_meta,
                     )
-                except CacheRequiredError:
-                    session.commit()
-                    raise
-                except Exception as exc:
-                    latency_ms = int((time.monotonic() - start) * 1000)
-                    session.add(
-                        LLMCall(
-                            run_id=run.id,
-                            session_id=session_id,
-                            kind=variant["kind"],
-                            model=settings.gemini_model,
-                            prompt_id=variant["prompt"],
-                            prompt_version=variant["prompt_version"],
-                            input_hash=sha256(prompt.encode("utf-8")).hexdigest(),
-                            output_hash=sha256(b"").hexdigest(),
-                            latency_ms=latency_ms,
-                            status="error",
-                            error=str(exc)[:2000],
-                            created_at=datetime.utcnow(),
-                        )
-                    )
-                    session.commit()
-                    raise
+                if error is None:
+                    completed.append((variant, summary_text))
+                elif first_error is None:
+                    first_error = error
+            if first_error is not None:
+                session.commit()
+                raise first_error
 
+            for variant, summary_text in completed:
                 try:
                     _validate_summary_quotes(summary_text, list(quote_lookup.values()))
                 except ValueError:
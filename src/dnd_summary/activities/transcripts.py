@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from dataclasses import dataclass
 import json
 from datetime import datetime
@@ -7,6 +8,8 @@ from hashlib import sha256
 from pathlib import Path
 from typing import Literal
 
+import numpy as np
+from sqlalchemy.orm import load_only
 from temporalio import activity
 
 from dnd_summary.campaign_config import CampaignConfig, load_campaign_config, speaker_alias_map
@@ -15,9 +18,10 @@ from dnd_summary.db import get_session
 from dnd_summary.external_sources import (
     find_character_sheet_paths,
     find_rolls_path,
+    iter_rolls,
     load_character_sheet,
-    parse_rolls_jsonl,
 )
+from dnd_summary.mappings import invalidate_character_map_after_commit
 from dnd_summary.models import (
     Campaign,
     CharacterSheetSnapshot,
@@ -105,7 +109,7 @@ def _ensure_participants(
         if entry.role and not participant.role:
             participant.role = entry.role
         if entry.speaker_aliases:
-            participant.speaker_aliases = entry.speaker_aliases
+            participant.speaker_aliases = list(entry.speaker_aliases)
         participants[display_name] = participant
 
         if entry.character and entry.character.name:
@@ -154,6 +158,7 @@ def _ensure_participants(
                         entity_id=entity.id,
                     )
                 )
+                invalidate_character_map_after_commit(session, campaign.id)
 
     return participants
 
@@ -191,6 +196,7 @@ def _ingest_character_sheets(
             continue
         existing = (
             session.query(CharacterSheetSnapshot)
+            .options(load_only(CharacterSheetSnapshot.source_hash))
             .filter_by(session_id=session_obj.id, character_slug=character_slug)
             .all()
         )
@@ -218,19 +224,27 @@ def _ingest_character_sheets(
     return {"count": stored, "errors": errors}
 
 
-def _align_roll_to_utterance(roll_ms: int, utterances: list[Utterance]) -> str | None:
+def _roll_aligner(utterances: list[Utterance]) -> Callable[[int], str | None]:
+    """Map a roll time to the first utterance spanning it, else the nearest utterance.
+
+    Utterance bounds are packed into arrays once, so each roll costs a few vectorized
+    passes instead of a Python loop over every utterance.
+    """
     if not utterances:
-        return None
-    best_id = None
-    best_distance = None
-    for utt in utterances:
-        if utt.start_ms <= roll_ms <= utt.end_ms:
-            return utt.id
-        distance = min(abs(roll_ms - utt.start_ms), abs(roll_ms - utt.end_ms))
-        if best_distance is None or distance < best_distance:
-            best_distance = distance
-            best_id = utt.id
-    return best_id
+        return lambda _roll_ms: None
+    ids = [utt.id for utt in utterances]
+    starts = np.fromiter((utt.start_ms for utt in utterances), dtype=np.int64, count=len(ids))
+    ends = np.fromiter((utt.end_ms for utt in utterances), dtype=np.int64, count=len(ids))
+
+    def _align(roll_ms: int) -> str | None:
+        spanning = (starts <= roll_ms) & (roll_ms <= ends)
+        if spanning.any():
+            return ids[int(spanning.argmax())]
+        distance = np.minimum(np.abs(starts - roll_ms), np.abs(ends - roll_ms))
+        # argmin keeps the first of equally near utterances, like the strict `<` scan did.
+        return ids[int(distance.argmin())]
+
+    return _align
 
 
 def _ingest_dice_rolls(
@@ -258,8 +272,9 @@ def _ingest_dice_rolls(
             .order_by(DiceRoll.roll_index.asc())
             .all()
         )
+        align = _roll_aligner(utterances)
         for roll in existing_rolls:
-            roll.utterance_id = _align_roll_to_utterance(roll.t_ms, utterances)
+            roll.utterance_id = align(roll.t_ms)
         return {"count": 0, "errors": []}
     if existing:
         session.query(DiceRoll).filter_by(
@@ -267,9 +282,12 @@ def _ingest_dice_rolls(
             source_path=source_path,
         ).delete(synchronize_session=False)
 
-    rolls, errors = parse_rolls_jsonl(rolls_path)
-    for roll in rolls:
-        utterance_id = _align_roll_to_utterance(roll.t_ms, utterances)
+    align = _roll_aligner(utterances)
+    errors: list[str] = []
+    count = 0
+    for roll in iter_rolls(rolls_path, errors):
+        count += 1
+        utterance_id = align(roll.t_ms)
         session.add(
             DiceRoll(
                 campaign_id=campaign.id,
@@ -288,7 +306,7 @@ def _ingest_dice_rolls(
             )
         )
 
-    return {"count": len(rolls), "errors": errors}
+    return {"count": count, "errors": errors}
 
 
 @activity.defn
@@ -1,24 +1,38 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import re
+import threading
 import uuid
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from pathlib import Path
 from datetime import datetime
-from typing import Annotated
+from typing import Annotated, Any, Callable, Iterator
 
-from fastapi import FastAPI, File, HTTPException, Query, Request, UploadFile
-from fastapi.responses import FileResponse, HTMLResponse, RedirectResponse
+from fastapi import FastAPI, File, HTTPException, Query, Request, Response, UploadFile
+from fastapi.responses import FileResponse, HTMLResponse, RedirectResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from sqlalchemy import func, or_
-from sqlalchemy.orm import joinedload
+from sqlalchemy import case, func, or_, select
+from sqlalchemy.orm import raiseload, selectinload
+import numpy as np
+import numpy.typing as npt
+import orjson
 import tempfile
 import zipfile
 
 from dnd_summary.config import settings
 from dnd_summary.db import get_session
-from dnd_summary.embeddings import cosine_similarity, embed_texts
+from dnd_summary.embeddings import (
+    cosine_similarity,
+    cosine_similarity_batch,
+    cosine_similarity_normalized,
+    embed_query,
+    stored_embedding_version,
+    unit_vector,
+)
 from dnd_summary.llm import LLMClient
+from dnd_summary.lookup_cache import CampaignLookupCache
 from dnd_summary.mappings import load_character_map
 from dnd_summary.rerank import RerankCandidate, rerank
 from dnd_summary.models import (
@@ -51,7 +65,7 @@ from dnd_summary.models import (
     User,
 )
 from dnd_summary.schema_genai import ask_campaign_schema, semantic_search_schema
-from dnd_summary.transcript_format import format_transcript
+from dnd_summary.transcript_format import format_transcript_lines
 from dnd_summary.workflows.process_session import ProcessSessionWorkflow
 
 
@@ -61,6 +75,13 @@ UI_ROOT = Path(__file__).resolve().parent / "ui"
 if UI_ROOT.exists():
     app.mount("/ui", StaticFiles(directory=UI_ROOT, html=True), name="ui")
 
+BUNDLE_STREAM_CHUNK_SIZE = 500
+_BUNDLE_EXECUTOR: ThreadPoolExecutor | None = None
+_BUNDLE_EXECUTOR_WORKERS = 0
+_BUNDLE_EXECUTOR_LOCK = threading.Lock()
+_TITLE_TOKEN_SPLIT_RE = re.compile(r"\W+")
+_SPOILER_MAP_CACHE: CampaignLookupCache[dict[str, dict[str, int]]] = CampaignLookupCache()
+
 
 def _validate_slug(value: str, label: str) -> None:
     if not re.fullmatch(r"[A-Za-z0-9_-]+", value):
@@ -181,12 +202,12 @@ def _thread_correction_maps(
     return hidden_ids, merge_map, title_map, status_map, summary_map
 
 
-def _redacted_ids(corrections: list[Correction]) -> set[str]:
-    redacted: set[str] = set()
-    for correction in corrections:
-        if correction.action in ("redact", "redaction", "redact_text"):
-            redacted.add(correction.target_id)
-    return redacted
+def _redacted_ids(corrections: list[Correction]) -> frozenset[str]:
+    return frozenset(
+        correction.target_id
+        for correction in corrections
+        if correction.action in ("redact", "redaction", "redact_text")
+    )
 
 
 def _auth_user_id(request: Request) -> str | None:
@@ -283,9 +304,101 @@ def _spoiler_cutoff(
     return latest_number
 
 
-def _spoiler_map(session, campaign_id: str) -> dict[tuple[str, str], int]:
-    tags = session.query(SpoilerTag).filter_by(campaign_id=campaign_id).all()
-    return {(tag.target_type, tag.target_id): tag.reveal_session_number for tag in tags}
+def _spoiler_map(session, campaign_id: str) -> dict[str, dict[str, int]]:
+    """Reveal session numbers keyed by target type, then by bare target id."""
+    return _SPOILER_MAP_CACHE.get_or_load(
+        campaign_id,
+        lambda: _query_spoiler_map(session, campaign_id),
+    )
+
+
+def _query_spoiler_map(session, campaign_id: str) -> dict[str, dict[str, int]]:
+    rows = session.execute(
+        select(SpoilerTag.target_type, SpoilerTag.target_id, SpoilerTag.reveal_session_number)
+        .where(SpoilerTag.campaign_id == campaign_id)
+    ).all()
+    by_type: dict[str, dict[str, int]] = {}
+    for target_type, target_id, reveal in rows:
+        by_type.setdefault(target_type, {})[target_id] = reveal
+    return by_type
+
+
+def _mapping_rows(session, statement) -> list[dict[str, Any]]:
+    """Column projections as plain dicts, skipping ORM instance construction."""
+    return [dict(row) for row in session.execute(statement).mappings()]
+
+
+def _mentioned_entity_ids(session_id: str, run_id: str):
+    """Entity ids mentioned in a run, for ``IN`` semi-joins that avoid DISTINCT on wide rows."""
+    return select(EntityMention.entity_id).where(
+        EntityMention.session_id == session_id,
+        EntityMention.run_id == run_id,
+    )
+
+
+def _visibility_filters(
+    id_column,
+    target_type: str,
+    campaign_id: str,
+    excluded_ids: set[str],
+    spoiler_cutoff: int | None,
+) -> list:
+    """SQL criteria that drop corrected-away and not-yet-revealed rows in the query itself."""
+    filters = []
+    if excluded_ids:
+        filters.append(id_column.not_in(sorted(excluded_ids)))
+    if spoiler_cutoff is not None:
+        hidden_by_spoiler = select(SpoilerTag.target_id).where(
+            SpoilerTag.campaign_id == campaign_id,
+            SpoilerTag.target_type == target_type,
+            SpoilerTag.reveal_session_number > spoiler_cutoff,
+        )
+        filters.append(id_column.not_in(hidden_by_spoiler))
+    return filters
+
+
+def _run_readonly_queries(queries: dict[str, Callable[[Session], Any]]) -> dict[str, Any]:
+    """Run independent read-only queries concurrently, each on its own short-lived session.
+
+    Sessions are not thread-safe, so every query opens its own via ``get_session`` on the
+    shared bundle executor. Loaded rows come back detached; only use this for lookups whose
+    results are not written to.
+    """
+
+    def _run(query: Callable[[Session], Any]) -> Any:
+        with get_session() as db:
+            return query(db)
+
+    executor = _bundle_executor()
+    futures = {name: executor.submit(_run, query) for name, query in queries.items()}
+    done, _ = wait(futures.values(), return_when=FIRST_EXCEPTION)
+    for future in done:
+        error = future.exception()
+        if error is not None:
+            for pending in futures.values():
+                pending.cancel()
+            raise error
+    return {name: future.result() for name, future in futures.items()}
+
+
+def _bundle_executor() -> ThreadPoolExecutor:
+    """Process-wide query pool, sized so concurrent bundles cannot drain the DB pool.
+
+    One pooled connection is left for the request's own session; queued queries wait for
+    a worker instead of each request checking out a connection per query.
+    """
+    global _BUNDLE_EXECUTOR
+    global _BUNDLE_EXECUTOR_WORKERS
+    workers = max(1, settings.db_pool_size - 1)
+    with _BUNDLE_EXECUTOR_LOCK:
+        if _BUNDLE_EXECUTOR is None or _BUNDLE_EXECUTOR_WORKERS != workers:
+            if _BUNDLE_EXECUTOR is not None:
+                _BUNDLE_EXECUTOR.shutdown(wait=False)
+            _BUNDLE_EXECUTOR = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="bundle-query"
+            )
+            _BUNDLE_EXECUTOR_WORKERS = workers
+        return _BUNDLE_EXECUTOR
 
 
 @app.get("/", include_in_schema=False)
@@ -439,7 +552,7 @@ def create_note(payload: dict, request: Request) -> dict:
             "target_type": note.target_type,
             "target_id": note.target_id,
             "body": note.body,
-            "created_at": note.created_at.isoformat(),
+            "created_at": note.created_at,
         }
 
 
@@ -475,7 +588,7 @@ def list_notes(
                 "target_id": note.target_id,
                 "body": note.body,
                 "created_by": note.created_by,
-                "created_at": note.created_at.isoformat(),
+                "created_at": note.created_at,
             }
             for note in notes
         ]
@@ -516,7 +629,7 @@ def create_bookmark(payload: dict, request: Request) -> dict:
                 "id": existing.id,
                 "target_type": existing.target_type,
                 "target_id": existing.target_id,
-                "created_at": existing.created_at.isoformat(),
+                "created_at": existing.created_at,
             }
         bookmark = Bookmark(
             campaign_id=campaign.id,
@@ -531,7 +644,7 @@ def create_bookmark(payload: dict, request: Request) -> dict:
             "id": bookmark.id,
             "target_type": bookmark.target_type,
             "target_id": bookmark.target_id,
-            "created_at": bookmark.created_at.isoformat(),
+            "created_at": bookmark.created_at,
         }
 
 
@@ -560,7 +673,7 @@ def list_bookmarks(
                 "target_type": bookmark.target_type,
                 "target_id": bookmark.target_id,
                 "created_by": bookmark.created_by,
-                "created_at": bookmark.created_at.isoformat(),
+                "created_at": bookmark.created_at,
             }
             for bookmark in bookmarks
         ]
@@ -594,6 +707,7 @@ def create_spoiler(payload: dict, request: Request) -> dict:
             existing.reveal_session_number = int(reveal_session_number)
             existing.created_by = created_by
             session.flush()
+            _SPOILER_MAP_CACHE.invalidate_after_commit(session, campaign.id)
             return {
                 "id": existing.id,
                 "target_type": existing.target_type,
@@ -609,6 +723,7 @@ def create_spoiler(payload: dict, request: Request) -> dict:
         )
         session.add(tag)
         session.flush()
+        _SPOILER_MAP_CACHE.invalidate_after_commit(session, campaign.id)
         return {
             "id": tag.id,
             "target_type": tag.target_type,
@@ -666,11 +781,11 @@ def list_sessions(campaign_slug: str, request: Request) -> list[dict]:
                     "slug": s.slug,
                     "session_number": s.session_number,
                     "title": s.title,
-                    "occurred_at": s.occurred_at.isoformat() if s.occurred_at else None,
+                    "occurred_at": s.occurred_at,
                     "latest_run_id": latest_run.id if latest_run else None,
                     "latest_run_status": latest_run.status if latest_run else None,
                     "latest_run_created_at": (
-                        latest_run.created_at.isoformat() if latest_run else None
+                        latest_run.created_at if latest_run else None
                     ),
                 }
             )
@@ -730,7 +845,7 @@ def create_session(
             "slug": session_obj.slug,
             "session_number": session_obj.session_number,
             "title": session_obj.title,
-            "occurred_at": session_obj.occurred_at.isoformat(),
+            "occurred_at": session_obj.occurred_at,
         }
 
 
@@ -791,8 +906,8 @@ def list_admin_runs(campaign_slug: str, request: Request) -> list[dict]:
                 "session_id": run.session_id,
                 "session_slug": session_obj.slug,
                 "status": run.status,
-                "created_at": run.created_at.isoformat(),
-                "finished_at": run.finished_at.isoformat() if run.finished_at else None,
+                "created_at": run.created_at,
+                "finished_at": run.finished_at,
             }
             for run, session_obj in runs
         ]
@@ -822,7 +937,8 @@ def list_entities(
             "hide",
         }
         spoiler_cutoff = _spoiler_cutoff(session, campaign.id, request, session_id)
-        spoiler_map = _spoiler_map(session, campaign.id)
+        entity_spoilers = _spoiler_map(session, campaign.id).get("entity", {})
+        excluded_ids = frozenset(hidden_ids) | frozenset(merge_map)
         entities = (
             session.query(Entity)
             .filter_by(campaign_id=campaign.id)
@@ -838,11 +954,8 @@ def list_entities(
                 "corrected": _has_correction(corrections, e.id, corrected_actions),
             }
             for e in entities
-            if e.id not in hidden_ids and e.id not in merge_map
-            and (
-                spoiler_cutoff is None
-                or spoiler_map.get(("entity", e.id), 0) <= spoiler_cutoff
-            )
+            if e.id not in excluded_ids
+            and (spoiler_cutoff is None or entity_spoilers.get(e.id, 0) <= spoiler_cutoff)
         ]
 
 
@@ -1116,10 +1229,7 @@ def list_entity_quotes(
         if session_id:
             query = query.filter(Quote.session_id == session_id)
         quotes = query.all()
-        utterance_lookup = _utterance_lookup(
-            session,
-            {quote.session_id for quote in quotes},
-        )
+        utterance_lookup = _quote_utterance_lookup(session, quotes)
         return [
             {
                 "id": q.id,
@@ -1149,14 +1259,13 @@ def list_session_entities(
         corrections = _load_corrections(session, session_obj.campaign_id, session_id, "entity")
         hidden_ids, merge_map, rename_map = _entity_correction_maps(corrections)
         spoiler_cutoff = _spoiler_cutoff(session, session_obj.campaign_id, request, session_id)
-        spoiler_map = _spoiler_map(session, session_obj.campaign_id)
+        entity_spoilers = _spoiler_map(session, session_obj.campaign_id).get("entity", {})
+        excluded_ids = frozenset(hidden_ids) | frozenset(merge_map)
         resolved_run_id = _resolve_run_id(session, session_id, run_id)
         entities = (
             session.query(Entity)
-            .join(EntityMention, EntityMention.entity_id == Entity.id)
-            .filter(EntityMention.session_id == session_id, EntityMention.run_id == resolved_run_id)
+            .filter(Entity.id.in_(_mentioned_entity_ids(session_id, resolved_run_id)))
             .order_by(Entity.entity_type.asc(), Entity.canonical_name.asc())
-            .distinct()
             .all()
         )
         return [
@@ -1167,11 +1276,8 @@ def list_session_entities(
                 "description": e.description,
             }
             for e in entities
-            if e.id not in hidden_ids and e.id not in merge_map
-            and (
-                spoiler_cutoff is None
-                or spoiler_map.get(("entity", e.id), 0) <= spoiler_cutoff
-            )
+            if e.id not in excluded_ids
+            and (spoiler_cutoff is None or entity_spoilers.get(e.id, 0) <= spoiler_cutoff)
         ]
 
 
@@ -1185,6 +1291,7 @@ def list_mentions(
         session_obj = _session_for_id(session, session_id, request)
         corrections = _load_corrections(session, session_obj.campaign_id, session_id, "entity")
         hidden_ids, merge_map, rename_map = _entity_correction_maps(corrections)
+        excluded_ids = frozenset(hidden_ids) | frozenset(merge_map)
         resolved_run_id = _resolve_run_id(session, session_id, run_id)
         mentions = (
             session.query(Mention, Entity)
@@ -1203,16 +1310,16 @@ def list_mentions(
                 "evidence": mention.evidence,
                 "confidence": mention.confidence,
                 "entity_id": (
-                    entity.id if entity and entity.id not in hidden_ids and entity.id not in merge_map else None
+                    entity.id if entity and entity.id not in excluded_ids else None
                 ),
                 "entity_name": (
                     rename_map.get(entity.id, entity.canonical_name)
-                    if entity and entity.id not in hidden_ids and entity.id not in merge_map
+                    if entity and entity.id not in excluded_ids
                     else None
                 ),
                 "entity_type_resolved": (
                     entity.entity_type
-                    if entity and entity.id not in hidden_ids and entity.id not in merge_map
+                    if entity and entity.id not in excluded_ids
                     else None
                 ),
             }
@@ -1238,12 +1345,14 @@ def list_quotes(
         redacted_quotes = _redacted_ids(quote_corrections)
         redacted_utterances = _redacted_ids(utterance_corrections)
         resolved_run_id = _resolve_run_id(session, session_id, run_id)
-        quotes = (
-            session.query(Quote)
+        quotes = [
+            q
+            for q in session.query(Quote)
             .filter_by(session_id=session_id, run_id=resolved_run_id)
             .all()
-        )
-        utterance_lookup = _utterance_lookup(session, {session_id})
+            if q.id not in redacted_quotes and q.utterance_id not in redacted_utterances
+        ]
+        utterance_lookup = _quote_utterance_lookup(session, quotes)
         return [
             {
                 "id": q.id,
@@ -1256,7 +1365,6 @@ def list_quotes(
                 "display_text": _quote_display_text(q, utterance_lookup),
             }
             for q in quotes
-            if q.id not in redacted_quotes and q.utterance_id not in redacted_utterances
         ]
 
 
@@ -1579,7 +1687,7 @@ def semantic_search_campaign(
             utterance_query = utterance_query.filter(or_(*utterance_filters))
         utterances_raw = utterance_query.limit(80).all()
 
-        utterance_lookup = _utterance_lookup(session, {u.session_id for u in quotes_raw})
+        utterance_lookup = _quote_utterance_lookup(session, quotes_raw)
 
         mentions = [
             {
@@ -1607,7 +1715,7 @@ def semantic_search_campaign(
             }
             for e in events_raw
             if spoiler_cutoff is None
-            or spoiler_map.get(("event", e.id), 0) <= spoiler_cutoff
+            or spoiler_map.get("event", {}).get(e.id, 0) <= spoiler_cutoff
         ]
         scenes = [
             {
@@ -1638,7 +1746,7 @@ def semantic_search_campaign(
             if t.id not in hidden_threads and t.id not in merge_threads
             and (
                 spoiler_cutoff is None
-                or spoiler_map.get(("thread", t.id), 0) <= spoiler_cutoff
+                or spoiler_map.get("thread", {}).get(t.id, 0) <= spoiler_cutoff
             )
         ]
         updates = [
@@ -1715,14 +1823,17 @@ def semantic_retrieve_campaign(
         if not include_all_runs:
             run_ids = _latest_run_ids_for_campaign(session, campaign.id)
 
-        query_vector = embed_texts([q])[0]
+        query_vector = embed_query(q)
+        query_unit = unit_vector(query_vector)
         embedding_query = _embedding_query_base(session, campaign.id, run_ids, session_id)
 
         embeddings: list[Embedding] = []
+        dense_scores: dict[str, float] = {}
         dialect = session.bind.dialect.name if session.bind else "unknown"
         dense_top_k = max(settings.semantic_dense_top_k, top_k)
         if dialect == "postgresql":
-            distance = Embedding.embedding.op("<->")(query_vector)
+            # pgvector binds plain lists; the cached ndarray stays float32 for scoring below.
+            distance = Embedding.embedding.op("<->")(query_vector.tolist())
             embeddings = (
                 embedding_query.order_by(distance.asc())
                 .limit(dense_top_k)
@@ -1730,15 +1841,15 @@ def semantic_retrieve_campaign(
             )
         else:
             candidates = embedding_query.all()
-            scored = [
-                (entry, cosine_similarity(entry.embedding or [], query_vector))
-                for entry in candidates
-            ]
-            scored.sort(key=lambda item: item[1], reverse=True)
-            embeddings = [entry for entry, _score in scored[:dense_top_k]]
+            dense_scores = _batch_dense_scores(candidates, query_vector)
+            candidates.sort(key=lambda entry: dense_scores[entry.id], reverse=True)
+            embeddings = candidates[:dense_top_k]
 
         if not embeddings:
             return {"query": q, "results": [], "missing_embeddings": True}
+        for entry in embeddings:
+            if entry.id not in dense_scores:
+                dense_scores[entry.id] = _dense_score(entry, query_vector, query_unit)
 
         entity_ids = {e.target_id for e in embeddings if e.target_type == "entity"}
         event_ids = {e.target_id for e in embeddings if e.target_type == "event"}
@@ -1749,12 +1860,17 @@ def semantic_retrieve_campaign(
 
         entity_corrections = _load_corrections(session, campaign.id, session_id, "entity")
         hidden_entities, merge_entities, rename_entities = _entity_correction_maps(entity_corrections)
+        excluded_entities = frozenset(hidden_entities) | frozenset(merge_entities)
         thread_corrections = _load_corrections(session, campaign.id, session_id, "thread")
         hidden_threads, merge_threads, title_map, status_map, summary_map = _thread_correction_maps(
             thread_corrections
         )
+        excluded_threads = frozenset(hidden_threads) | frozenset(merge_threads)
         spoiler_cutoff = _spoiler_cutoff(session, campaign.id, request, session_id)
         spoiler_map = _spoiler_map(session, campaign.id)
+        entity_spoilers = spoiler_map.get("entity", {})
+        event_spoilers = spoiler_map.get("event", {})
+        thread_spoilers = spoiler_map.get("thread", {})
         quote_corrections = _load_corrections(session, campaign.id, session_id, "quote")
         utterance_corrections = _load_corrections(
             session,
@@ -1808,9 +1924,12 @@ def semantic_retrieve_campaign(
         for entry in embeddings:
             if entry.target_type == "entity":
                 entity = entity_lookup.get(entry.target_id)
-                if not entity or entity.id in hidden_entities or entity.id in merge_entities:
+                if not entity or entity.id in excluded_entities:
                     continue
-                if spoiler_cutoff is not None and spoiler_map.get(("entity", entity.id), 0) > spoiler_cutoff:
+                if (
+                    spoiler_cutoff is not None
+                    and entity_spoilers.get(entity.id, 0) > spoiler_cutoff
+                ):
                     continue
                 evidence = entity_evidence.get(entity.id, [])
                 if not evidence:
@@ -1824,7 +1943,7 @@ def semantic_retrieve_campaign(
                         "description": entity.description,
                         "evidence": evidence,
                         "content": entry.content,
-                        "dense_score": cosine_similarity(_embedding_values(entry), query_vector),
+                        "dense_score": dense_scores[entry.id],
                     }
                 )
                 continue
@@ -1833,7 +1952,7 @@ def semantic_retrieve_campaign(
                 event = event_lookup.get(entry.target_id)
                 if not event:
                     continue
-                if spoiler_cutoff is not None and spoiler_map.get(("event", event.id), 0) > spoiler_cutoff:
+                if spoiler_cutoff is not None and event_spoilers.get(event.id, 0) > spoiler_cutoff:
                     continue
                 evidence = _filter_evidence_spans(event.evidence, redacted_utterances)
                 if not evidence:
@@ -1847,7 +1966,7 @@ def semantic_retrieve_campaign(
                         "summary": event.summary,
                         "evidence": evidence,
                         "content": entry.content,
-                        "dense_score": cosine_similarity(_embedding_values(entry), query_vector),
+                        "dense_score": dense_scores[entry.id],
                     }
                 )
                 continue
@@ -1868,16 +1987,19 @@ def semantic_retrieve_campaign(
                         "summary": scene.summary,
                         "evidence": evidence,
                         "content": entry.content,
-                        "dense_score": cosine_similarity(_embedding_values(entry), query_vector),
+                        "dense_score": dense_scores[entry.id],
                     }
                 )
                 continue
 
             if entry.target_type == "thread":
                 thread = thread_lookup.get(entry.target_id)
-                if not thread or thread.id in hidden_threads or thread.id in merge_threads:
+                if not thread or thread.id in excluded_threads:
                     continue
-                if spoiler_cutoff is not None and spoiler_map.get(("thread", thread.id), 0) > spoiler_cutoff:
+                if (
+                    spoiler_cutoff is not None
+                    and thread_spoilers.get(thread.id, 0) > spoiler_cutoff
+                ):
                     continue
                 evidence = _filter_evidence_spans(thread.evidence, redacted_utterances)
                 if not evidence:
@@ -1892,7 +2014,7 @@ def semantic_retrieve_campaign(
                         "status": status_map.get(thread.id, thread.status),
                         "evidence": evidence,
                         "content": entry.content,
-                        "dense_score": cosine_similarity(_embedding_values(entry), query_vector),
+                        "dense_score": dense_scores[entry.id],
                     }
                 )
                 continue
@@ -1918,7 +2040,7 @@ def semantic_retrieve_campaign(
                         ),
                         "evidence": evidence,
                         "content": entry.content,
-                        "dense_score": cosine_similarity(_embedding_values(entry), query_vector),
+                        "dense_score": dense_scores[entry.id],
                     }
                 )
                 continue
@@ -1939,7 +2061,7 @@ def semantic_retrieve_campaign(
                         "text": utt.text,
                         "evidence": evidence,
                         "content": entry.content,
-                        "dense_score": cosine_similarity(_embedding_values(entry), query_vector),
+                        "dense_score": dense_scores[entry.id],
                     }
                 )
 
@@ -2110,7 +2232,7 @@ def list_events(
     with get_session() as session:
         session_obj = _session_for_id(session, session_id, request)
         spoiler_cutoff = _spoiler_cutoff(session, session_obj.campaign_id, request, session_id)
-        spoiler_map = _spoiler_map(session, session_obj.campaign_id)
+        event_spoilers = _spoiler_map(session, session_obj.campaign_id).get("event", {})
         resolved_run_id = _resolve_run_id(session, session_id, run_id)
         events = (
             session.query(Event)
@@ -2130,8 +2252,7 @@ def list_events(
                 "confidence": e.confidence,
             }
             for e in events
-            if spoiler_cutoff is None
-            or spoiler_map.get(("event", e.id), 0) <= spoiler_cutoff
+            if spoiler_cutoff is None or event_spoilers.get(e.id, 0) <= spoiler_cutoff
         ]
 
 
@@ -2147,6 +2268,7 @@ def list_threads(
         hidden_ids, merge_map, title_map, status_map, summary_map = _thread_correction_maps(
             corrections
         )
+        excluded_ids = frozenset(hidden_ids) | frozenset(merge_map)
         resolved_run_id = _resolve_run_id(session, session_id, run_id)
         threads = (
             session.query(Thread)
@@ -2169,7 +2291,7 @@ def list_threads(
                     "note": update.note,
                     "evidence": update.evidence,
                     "related_event_ids": update.related_event_ids,
-                    "created_at": update.created_at.isoformat(),
+                    "created_at": update.created_at,
                 }
             )
         return [
@@ -2182,11 +2304,11 @@ def list_threads(
                 "summary": summary_map.get(t.id, t.summary),
                 "evidence": t.evidence,
                 "confidence": t.confidence,
-                "created_at": t.created_at.isoformat(),
+                "created_at": t.created_at,
                 "updates": updates_by_thread.get(t.id, []),
             }
             for t in threads
-            if t.id not in hidden_ids and t.id not in merge_map
+            if t.id not in excluded_ids
         ]
 
 
@@ -2255,26 +2377,46 @@ def _utterance_ids_from_evidence(entries: list[dict] | None) -> set[str]:
     return ids
 
 
-def _utterance_lookup(session, session_ids: set[str]) -> dict[str, str]:
-    if not session_ids:
-        return {}
-    utterances = (
-        session.query(Utterance)
-        .filter(Utterance.session_id.in_(sorted(session_ids)))
-        .all()
-    )
-    return {utt.id: utt.text for utt in utterances}
-
-
 def _utterance_lookup_by_id(session, utterance_ids: set[str]) -> dict[str, str]:
     if not utterance_ids:
         return {}
-    utterances = (
-        session.query(Utterance)
-        .filter(Utterance.id.in_(sorted(utterance_ids)))
-        .all()
+    rows = session.execute(
+        select(Utterance.id, Utterance.text).where(Utterance.id.in_(sorted(utterance_ids)))
+    ).all()
+    return {utt_id: text for utt_id, text in rows}
+
+
+def _quote_utterance_lookup(session, quotes) -> dict[str, str]:
+    """Utterance text for the quotes whose display text must be sliced from the transcript."""
+    return _utterance_lookup_by_id(
+        session,
+        {q.utterance_id for q in quotes if not q.clean_text and q.utterance_id},
     )
-    return {utt.id: utt.text for utt in utterances}
+
+
+def _latest_summary_texts(
+    session,
+    session_id: str,
+    run_id: str,
+    kinds: set[str],
+) -> dict[str, str]:
+    """Latest non-empty summary text per kind, read out of the payload in SQL."""
+    text = SessionExtraction.payload["text"].as_string()
+    rows = session.execute(
+        select(SessionExtraction.kind, text)
+        .where(
+            SessionExtraction.session_id == session_id,
+            SessionExtraction.run_id == run_id,
+            SessionExtraction.kind.in_(kinds),
+            text.is_not(None),
+            text != "",
+        )
+        .order_by(SessionExtraction.created_at.desc())
+    ).all()
+    texts: dict[str, str] = {}
+    for kind, value in rows:
+        texts.setdefault(kind, value)
+    return texts
 
 
 def _quote_display_text(quote: Quote, utterance_lookup: dict[str, str]) -> str | None:
@@ -2318,29 +2460,31 @@ def _resolve_run_id(session, session_id: str, run_id: str | None) -> str:
 
 
 def _latest_run_ids_for_campaign(session, campaign_id: str) -> set[str]:
-    session_rows = session.query(Session).filter_by(campaign_id=campaign_id).all()
-    selected_by_session = {
-        row.id: row.current_run_id for row in session_rows if row.current_run_id
-    }
-    runs = (
-        session.query(Run)
-        .filter_by(campaign_id=campaign_id)
-        .order_by(Run.created_at.desc())
-        .all()
+    selected = session.scalars(
+        select(Session.current_run_id).where(
+            Session.campaign_id == campaign_id,
+            Session.current_run_id.is_not(None),
+        )
+    ).all()
+    # Newest completed run per session, falling back to the newest run of any status.
+    ranked = (
+        select(
+            Run.id,
+            func.row_number()
+            .over(
+                partition_by=Run.session_id,
+                order_by=(
+                    case((Run.status == "completed", 0), else_=1),
+                    Run.created_at.desc(),
+                ),
+            )
+            .label("rank"),
+        )
+        .where(Run.campaign_id == campaign_id)
+        .subquery()
     )
-    latest_by_session: dict[str, str] = {}
-    fallback_by_session: dict[str, str] = {}
-    for run in runs:
-        if run.session_id not in fallback_by_session:
-            fallback_by_session[run.session_id] = run.id
-        if run.status != "completed":
-            continue
-        if run.session_id not in latest_by_session:
-            latest_by_session[run.session_id] = run.id
-    for session_id, run_id in fallback_by_session.items():
-        if session_id not in latest_by_session:
-            latest_by_session[session_id] = run_id
-    return set(selected_by_session.values()) | set(latest_by_session.values())
+    latest = session.scalars(select(ranked.c.id).where(ranked.c.rank == 1)).all()
+    return set(selected) | set(latest)
 
 
 def _simple_score(text: str, query: str) -> float:
@@ -2357,7 +2501,7 @@ def _embedding_query_base(session, campaign_id: str, run_ids: set[str] | None, s
         .filter(
             Embedding.campaign_id == campaign_id,
             Embedding.model == settings.embedding_model,
-            Embedding.version == settings.embedding_version,
+            Embedding.version == stored_embedding_version(),
         )
     )
     if session_id:
@@ -2369,6 +2513,29 @@ def _embedding_query_base(session, campaign_id: str, run_ids: set[str] | None, s
     return query
 
 
+def _batch_dense_scores(
+    entries: list[Embedding], query_vector: npt.NDArray[np.float32]
+) -> dict[str, float]:
+    """Score every entry against the query with one matrix product."""
+    dims = len(query_vector)
+    vectors = [_embedding_values(entry) for entry in entries]
+    comparable = [idx for idx, values in enumerate(vectors) if len(values) == dims]
+    scores = dict.fromkeys((entry.id for entry in entries), 0.0)
+    if comparable:
+        batch = cosine_similarity_batch(query_vector, [vectors[idx] for idx in comparable])
+        for idx, score in zip(comparable, batch.tolist()):
+            scores[entries[idx].id] = score
+    return scores
+
+
+def _dense_score(
+    entry: Embedding, query_vector: npt.NDArray[np.float32], query_unit: Any
+) -> float:
+    if entry.normalized:
+        return cosine_similarity_normalized(_embedding_values(entry), query_unit)
+    return cosine_similarity(_embedding_values(entry), query_vector)
+
+
 def _embedding_values(entry: Embedding) -> list[float]:
     if entry.embedding is None:
         return []
@@ -2379,7 +2546,7 @@ def _embedding_values(entry: Embedding) -> list[float]:
 
 def _filter_evidence_spans(
     evidence: list[dict] | None,
-    redacted_utterances: set[str],
+    redacted_utterances: frozenset[str],
 ) -> list[dict]:
     filtered = []
     for span in evidence or []:
@@ -2393,7 +2560,7 @@ def _filter_evidence_spans(
 def _entity_evidence(
     session,
     entity_ids: set[str],
-    redacted_utterances: set[str],
+    redacted_utterances: frozenset[str],
 ) -> dict[str, list[dict]]:
     if not entity_ids:
         return {}
@@ -2412,7 +2579,7 @@ def _entity_evidence(
     return evidence_map
 
 
-def _quote_evidence(quote: Quote, redacted_utterances: set[str]) -> list[dict]:
+def _quote_evidence(quote: Quote, redacted_utterances: frozenset[str]) -> list[dict]:
     if not quote.utterance_id or quote.utterance_id in redacted_utterances:
         return []
     if quote.char_start is None or quote.char_end is None:
@@ -2674,7 +2841,7 @@ def list_thread_quotes(thread_id: str, request: Request) -> list[dict]:
                         .filter(Quote.utterance_id.in_(sorted(set(candidate_ids))))
                         .all()
                     )
-        utterance_lookup = _utterance_lookup(session, {thread.session_id})
+        utterance_lookup = _quote_utterance_lookup(session, quotes)
         return [
             {
                 "id": q.id,
@@ -2732,21 +2899,7 @@ def get_summary(
             "summary_hooks",
             "summary_npc_changes",
         }
-        summaries = (
-            session.query(SessionExtraction)
-            .filter(
-                SessionExtraction.session_id == session_id,
-                SessionExtraction.run_id == resolved_run_id,
-                SessionExtraction.kind.in_(summary_kinds),
-            )
-            .order_by(SessionExtraction.created_at.desc())
-            .all()
-        )
-        summary_by_kind = {}
-        for record in summaries:
-            if record.kind in summary_by_kind:
-                continue
-            summary_by_kind[record.kind] = record
+        summary_texts = _latest_summary_texts(session, session_id, resolved_run_id, summary_kinds)
         persist_metrics = (
             session.query(SessionExtraction)
             .filter_by(session_id=session_id, run_id=resolved_run_id, kind="persist_metrics")
@@ -2777,17 +2930,11 @@ def get_summary(
             .order_by(RunStep.started_at.asc(), RunStep.id.asc())
             .all()
         )
-        if not summary_by_kind:
+        if not summary_texts:
             raise HTTPException(status_code=404, detail="Summary not found")
-        summary_text = summary_by_kind.get("summary_text")
-        variants = {
-            kind: record.payload.get("text", "")
-            for kind, record in summary_by_kind.items()
-            if record.payload
-        }
         return {
-            "text": summary_text.payload.get("text", "") if summary_text else "",
-            "variants": variants,
+            "text": summary_texts.get("summary_text", ""),
+            "variants": summary_texts,
         }
 
 
@@ -2861,7 +3008,7 @@ def list_runs(session_id: str, request: Request) -> list[dict]:
                 "transcript_hash": run.transcript_hash,
                 "pipeline_version": run.pipeline_version,
                 "status": run.status,
-                "created_at": run.created_at.isoformat(),
+                "created_at": run.created_at,
                 "is_current": run.id == session_obj.current_run_id,
             }
             for run in runs
@@ -2903,15 +3050,15 @@ def get_run_status(
         return {
             "run_id": resolved_run_id,
             "status": run.status,
-            "created_at": run.created_at.isoformat() if run.created_at else None,
-            "finished_at": run.finished_at.isoformat() if run.finished_at else None,
+            "created_at": run.created_at,
+            "finished_at": run.finished_at,
             "steps": [
                 {
                     "id": step.id,
                     "name": step.name,
                     "status": step.status,
-                    "started_at": step.started_at.isoformat() if step.started_at else None,
-                    "finished_at": step.finished_at.isoformat() if step.finished_at else None,
+                    "started_at": step.started_at,
+                    "finished_at": step.finished_at,
                     "error": step.error,
                 }
                 for step in steps
@@ -2920,7 +3067,7 @@ def get_run_status(
                 "id": latest_call.id,
                 "kind": latest_call.kind,
                 "status": latest_call.status,
-                "created_at": latest_call.created_at.isoformat(),
+                "created_at": latest_call.created_at,
                 "error": latest_call.error,
             }
             if latest_call
@@ -2929,7 +3076,7 @@ def get_run_status(
                 "id": latest_artifact.id,
                 "kind": latest_artifact.kind,
                 "path": latest_artifact.path,
-                "created_at": latest_artifact.created_at.isoformat(),
+                "created_at": latest_artifact.created_at,
             }
             if latest_artifact
             else None,
@@ -2992,7 +3139,7 @@ def list_utterances(
         if ids:
             query = query.filter(Utterance.id.in_(ids))
         utterances = query.all()
-        redacted_by_session: dict[str, set[str]] = {}
+        redacted_by_session: dict[str, frozenset[str]] = {}
         for utter_session_id in {utt.session_id for utt in utterances}:
             session_obj = session.query(Session).filter_by(id=utter_session_id).first()
             if not session_obj:
@@ -3015,7 +3162,7 @@ def list_utterances(
                 "text": utt.text,
             }
             for utt in utterances
-            if utt.id not in redacted_by_session.get(utt.session_id, set())
+            if utt.id not in redacted_by_session.get(utt.session_id, frozenset())
         ]
 
 
@@ -3075,8 +3222,9 @@ def list_campaign_threads(
             "hide",
             "rename",
         }
+        excluded_ids = frozenset(hidden_ids) | frozenset(merge_map)
         spoiler_cutoff = _spoiler_cutoff(session, campaign.id, request, session_id)
-        spoiler_map = _spoiler_map(session, campaign.id)
+        thread_spoilers = _spoiler_map(session, campaign.id).get("thread", {})
 
         run_ids = None
         if not include_all_runs:
@@ -3106,15 +3254,12 @@ def list_campaign_threads(
 
         latest_by_title: dict[str, dict] = {}
         for thread, sess in threads:
-            if thread.id in hidden_ids or thread.id in merge_map:
+            if thread.id in excluded_ids:
                 continue
             thread_title = title_map.get(thread.id, thread.title)
             thread_status = status_map.get(thread.id, thread.status)
             thread_summary = summary_map.get(thread.id, thread.summary)
-            if (
-                spoiler_cutoff is not None
-                and spoiler_map.get(("thread", thread.id), 0) > spoiler_cutoff
-            ):
+            if spoiler_cutoff is not None and thread_spoilers.get(thread.id, 0) > spoiler_cutoff:
                 continue
             if status and thread_status != status:
                 continue
@@ -3133,13 +3278,13 @@ def list_campaign_threads(
                 "session_id": thread.session_id,
                 "session_slug": sess.slug,
                 "session_number": sess.session_number,
-                "created_at": thread.created_at.isoformat(),
+                "created_at": thread.created_at,
                 "updates": [
                     {
                         "id": update.id,
                         "note": update.note,
                         "update_type": update.update_type,
-                        "created_at": update.created_at.isoformat(),
+                        "created_at": update.created_at,
                     }
                     for update in updates_by_thread.get(thread.id, [])
                 ],
@@ -3161,11 +3306,16 @@ def get_session_bundle(
     session_id: str,
     request: Request,
     run_id: Annotated[str | None, Query()] = None,
-) -> dict:
+) -> Response:
     with get_session() as session:
         resolved_run_id = _resolve_run_id(session, session_id, run_id)
-        run = session.query(Run).filter_by(id=resolved_run_id).first()
+        run = session.get(Run, resolved_run_id)
         session_obj = _session_for_id(session, session_id, request)
+        campaign_id = session_obj.campaign_id
+        spoiler_cutoff = _spoiler_cutoff(session, campaign_id, request, session_id)
+        etag = _bundle_etag(session, run, campaign_id, spoiler_cutoff)
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
         entity_corrections = _load_corrections(session, session_obj.campaign_id, session_id, "entity")
         thread_corrections = _load_corrections(session, session_obj.campaign_id, session_id, "thread")
         quote_corrections = _load_corrections(session, session_obj.campaign_id, session_id, "quote")
@@ -3217,155 +3367,186 @@ def get_session_bundle(
             "summary_hooks",
             "summary_npc_changes",
         }
-        summaries = (
-            session.query(SessionExtraction)
-            .filter(
-                SessionExtraction.session_id == session_id,
-                SessionExtraction.run_id == resolved_run_id,
-                SessionExtraction.kind.in_(summary_kinds),
-            )
-            .order_by(SessionExtraction.created_at.desc())
-            .all()
-        )
-        summary_by_kind: dict[str, SessionExtraction] = {}
-        for record in summaries:
-            if record.kind in summary_by_kind:
-                continue
-            summary_by_kind[record.kind] = record
-        summary_text_record = summary_by_kind.get("summary_text")
-        summary_variants = {
-            kind: record.payload.get("text", "")
-            for kind, record in summary_by_kind.items()
-            if record.payload
-        }
-        persist_metrics = (
-            session.query(SessionExtraction)
-            .filter_by(session_id=session_id, run_id=resolved_run_id, kind="persist_metrics")
-            .order_by(SessionExtraction.created_at.desc())
-            .first()
-        )
-        quality_report = (
-            session.query(SessionExtraction)
-            .filter_by(session_id=session_id, run_id=resolved_run_id, kind="quality_report")
-            .order_by(SessionExtraction.created_at.desc())
-            .first()
-        )
-        llm_calls = (
-            session.query(LLMCall)
-            .filter_by(session_id=session_id, run_id=resolved_run_id)
-            .order_by(LLMCall.created_at.asc(), LLMCall.id.asc())
-            .all()
-        )
-        llm_usage = (
-            session.query(SessionExtraction)
-            .filter_by(session_id=session_id, run_id=resolved_run_id, kind="llm_usage")
-            .order_by(SessionExtraction.created_at.asc(), SessionExtraction.id.asc())
-            .all()
-        )
-        run_steps = (
-            session.query(RunStep)
-            .filter_by(session_id=session_id, run_id=resolved_run_id)
-            .order_by(RunStep.started_at.asc(), RunStep.id.asc())
-            .all()
-        )
-        artifacts = (
-            session.query(Artifact)
-            .filter_by(session_id=session_id, run_id=resolved_run_id)
-            .all()
-        )
-        quotes = (
-            session.query(Quote)
-            .filter_by(session_id=session_id, run_id=resolved_run_id)
-            .all()
-        )
-        utterance_lookup = _utterance_lookup(session, {session_id})
-        utterances = (
-            session.query(Utterance)
-            .options(joinedload(Utterance.participant))
-            .filter_by(session_id=session_id)
-            .order_by(Utterance.start_ms.asc(), Utterance.id.asc())
-            .all()
+        event_filters = _visibility_filters(Event.id, "event", campaign_id, set(), spoiler_cutoff)
+        thread_filters = _visibility_filters(
+            Thread.id,
+            "thread",
+            campaign_id,
+            hidden_threads | set(merge_threads),
+            spoiler_cutoff,
+        )
+        entity_filters = _visibility_filters(
+            Entity.id,
+            "entity",
+            campaign_id,
+            hidden_entities | set(merge_entities),
+            spoiler_cutoff,
+        )
+        utterance_filters = (
+            [Utterance.id.not_in(sorted(redacted_utterances))] if redacted_utterances else []
+        )
+        loaded = _run_readonly_queries(
+            {
+                "summary_texts": lambda db: _latest_summary_texts(
+                    db, session_id, resolved_run_id, summary_kinds
+                ),
+                "persist_metrics": lambda db: db.scalars(
+                    select(SessionExtraction)
+                    .where(
+                        SessionExtraction.session_id == session_id,
+                        SessionExtraction.run_id == resolved_run_id,
+                        SessionExtraction.kind == "persist_metrics",
+                    )
+                    .order_by(SessionExtraction.created_at.desc())
+                    .limit(1)
+                ).first(),
+                "quality_report": lambda db: db.scalars(
+                    select(SessionExtraction)
+                    .where(
+                        SessionExtraction.session_id == session_id,
+                        SessionExtraction.run_id == resolved_run_id,
+                        SessionExtraction.kind == "quality_report",
+                    )
+                    .order_by(SessionExtraction.created_at.desc())
+                    .limit(1)
+                ).first(),
+                "llm_calls": lambda db: db.scalars(
+                    select(LLMCall)
+                    .where(LLMCall.session_id == session_id, LLMCall.run_id == resolved_run_id)
+                    .order_by(LLMCall.created_at.asc(), LLMCall.id.asc())
+                ).all(),
+                "llm_usage": lambda db: db.scalars(
+                    select(SessionExtraction)
+                    .where(
+                        SessionExtraction.session_id == session_id,
+                        SessionExtraction.run_id == resolved_run_id,
+                        SessionExtraction.kind == "llm_usage",
+                    )
+                    .order_by(SessionExtraction.created_at.asc(), SessionExtraction.id.asc())
+                ).all(),
+                "run_steps": lambda db: db.scalars(
+                    select(RunStep)
+                    .where(RunStep.session_id == session_id, RunStep.run_id == resolved_run_id)
+                    .order_by(RunStep.started_at.asc(), RunStep.id.asc())
+                ).all(),
+                "artifacts": lambda db: _mapping_rows(
+                    db,
+                    select(Artifact.id, Artifact.kind, Artifact.path, Artifact.meta).where(
+                        Artifact.session_id == session_id,
+                        Artifact.run_id == resolved_run_id,
+                    ),
+                ),
+                "quotes": lambda db: db.scalars(
+                    select(Quote).where(
+                        Quote.session_id == session_id,
+                        Quote.run_id == resolved_run_id,
+                    )
+                ).all(),
+                "utterances": lambda db: db.scalars(
+                    select(Utterance)
+                    .options(selectinload(Utterance.participant), raiseload("*"))
+                    .where(Utterance.session_id == session_id, *utterance_filters)
+                    .order_by(Utterance.start_ms.asc(), Utterance.id.asc())
+                ).all(),
+                "character_sheets": lambda db: db.scalars(
+                    select(CharacterSheetSnapshot)
+                    .where(CharacterSheetSnapshot.session_id == session_id)
+                    .order_by(CharacterSheetSnapshot.created_at.desc())
+                ).all(),
+                "dice_rolls": lambda db: db.scalars(
+                    select(DiceRoll)
+                    .where(DiceRoll.session_id == session_id)
+                    .order_by(DiceRoll.t_ms.asc(), DiceRoll.roll_index.asc())
+                ).all(),
+                "scenes": lambda db: _mapping_rows(
+                    db,
+                    select(
+                        Scene.id,
+                        Scene.title,
+                        Scene.summary,
+                        Scene.location,
+                        Scene.start_ms,
+                        Scene.end_ms,
+                        Scene.participants,
+                        Scene.evidence,
+                    )
+                    .where(Scene.session_id == session_id, Scene.run_id == resolved_run_id)
+                    .order_by(Scene.start_ms.asc(), Scene.id.asc()),
+                ),
+                "events": lambda db: _mapping_rows(
+                    db,
+                    select(
+                        Event.id,
+                        Event.event_type,
+                        Event.summary,
+                        Event.start_ms,
+                        Event.end_ms,
+                        Event.entities,
+                        Event.evidence,
+                        Event.confidence,
+                    )
+                    .where(
+                        Event.session_id == session_id,
+                        Event.run_id == resolved_run_id,
+                        *event_filters,
+                    )
+                    .order_by(Event.start_ms.asc(), Event.id.asc()),
+                ),
+                "threads": lambda db: db.scalars(
+                    select(Thread)
+                    .options(selectinload(Thread.updates))
+                    .where(
+                        Thread.session_id == session_id,
+                        Thread.run_id == resolved_run_id,
+                        *thread_filters,
+                    )
+                    .order_by(Thread.created_at.asc(), Thread.id.asc())
+                ).all(),
+                "entities": lambda db: db.scalars(
+                    select(Entity)
+                    .where(
+                        Entity.id.in_(_mentioned_entity_ids(session_id, resolved_run_id)),
+                        *entity_filters,
+                    )
+                    .order_by(Entity.entity_type.asc(), Entity.canonical_name.asc())
+                ).all(),
+            }
         )
-        if redacted_utterances:
-            utterances = [utt for utt in utterances if utt.id not in redacted_utterances]
+        summary_variants = loaded["summary_texts"]
+        persist_metrics = loaded["persist_metrics"]
+        quality_report = loaded["quality_report"]
+        llm_calls = loaded["llm_calls"]
+        llm_usage = loaded["llm_usage"]
+        run_steps = loaded["run_steps"]
+        artifacts = loaded["artifacts"]
+        quotes = [
+            q
+            for q in loaded["quotes"]
+            if q.id not in redacted_quotes and q.utterance_id not in redacted_utterances
+        ]
+        utterance_lookup = _quote_utterance_lookup(session, quotes)
+        utterances = loaded["utterances"]
         transcript_lines: list[str] = []
         utterance_timecodes: dict[str, str] = {}
         if utterances and run:
             character_map = load_character_map(session, run.campaign_id)
-            transcript_text, key_to_id = format_transcript(utterances, character_map)
-            transcript_lines = transcript_text.splitlines()
-            utterance_timecodes = {utt_id: key for key, utt_id in key_to_id.items()}
-
-        character_sheets = (
-            session.query(CharacterSheetSnapshot)
-            .filter_by(session_id=session_id)
-            .order_by(CharacterSheetSnapshot.created_at.desc())
-            .all()
-        )
-        dice_rolls = (
-            session.query(DiceRoll)
-            .filter_by(session_id=session_id)
-            .order_by(DiceRoll.t_ms.asc(), DiceRoll.roll_index.asc())
-            .all()
-        )
-
-        scenes = (
-            session.query(Scene)
-            .filter_by(session_id=session_id, run_id=resolved_run_id)
-            .order_by(Scene.start_ms.asc(), Scene.id.asc())
-            .all()
-        )
-        events = (
-            session.query(Event)
-            .filter_by(session_id=session_id, run_id=resolved_run_id)
-            .order_by(Event.start_ms.asc(), Event.id.asc())
-            .all()
-        )
-        threads = (
-            session.query(Thread)
-            .filter_by(session_id=session_id, run_id=resolved_run_id)
-            .order_by(Thread.created_at.asc(), Thread.id.asc())
-            .all()
-        )
-        thread_updates = (
-            session.query(ThreadUpdate)
-            .filter_by(session_id=session_id, run_id=resolved_run_id)
-            .order_by(ThreadUpdate.created_at.asc(), ThreadUpdate.id.asc())
-            .all()
-        )
-        updates_by_thread: dict[str, list[dict]] = {}
-        for update in thread_updates:
-            updates_by_thread.setdefault(update.thread_id, []).append(
-                {
-                    "id": update.id,
-                    "update_type": update.update_type,
-                    "note": update.note,
-                    "evidence": update.evidence,
-                    "related_event_ids": update.related_event_ids,
-                    "created_at": update.created_at.isoformat(),
-                }
+            transcript_lines, utterance_timecodes = format_transcript_lines(
+                utterances, character_map
             )
 
-        entities = (
-            session.query(Entity)
-            .join(EntityMention, EntityMention.entity_id == Entity.id)
-            .filter(
-                EntityMention.session_id == session_id,
-                EntityMention.run_id == resolved_run_id,
-            )
-            .order_by(Entity.entity_type.asc(), Entity.canonical_name.asc())
-            .distinct()
-            .all()
-        )
-        spoiler_cutoff = _spoiler_cutoff(session, session_obj.campaign_id, request, session_id)
-        spoiler_map = _spoiler_map(session, session_obj.campaign_id)
+        character_sheets = loaded["character_sheets"]
+        dice_rolls = loaded["dice_rolls"]
+        scenes = loaded["scenes"]
+        events = loaded["events"]
+        threads = loaded["threads"]
+        entities = loaded["entities"]
 
-        return {
+        payload = {
             "session_id": session_id,
             "run_id": resolved_run_id,
             "run_status": run.status if run else None,
-            "run_created_at": run.created_at.isoformat() if run else None,
-            "summary": summary_text_record.payload.get("text", "") if summary_text_record else "",
+            "run_created_at": run.created_at if run else None,
+            "summary": summary_variants.get("summary_text", ""),
             "summary_variants": summary_variants,
             "metrics": persist_metrics.payload if persist_metrics else None,
             "quality": quality_report.payload if quality_report else None,
@@ -3379,7 +3560,7 @@ def get_session_bundle(
                     "prompt_version": call.prompt_version,
                     "model": call.model,
                     "error": call.error,
-                    "created_at": call.created_at.isoformat(),
+                    "created_at": call.created_at,
                 }
                 for call in llm_calls
             ],
@@ -3389,8 +3570,8 @@ def get_session_bundle(
                     "id": step.id,
                     "name": step.name,
                     "status": step.status,
-                    "started_at": step.started_at.isoformat() if step.started_at else None,
-                    "finished_at": step.finished_at.isoformat() if step.finished_at else None,
+                    "started_at": step.started_at,
+                    "finished_at": step.finished_at,
                     "error": step.error,
                 }
                 for step in run_steps
@@ -3407,46 +3588,15 @@ def get_session_bundle(
                     "character_name": sheet.character_name,
                     "source_path": sheet.source_path,
                     "payload": sheet.payload,
-                    "created_at": sheet.created_at.isoformat(),
+                    "created_at": sheet.created_at,
                 }
                 for sheet in character_sheets
             ],
             "dice_rolls": [
-                {
-                    "id": roll.id,
-                    "t_ms": roll.t_ms,
-                    "character_name": roll.character_name,
-                    "kind": roll.kind,
-                    "expression": roll.expression,
-                    "total": roll.total,
-                    "detail": roll.detail,
-                    "utterance_id": (
-                        None
-                        if roll.utterance_id in redacted_utterances
-                        else roll.utterance_id
-                    ),
-                    "utterance_timecode": (
-                        utterance_timecodes.get(roll.utterance_id)
-                        if roll.utterance_id not in redacted_utterances
-                        else None
-                    ),
-                    "evidence": (
-                        [{"utterance_id": roll.utterance_id, "kind": "support"}]
-                        if roll.utterance_id and roll.utterance_id not in redacted_utterances
-                        else []
-                    ),
-                }
+                _dice_roll_payload(roll, redacted_utterances, utterance_timecodes)
                 for roll in dice_rolls
             ],
-            "artifacts": [
-                {
-                    "id": a.id,
-                    "kind": a.kind,
-                    "path": a.path,
-                    "meta": a.meta,
-                }
-                for a in artifacts
-            ],
+            "artifacts": artifacts,
             "quotes": [
                 {
                     "id": q.id,
@@ -3459,36 +3609,9 @@ def get_session_bundle(
                     "display_text": _quote_display_text(q, utterance_lookup),
                 }
                 for q in quotes
-                if q.id not in redacted_quotes and q.utterance_id not in redacted_utterances
-            ],
-            "scenes": [
-                {
-                    "id": s.id,
-                    "title": s.title,
-                    "summary": s.summary,
-                    "location": s.location,
-                    "start_ms": s.start_ms,
-                    "end_ms": s.end_ms,
-                    "participants": s.participants,
-                    "evidence": s.evidence,
-                }
-                for s in scenes
-            ],
-            "events": [
-                {
-                    "id": e.id,
-                    "event_type": e.event_type,
-                    "summary": e.summary,
-                    "start_ms": e.start_ms,
-                    "end_ms": e.end_ms,
-                    "entities": e.entities,
-                    "evidence": e.evidence,
-                    "confidence": e.confidence,
-                }
-                for e in events
-                if spoiler_cutoff is None
-                or spoiler_map.get(("event", e.id), 0) <= spoiler_cutoff
             ],
+            "scenes": scenes,
+            "events": events,
             "threads": [
                 {
                     "id": t.id,
@@ -3500,15 +3623,20 @@ def get_session_bundle(
                     "evidence": t.evidence,
                     "confidence": t.confidence,
                     "corrected": _has_correction(thread_corrections, t.id, thread_corrected_actions),
-                    "created_at": t.created_at.isoformat(),
-                    "updates": updates_by_thread.get(t.id, []),
+                    "created_at": t.created_at,
+                    "updates": [
+                        {
+                            "id": update.id,
+                            "update_type": update.update_type,
+                            "note": update.note,
+                            "evidence": update.evidence,
+                            "related_event_ids": update.related_event_ids,
+                            "created_at": update.created_at,
+                        }
+                        for update in t.updates
+                    ],
                 }
                 for t in threads
-                if t.id not in hidden_threads and t.id not in merge_threads
-                and (
-                    spoiler_cutoff is None
-                    or spoiler_map.get(("thread", t.id), 0) <= spoiler_cutoff
-                )
             ],
             "entities": [
                 {
@@ -3519,13 +3647,122 @@ def get_session_bundle(
                     "corrected": _has_correction(entity_corrections, e.id, entity_corrected_actions),
                 }
                 for e in entities
-                if e.id not in hidden_entities and e.id not in merge_entities
-                and (
-                    spoiler_cutoff is None
-                    or spoiler_map.get(("entity", e.id), 0) <= spoiler_cutoff
-                )
             ],
         }
+    return StreamingResponse(
+        _iter_json_object(payload),
+        media_type="application/json",
+        headers={"ETag": etag},
+    )
+
+
+def _bundle_etag(session, run: Run, campaign_id: str, spoiler_cutoff: int | None) -> str:
+    """Weak validator covering everything that can change a bundle for the same run."""
+    extraction_stamp = session.execute(
+        select(func.count(SessionExtraction.id), func.max(SessionExtraction.created_at))
+        .where(SessionExtraction.run_id == run.id)
+    ).one()
+    correction_stamp = session.execute(
+        select(func.count(Correction.id), func.max(Correction.created_at))
+        .where(Correction.campaign_id == campaign_id)
+    ).one()
+    llm_call_stamp = session.execute(
+        select(func.count(LLMCall.id), func.max(LLMCall.created_at))
+        .where(LLMCall.run_id == run.id)
+    ).one()
+    # Steps are updated in place (status, finished_at), so a count/max pair would miss a
+    # step finishing; a run only has a handful of them, so fingerprint each one.
+    step_stamp = session.execute(
+        select(RunStep.id, RunStep.status, RunStep.started_at, RunStep.finished_at)
+        .where(RunStep.run_id == run.id)
+        .order_by(RunStep.id)
+    ).all()
+    # Transcript, sheet and roll re-imports replace session rows rather than the run's.
+    # Utterances carry no timestamp, but replacements get fresh uuid ids.
+    utterance_stamp = session.execute(
+        select(func.count(Utterance.id), func.max(Utterance.id))
+        .where(Utterance.session_id == run.session_id)
+    ).one()
+    sheet_stamp = session.execute(
+        select(func.count(CharacterSheetSnapshot.id), func.max(CharacterSheetSnapshot.created_at))
+        .where(CharacterSheetSnapshot.session_id == run.session_id)
+    ).one()
+    dice_stamp = session.execute(
+        select(func.count(DiceRoll.id), func.max(DiceRoll.created_at))
+        .where(DiceRoll.session_id == run.session_id)
+    ).one()
+    fingerprint = orjson.dumps(
+        [
+            run.id,
+            run.status,
+            run.finished_at,
+            tuple(extraction_stamp),
+            tuple(correction_stamp),
+            tuple(llm_call_stamp),
+            [tuple(step) for step in step_stamp],
+            tuple(utterance_stamp),
+            tuple(sheet_stamp),
+            tuple(dice_stamp),
+            spoiler_cutoff,
+            # The bundle filters on live spoiler tags, so bypass the TTL-cached map here.
+            _query_spoiler_map(session, campaign_id),
+            sorted(load_character_map(session, run.campaign_id).items()),
+        ],
+        option=orjson.OPT_SORT_KEYS,
+    )
+    return f'W/"{run.transcript_hash}-{hashlib.sha256(fingerprint).hexdigest()[:16]}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {candidate.strip() for candidate in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _iter_json_object(payload: dict[str, Any]) -> Iterator[bytes]:
+    """Encode a top-level object one key at a time, chunking large lists.
+
+    Peak memory stays near the source dict plus one chunk instead of the dict plus the
+    fully encoded body. Naive datetimes may be passed through as-is: orjson renders them
+    exactly like ``datetime.isoformat()``.
+    """
+    yield b"{"
+    for index, (key, value) in enumerate(payload.items()):
+        if index:
+            yield b","
+        yield orjson.dumps(key) + b":"
+        if not isinstance(value, list):
+            yield orjson.dumps(value)
+            continue
+        yield b"["
+        for start in range(0, len(value), BUNDLE_STREAM_CHUNK_SIZE):
+            if start:
+                yield b","
+            yield orjson.dumps(value[start : start + BUNDLE_STREAM_CHUNK_SIZE])[1:-1]
+        yield b"]"
+    yield b"}"
+
+
+def _dice_roll_payload(
+    roll: DiceRoll,
+    redacted_utterances: frozenset[str],
+    utterance_timecodes: dict[str, str],
+) -> dict:
+    utterance_id = None if roll.utterance_id in redacted_utterances else roll.utterance_id
+    return {
+        "id": roll.id,
+        "t_ms": roll.t_ms,
+        "character_name": roll.character_name,
+        "kind": roll.kind,
+        "expression": roll.expression,
+        "total": roll.total,
+        "detail": roll.detail,
+        "utterance_id": utterance_id,
+        "utterance_timecode": utterance_timecodes.get(utterance_id) if utterance_id else None,
+        "evidence": [{"utterance_id": utterance_id, "kind": "support"}] if utterance_id else [],
+    }
 
 
 def _thread_event_utterance_ids(
@@ -3541,21 +3778,26 @@ def _thread_event_utterance_ids(
         if ids:
             return ids
 
-    events = (
-        session.query(Event)
-        .filter_by(session_id=thread.session_id, run_id=thread.run_id)
+    summary = func.lower(Event.summary)
+    token_matches = [
+        summary.contains(token, autoescape=True)
+        for token in _thread_title_tokens(thread.title)
+    ]
+    evidence_rows = (
+        session.query(Event.evidence)
+        .filter(
+            Event.session_id == thread.session_id,
+            Event.run_id == thread.run_id,
+            or_(Event.event_type == "thread_update", *token_matches),
+        )
         .all()
     )
-    tokens = _thread_title_tokens(thread.title)
-    for event in events:
-        summary = (event.summary or "").lower()
-        if event.event_type == "thread_update" or any(token in summary for token in tokens):
-            ids |= _utterance_ids_from_evidence(event.evidence)
+    for (evidence,) in evidence_rows:
+        ids |= _utterance_ids_from_evidence(evidence)
     return ids
 
 
 def _thread_title_tokens(title: str | None) -> list[str]:
     if not title:
         return []
-    tokens = [token for token in re.split(r"\W+", title.lower()) if len(token) > 3]
-    return tokens
+    return [token for token in _TITLE_TOKEN_SPLIT_RE.split(title.lower()) if len(token) > 3]
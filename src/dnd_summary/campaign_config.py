@@ -1,32 +1,33 @@
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 from pathlib import Path
 
+import orjson
+
 from dnd_summary.config import settings
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CharacterConfig:
     name: str
     kind: str = "pc"
-    aliases: list[str] | None = None
+    aliases: tuple[str, ...] | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ParticipantConfig:
     display_name: str
     role: str | None = None
-    speaker_aliases: list[str] | None = None
+    speaker_aliases: tuple[str, ...] | None = None
     character: CharacterConfig | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CampaignConfig:
     name: str | None = None
     system: str | None = None
-    participants: list[ParticipantConfig] | None = None
+    participants: tuple[ParticipantConfig, ...] | None = None
 
 
 def _config_path(campaign_slug: str) -> Path:
@@ -38,12 +39,28 @@ def _config_path(campaign_slug: str) -> Path:
     )
 
 
+_CONFIG_CACHE: dict[Path, tuple[tuple[int, int], CampaignConfig]] = {}
+
+
 def load_campaign_config(campaign_slug: str) -> CampaignConfig | None:
+    """Load ``campaign.json``, reparsing only when the file's mtime or size changes."""
     path = _config_path(campaign_slug)
-    if not path.exists():
+    try:
+        stat = path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        _CONFIG_CACHE.pop(path, None)
         return None
 
-    payload = json.loads(path.read_text(encoding="utf-8"))
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _CONFIG_CACHE.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+    config = _parse_campaign_config(orjson.loads(path.read_bytes()))
+    _CONFIG_CACHE[path] = (signature, config)
+    return config
+
+
+def _parse_campaign_config(payload: dict) -> CampaignConfig:
     participants: list[ParticipantConfig] = []
     for participant in payload.get("participants", []):
         character = participant.get("character")
@@ -52,13 +69,13 @@ def load_campaign_config(campaign_slug: str) -> CampaignConfig | None:
             character_cfg = CharacterConfig(
                 name=str(character["name"]),
                 kind=str(character.get("kind") or "pc"),
-                aliases=[str(a) for a in character.get("aliases", [])] or None,
+                aliases=tuple(str(a) for a in character.get("aliases", [])) or None,
             )
         participants.append(
             ParticipantConfig(
                 display_name=str(participant.get("display_name") or "").strip(),
                 role=participant.get("role"),
-                speaker_aliases=[str(a) for a in participant.get("speaker_aliases", [])]
+                speaker_aliases=tuple(str(a) for a in participant.get("speaker_aliases", []))
                 or None,
                 character=character_cfg,
             )
@@ -67,7 +84,7 @@ def load_campaign_config(campaign_slug: str) -> CampaignConfig | None:
     return CampaignConfig(
         name=payload.get("name"),
         system=payload.get("system"),
-        participants=participants or None,
+        participants=tuple(participants) or None,
     )
 
 
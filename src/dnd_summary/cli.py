@@ -2,23 +2,58 @@ from __future__ import annotations
 
 import asyncio
 import uuid
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
 import typer
-from sqlalchemy import text
 
-from dnd_summary.config import settings
+if TYPE_CHECKING:
+    from datetime import datetime
 
-app = typer.Typer(no_args_is_help=True)
+    from dnd_summary.config import Settings
+    from dnd_summary.models import Run
+
+# Plain Click help: the rich renderer costs more than every command body import combined.
+app = typer.Typer(no_args_is_help=True, rich_markup_mode=None)
+
+CACHE_VERIFY_WORKERS = 16
+
+
+@lru_cache(maxsize=None)
+def _settings() -> Settings:
+    """Import config on first use so `--help` skips env parsing and pydantic validation."""
+    from dnd_summary.config import settings
+
+    return settings
+
+
+def _session_for_slugs(session, campaign_slug: str, session_slug: str):
+    from sqlalchemy import select
+
+    from dnd_summary.models import Campaign, Session
+
+    return session.scalars(
+        select(Session)
+        .join(Campaign, Session.campaign_id == Campaign.id)
+        .where(Campaign.slug == campaign_slug, Session.slug == session_slug)
+        .limit(1)
+    ).first()
+
+
+_SHOW_CONFIG_FIELDS = (
+    "database_url",
+    "temporal_address",
+    "temporal_namespace",
+    "temporal_task_queue",
+    "transcripts_root",
+)
 
 
 @app.command()
 def show_config() -> None:
-    typer.echo(f"database_url={settings.database_url}")
-    typer.echo(f"temporal_address={settings.temporal_address}")
-    typer.echo(f"temporal_namespace={settings.temporal_namespace}")
-    typer.echo(f"temporal_task_queue={settings.temporal_task_queue}")
-    typer.echo(f"transcripts_root={settings.transcripts_root}")
+    values = _settings().model_dump(include=set(_SHOW_CONFIG_FIELDS))
+    typer.echo("\n".join(f"{name}={values[name]}" for name in _SHOW_CONFIG_FIELDS))
 
 
 @app.command()
@@ -38,6 +73,8 @@ def run_session(campaign_slug: str, session_slug: str) -> None:
 
     from dnd_summary.workflows.process_session import ProcessSessionWorkflow
 
+    settings = _settings()
+
     async def _run() -> None:
         client = await Client.connect(
             settings.temporal_address,
@@ -131,30 +168,29 @@ def resume_partial(
         render_summary_docx_activity,
         write_summary_activity,
     )
+    from sqlalchemy import select
+
     from dnd_summary.db import get_session
     from dnd_summary.logging_config import setup_logging
-    from dnd_summary.models import Campaign, Run, Session
+    from dnd_summary.models import Run
 
     async def _run() -> None:
         setup_logging()
         with get_session() as session:
-            session_obj = (
-                session.query(Session)
-                .join(Campaign, Session.campaign_id == Campaign.id)
-                .filter(Campaign.slug == campaign_slug, Session.slug == session_slug)
-                .first()
-            )
+            session_obj = _session_for_slugs(session, campaign_slug, session_slug)
             if not session_obj:
                 raise SystemExit("Session not found.")
             if run_id:
-                run = session.query(Run).filter_by(id=run_id, session_id=session_obj.id).first()
+                run = session.scalars(
+                    select(Run).where(Run.id == run_id, Run.session_id == session_obj.id)
+                ).first()
             else:
-                run = (
-                    session.query(Run)
-                    .filter_by(session_id=session_obj.id)
+                run = session.scalars(
+                    select(Run)
+                    .where(Run.session_id == session_obj.id)
                     .order_by(Run.created_at.desc())
-                    .first()
-                )
+                    .limit(1)
+                ).first()
             if not run:
                 raise SystemExit("Run not found for session.")
             if run.status != "partial" and not force:
@@ -183,70 +219,73 @@ def resume_partial(
 @app.command()
 def inspect_session(campaign_slug: str, session_slug: str) -> None:
     """Show counts and artifacts for the latest run of a session."""
+    from sqlalchemy import select
+
     from dnd_summary.db import get_session
-    from dnd_summary.models import Artifact, Campaign, Run, Session, SessionExtraction
+    from dnd_summary.models import Artifact, Run, SessionExtraction
 
     with get_session() as session:
-        session_obj = (
-            session.query(Session)
-            .join(Campaign, Session.campaign_id == Campaign.id)
-            .filter(Campaign.slug == campaign_slug, Session.slug == session_slug)
-            .first()
-        )
+        session_obj = _session_for_slugs(session, campaign_slug, session_slug)
         if not session_obj:
             raise SystemExit("Session not found.")
 
-        run = (
-            session.query(Run)
-            .filter_by(session_id=session_obj.id)
+        run = session.scalars(
+            select(Run)
+            .where(Run.session_id == session_obj.id)
             .order_by(Run.created_at.desc())
-            .first()
-        )
+            .limit(1)
+        ).first()
         if not run:
             raise SystemExit("No runs found for session.")
 
-        metrics = (
-            session.query(SessionExtraction)
-            .filter_by(run_id=run.id, session_id=session_obj.id, kind="persist_metrics")
+        metrics = session.scalars(
+            select(SessionExtraction)
+            .where(
+                SessionExtraction.run_id == run.id,
+                SessionExtraction.session_id == session_obj.id,
+                SessionExtraction.kind == "persist_metrics",
+            )
             .order_by(SessionExtraction.created_at.desc())
-            .first()
-        )
+            .limit(1)
+        ).first()
 
-        artifacts = (
-            session.query(Artifact)
-            .filter_by(run_id=run.id, session_id=session_obj.id)
-            .all()
-        )
+        artifacts = session.scalars(
+            select(Artifact).where(
+                Artifact.run_id == run.id,
+                Artifact.session_id == session_obj.id,
+            )
+        ).all()
 
-        typer.echo(f"run_id={run.id}")
-        typer.echo(f"transcript_hash={run.transcript_hash}")
+        lines = [f"run_id={run.id}", f"transcript_hash={run.transcript_hash}"]
         if metrics:
-            for key, value in metrics.payload.items():
-                typer.echo(f"{key}={value}")
+            lines.extend(f"{key}={value}" for key, value in metrics.payload.items())
         else:
-            typer.echo("persist_metrics=missing")
-        for artifact in artifacts:
-            typer.echo(f"artifact[{artifact.kind}]={artifact.path}")
+            lines.append("persist_metrics=missing")
+        lines.extend(f"artifact[{artifact.kind}]={artifact.path}" for artifact in artifacts)
+        typer.echo("\n".join(lines))
 
 
 @app.command()
 def list_entities(campaign_slug: str) -> None:
     """List canonical entities for a campaign."""
+    from sqlalchemy import select
+
     from dnd_summary.db import get_session
     from dnd_summary.models import Campaign, Entity
 
     with get_session() as session:
-        campaign = session.query(Campaign).filter_by(slug=campaign_slug).first()
+        campaign = session.scalars(select(Campaign).where(Campaign.slug == campaign_slug)).first()
         if not campaign:
             raise SystemExit("Campaign not found.")
-        entities = (
-            session.query(Entity)
-            .filter_by(campaign_id=campaign.id)
+        entities = session.scalars(
+            select(Entity)
+            .where(Entity.campaign_id == campaign.id)
             .order_by(Entity.entity_type.asc(), Entity.canonical_name.asc())
-            .all()
-        )
-        for entity in entities:
-            typer.echo(f"{entity.entity_type}\t{entity.canonical_name}")
+        ).all()
+        if entities:
+            typer.echo(
+                "\n".join(f"{entity.entity_type}\t{entity.canonical_name}" for entity in entities)
+            )
 
 
 @app.command()
@@ -258,21 +297,20 @@ def build_embeddings(
     rebuild: bool = False,
 ) -> None:
     """Generate semantic embeddings for campaign content."""
+    from sqlalchemy import select
+
     from dnd_summary.db import get_session
     from dnd_summary.embedding_index import build_embeddings_for_campaign
-    from dnd_summary.models import Campaign, Session
+    from dnd_summary.models import Campaign
 
+    settings = _settings()
     with get_session() as session:
-        campaign = session.query(Campaign).filter_by(slug=campaign_slug).first()
+        campaign = session.scalars(select(Campaign).where(Campaign.slug == campaign_slug)).first()
         if not campaign:
             raise SystemExit("Campaign not found.")
         session_obj = None
         if session_slug:
-            session_obj = (
-                session.query(Session)
-                .filter_by(campaign_id=campaign.id, slug=session_slug)
-                .first()
-            )
+            session_obj = _session_for_slugs(session, campaign_slug, session_slug)
             if not session_obj:
                 raise SystemExit("Session not found.")
         try:
@@ -302,13 +340,28 @@ def build_embeddings(
         )
 
 
+_DOCTOR_FIELDS = {
+    "embedding_provider",
+    "embedding_model",
+    "embedding_device",
+    "embedding_dimensions",
+    "rerank_enabled",
+    "rerank_provider",
+    "rerank_model",
+    "rerank_device",
+}
+
+
 @app.command()
 def doctor(load_models: bool = False) -> None:
     """Validate embedding/rerank configuration and storage backends."""
+    from sqlalchemy import text
+
     from dnd_summary.db import get_session
     from dnd_summary.embeddings import _get_provider
     from dnd_summary.rerank import _get_reranker
 
+    settings = _settings()
     with get_session() as session:
         dialect = session.bind.dialect.name if session.bind else "unknown"
         if dialect == "postgresql":
@@ -322,44 +375,36 @@ def doctor(load_models: bool = False) -> None:
         else:
             typer.echo(f"pgvector=skip (dialect={dialect})")
 
+    values = settings.model_dump(include=_DOCTOR_FIELDS)
     typer.echo(
-        "embedding provider={provider} model={model} device={device} dims={dims}".format(
-            provider=settings.embedding_provider,
-            model=settings.embedding_model,
-            device=settings.embedding_device,
-            dims=settings.embedding_dimensions,
-        )
-    )
-    typer.echo(
-        "rerank enabled={enabled} provider={provider} model={model} device={device}".format(
-            enabled=settings.rerank_enabled,
-            provider=settings.rerank_provider,
-            model=settings.rerank_model,
-            device=settings.rerank_device,
-        )
+        "embedding provider={embedding_provider} model={embedding_model} "
+        "device={embedding_device} dims={embedding_dimensions}\n"
+        "rerank enabled={rerank_enabled} provider={rerank_provider} "
+        "model={rerank_model} device={rerank_device}".format(**values)
     )
 
     if load_models:
         _get_provider()
-        if settings.rerank_enabled:
+        if values["rerank_enabled"]:
             _get_reranker()
         typer.echo("models=loaded")
 
 
 def _resolve_latest_run(session, session_id: str, run_id: str | None) -> Run:
+    from sqlalchemy import select
+
     from dnd_summary.models import Run
 
     if run_id:
-        run = session.query(Run).filter_by(id=run_id, session_id=session_id).first()
+        run = session.scalars(
+            select(Run).where(Run.id == run_id, Run.session_id == session_id)
+        ).first()
         if not run:
             raise SystemExit("Run not found for session.")
         return run
-    runs = (
-        session.query(Run)
-        .filter_by(session_id=session_id)
-        .order_by(Run.created_at.desc())
-        .all()
-    )
+    runs = session.scalars(
+        select(Run).where(Run.session_id == session_id).order_by(Run.created_at.desc())
+    ).all()
     if not runs:
         raise SystemExit("No runs found for session.")
     for run in runs:
@@ -368,80 +413,66 @@ def _resolve_latest_run(session, session_id: str, run_id: str | None) -> Run:
     return runs[0]
 
 
+# (report key, llm_usage payload field) pairs summed by inspect-usage.
+_USAGE_TOKEN_FIELDS = (
+    ("prompt", "prompt_token_count"),
+    ("cached", "cached_content_token_count"),
+    ("candidates", "candidates_token_count"),
+    ("total", "total_token_count"),
+    ("non_cached", "non_cached_prompt_token_count"),
+)
+_USAGE_COST_FIELDS = (
+    ("input_cost", "input_cost_usd"),
+    ("cached_cost", "cached_cost_usd"),
+    ("output_cost", "output_cost_usd"),
+    ("total_cost", "total_cost_usd"),
+)
+
+
 @app.command()
 def inspect_usage(campaign_slug: str, session_slug: str, run_id: str | None = None) -> None:
     """Summarize LLM token usage for a session/run."""
+    from sqlalchemy import func, select
+
     from dnd_summary.db import get_session
-    from dnd_summary.models import Campaign, Session, SessionExtraction
+    from dnd_summary.models import SessionExtraction
 
     with get_session() as session:
-        session_obj = (
-            session.query(Session)
-            .join(Campaign, Session.campaign_id == Campaign.id)
-            .filter(Campaign.slug == campaign_slug, Session.slug == session_slug)
-            .first()
-        )
+        session_obj = _session_for_slugs(session, campaign_slug, session_slug)
         if not session_obj:
             raise SystemExit("Session not found.")
         run = _resolve_latest_run(session, session_obj.id, run_id)
-        records = (
-            session.query(SessionExtraction)
-            .filter_by(run_id=run.id, session_id=session_obj.id, kind="llm_usage")
-            .order_by(SessionExtraction.created_at.asc(), SessionExtraction.id.asc())
-            .all()
+        payload = SessionExtraction.payload
+        kind = func.coalesce(payload["call_kind"].as_string(), "unknown").label("kind")
+        # Sum in the database, one row per call kind, ordered by first appearance.
+        stmt = (
+            select(
+                kind,
+                *[
+                    func.coalesce(func.sum(payload[field].as_integer()), 0).label(key)
+                    for key, field in _USAGE_TOKEN_FIELDS
+                ],
+                *[
+                    func.coalesce(func.sum(payload[field].as_float()), 0.0).label(key)
+                    for key, field in _USAGE_COST_FIELDS
+                ],
+            )
+            .where(
+                SessionExtraction.run_id == run.id,
+                SessionExtraction.session_id == session_obj.id,
+                SessionExtraction.kind == "llm_usage",
+            )
+            .group_by(kind)
+            .order_by(func.min(SessionExtraction.created_at))
         )
-        if not records:
+        rows = session.execute(stmt).mappings().all()
+        if not rows:
             typer.echo("No usage records found for this run.")
             return
 
-        totals = {
-            "prompt": 0,
-            "cached": 0,
-            "candidates": 0,
-            "total": 0,
-            "non_cached": 0,
-            "input_cost": 0.0,
-            "cached_cost": 0.0,
-            "output_cost": 0.0,
-            "total_cost": 0.0,
-        }
-        per_kind: dict[str, dict[str, int | float]] = {}
-        for record in records:
-            payload = record.payload or {}
-            kind = payload.get("call_kind", "unknown")
-            bucket = per_kind.setdefault(
-                kind,
-                {
-                    "prompt": 0,
-                    "cached": 0,
-                    "candidates": 0,
-                    "total": 0,
-                    "non_cached": 0,
-                    "input_cost": 0.0,
-                    "cached_cost": 0.0,
-                    "output_cost": 0.0,
-                    "total_cost": 0.0,
-                },
-            )
-            for key, field in [
-                ("prompt", "prompt_token_count"),
-                ("cached", "cached_content_token_count"),
-                ("candidates", "candidates_token_count"),
-                ("total", "total_token_count"),
-                ("non_cached", "non_cached_prompt_token_count"),
-            ]:
-                value = payload.get(field) or 0
-                totals[key] += value
-                bucket[key] += value
-            for key, field in [
-                ("input_cost", "input_cost_usd"),
-                ("cached_cost", "cached_cost_usd"),
-                ("output_cost", "output_cost_usd"),
-                ("total_cost", "total_cost_usd"),
-            ]:
-                value = payload.get(field) or 0
-                totals[key] += value
-                bucket[key] += value
+        keys = [key for key, _ in _USAGE_TOKEN_FIELDS + _USAGE_COST_FIELDS]
+        per_kind = {row["kind"]: {key: row[key] for key in keys} for row in rows}
+        totals = {key: sum(stats[key] for stats in per_kind.values()) for key in keys}
 
         cache_rate = 0.0
         if totals["prompt"]:
@@ -460,7 +491,7 @@ def inspect_usage(campaign_slug: str, session_slug: str, run_id: str | None = No
                     **totals
                 )
             )
-        typer.echo("by_call_kind:")
+        lines = ["by_call_kind:"]
         for kind, stats in per_kind.items():
             line = (
                 f"- {kind}: prompt={stats['prompt']} cached={stats['cached']} "
@@ -470,33 +501,34 @@ def inspect_usage(campaign_slug: str, session_slug: str, run_id: str | None = No
                 line += (
                     " cost=${total_cost:.4f} (input={input_cost:.4f} cached={cached_cost:.4f} output={output_cost:.4f})"
                 ).format(**stats)
-            typer.echo(line)
+            lines.append(line)
+        typer.echo("\n".join(lines))
 
 
 @app.command()
 def verify_cache(campaign_slug: str, session_slug: str, run_id: str | None = None) -> None:
     """Verify transcript cache usage shows cached tokens for a run."""
+    from sqlalchemy import select
+
     from dnd_summary.db import get_session
-    from dnd_summary.models import Campaign, Session, SessionExtraction
+    from dnd_summary.models import SessionExtraction
 
     with get_session() as session:
-        session_obj = (
-            session.query(Session)
-            .join(Campaign, Session.campaign_id == Campaign.id)
-            .filter(Campaign.slug == campaign_slug, Session.slug == session_slug)
-            .first()
-        )
+        session_obj = _session_for_slugs(session, campaign_slug, session_slug)
         if not session_obj:
             raise SystemExit("Session not found.")
         run = _resolve_latest_run(session, session_obj.id, run_id)
-        records = (
-            session.query(SessionExtraction)
-            .filter_by(run_id=run.id, session_id=session_obj.id, kind="llm_usage")
+        payloads = session.scalars(
+            select(SessionExtraction.payload)
+            .where(
+                SessionExtraction.run_id == run.id,
+                SessionExtraction.session_id == session_obj.id,
+                SessionExtraction.kind == "llm_usage",
+            )
             .order_by(SessionExtraction.created_at.asc(), SessionExtraction.id.asc())
-            .all()
-        )
+        ).all()
         cached_tokens = sum(
-            (record.payload or {}).get("cached_content_token_count", 0) for record in records
+            (payload or {}).get("cached_content_token_count", 0) for payload in payloads
         )
         typer.echo(f"run_id={run.id}")
         typer.echo(f"cached_tokens={cached_tokens}")
@@ -515,14 +547,17 @@ def api(host: str = "127.0.0.1", port: int = 8000) -> None:
     uvicorn.run("dnd_summary.api:app", host=host, port=port, reload=False)
 
 
+@lru_cache(maxsize=4096)
 def _parse_datetime(value: str | None) -> datetime | None:
+    from datetime import datetime, timezone
+
     if not value:
         return None
-    text = value
-    if text.endswith("Z"):
-        text = text[:-1] + "+00:00"
+    ts = value
+    if ts.endswith("Z"):
+        ts = ts[:-1] + "+00:00"
     try:
-        parsed = datetime.fromisoformat(text)
+        parsed = datetime.fromisoformat(ts)
     except ValueError:
         return None
     if parsed.tzinfo is None:
@@ -538,63 +573,97 @@ def list_caches(
     verify_remote: bool = False,
 ) -> None:
     """List transcript caches stored in the database."""
-    from google import genai
-    from google.genai import errors
+    from datetime import datetime, timezone
+
+    from sqlalchemy import select
 
     from dnd_summary.db import get_session
     from dnd_summary.models import Campaign, Session, SessionExtraction
 
+    settings = _settings()
     client = None
+    missing_error: type[Exception] = LookupError
     if verify_remote:
         if not settings.gemini_api_key:
             raise SystemExit("Missing Gemini API key for cache verification.")
+        from google import genai
+        from google.genai import errors
+
         client = genai.Client(api_key=settings.gemini_api_key)
+        missing_error = errors.ClientError
 
     with get_session() as session:
-        query = (
-            session.query(SessionExtraction, Session, Campaign)
+        stmt = (
+            select(
+                SessionExtraction.run_id,
+                SessionExtraction.payload,
+                Campaign.slug.label("campaign_slug"),
+                Session.slug.label("session_slug"),
+            )
             .join(Session, SessionExtraction.session_id == Session.id)
             .join(Campaign, Session.campaign_id == Campaign.id)
-            .filter(SessionExtraction.kind == "transcript_cache")
+            .where(SessionExtraction.kind == "transcript_cache")
             .order_by(SessionExtraction.created_at.desc())
         )
         if campaign_slug:
-            query = query.filter(Campaign.slug == campaign_slug)
+            stmt = stmt.where(Campaign.slug == campaign_slug)
         if session_slug:
-            query = query.filter(Session.slug == session_slug)
-        rows = query.all()
+            stmt = stmt.where(Session.slug == session_slug)
+        if not include_expired:
+            payload = SessionExtraction.payload
+            stmt = stmt.where(payload["invalidated"].as_boolean().is_not(True))
+        rows = session.execute(stmt).all()
         if not rows:
             typer.echo("No transcript caches found.")
             return
         now = datetime.now(timezone.utc)
-        for record, session_obj, campaign in rows:
-            payload = record.payload or {}
+        listed = []
+        for row in rows:
+            payload = row.payload or {}
             cache_name = payload.get("cache_name")
             invalidated = payload.get("invalidated", False)
             expires_at = _parse_datetime(payload.get("expires_at"))
             if not include_expired and (invalidated or (expires_at and expires_at <= now)):
                 continue
-            remote_status = None
-            if client and cache_name:
-                try:
-                    client.caches.get(name=cache_name)
-                    remote_status = "ok"
-                except errors.ClientError:
-                    remote_status = "missing"
-                except Exception:
-                    remote_status = "error"
-            status_bits = []
-            if invalidated:
-                status_bits.append("invalidated")
-            if expires_at:
-                status_bits.append(f"expires={expires_at.isoformat()}")
-            if remote_status:
-                status_bits.append(f"remote={remote_status}")
-            status = "; ".join(status_bits) if status_bits else "active"
-            typer.echo(
-                f"{campaign.slug}/{session_obj.slug}\t{record.run_id[:8]}\t{cache_name}\t{status}"
+            listed.append((row, cache_name, invalidated, expires_at))
+
+    remote_statuses: list[str | None] = [None] * len(listed)
+    if client:
+        # One round trip per cache; fan them out so latency tracks the slowest call.
+        with ThreadPoolExecutor(max_workers=CACHE_VERIFY_WORKERS) as executor:
+            remote_statuses = list(
+                executor.map(
+                    lambda name: _probe_remote_cache(client, name, missing_error) if name else None,
+                    [cache_name for _, cache_name, _, _ in listed],
+                )
             )
 
+    lines: list[str] = []
+    for (row, cache_name, invalidated, expires_at), remote_status in zip(listed, remote_statuses):
+        status_bits = []
+        if invalidated:
+            status_bits.append("invalidated")
+        if expires_at:
+            status_bits.append(f"expires={expires_at.isoformat()}")
+        if remote_status:
+            status_bits.append(f"remote={remote_status}")
+        status = "; ".join(status_bits) if status_bits else "active"
+        lines.append(
+            f"{row.campaign_slug}/{row.session_slug}\t{row.run_id[:8]}\t{cache_name}\t{status}"
+        )
+    if lines:
+        typer.echo("\n".join(lines))
+
+
+def _probe_remote_cache(client, cache_name: str, missing_error: type[Exception]) -> str:
+    try:
+        client.caches.get(name=cache_name)
+    except missing_error:
+        return "missing"
+    except Exception:
+        return "error"
+    return "ok"
+
 
 @app.command()
 def clear_caches(
@@ -604,37 +673,49 @@ def clear_caches(
     dry_run: bool = False,
 ) -> None:
     """Delete transcript caches and mark them invalidated in the DB."""
-    from google import genai
+    from datetime import datetime, timezone
+
+    from sqlalchemy import select
 
     from dnd_summary.db import get_session
     from dnd_summary.models import Campaign, Session, SessionExtraction
 
     if not all and not campaign_slug and not session_slug:
         raise SystemExit("Provide --all or filter by campaign/session.")
+    settings = _settings()
     if not dry_run and not settings.gemini_api_key:
         raise SystemExit("Missing Gemini API key for cache deletion.")
 
-    client = genai.Client(api_key=settings.gemini_api_key) if not dry_run else None
+    client = None
+    if not dry_run:
+        from google import genai
+
+        client = genai.Client(api_key=settings.gemini_api_key)
     now = datetime.now(timezone.utc).isoformat()
 
     with get_session() as session:
-        query = (
-            session.query(SessionExtraction, Session, Campaign)
+        stmt = (
+            select(
+                SessionExtraction,
+                Campaign.slug.label("campaign_slug"),
+                Session.slug.label("session_slug"),
+            )
             .join(Session, SessionExtraction.session_id == Session.id)
             .join(Campaign, Session.campaign_id == Campaign.id)
-            .filter(SessionExtraction.kind == "transcript_cache")
+            .where(SessionExtraction.kind == "transcript_cache")
             .order_by(SessionExtraction.created_at.desc())
         )
         if campaign_slug:
-            query = query.filter(Campaign.slug == campaign_slug)
+            stmt = stmt.where(Campaign.slug == campaign_slug)
         if session_slug:
-            query = query.filter(Session.slug == session_slug)
-        rows = query.all()
+            stmt = stmt.where(Session.slug == session_slug)
+        rows = session.execute(stmt).all()
         if not rows:
             typer.echo("No transcript caches found.")
             return
 
-        for record, session_obj, campaign in rows:
+        lines: list[str] = []
+        for record, cache_campaign, cache_session in rows:
             payload = record.payload or {}
             cache_name = payload.get("cache_name")
             if not cache_name:
@@ -653,9 +734,11 @@ def clear_caches(
                 "invalidated": True,
                 "invalidated_at": now,
             }
-            typer.echo(
-                f"{campaign.slug}/{session_obj.slug}\t{record.run_id[:8]}\t{cache_name}\t{result}"
+            lines.append(
+                f"{cache_campaign}/{cache_session}\t{record.run_id[:8]}\t{cache_name}\t{result}"
             )
+        if lines:
+            typer.echo("\n".join(lines))
 
 
 if __name__ == "__main__":
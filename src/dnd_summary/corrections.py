@@ -1,12 +1,25 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
+from functools import lru_cache
 
 from dnd_summary.models import Correction, Entity, EntityAlias, Thread
 
 
+@lru_cache(maxsize=65536)
 def normalize_key(text: str) -> str:
-    return " ".join(text.lower().split())
+    # isprintable() rejects every whitespace character except a plain space, so a
+    # lowercase printable string without doubled or edge spaces is already normalized.
+    if (
+        text.islower()
+        and text.isprintable()
+        and "  " not in text
+        and text[:1] != " "
+        and text[-1:] != " "
+    ):
+        return sys.intern(text)
+    return sys.intern(" ".join(text.lower().split()))
 
 
 def _load_corrections(session, campaign_id: str, session_id: str | None, target_type: str) -> list[Correction]:
@@ -23,7 +36,30 @@ def _load_corrections(session, campaign_id: str, session_id: str | None, target_
     return query.order_by(Correction.created_at.asc(), Correction.id.asc()).all()
 
 
-@dataclass
+def _resolve_merge_chain(merge_map: dict[str, str], start: str) -> str:
+    """Follow merge_map from start, compressing the path onto the final target.
+
+    Cycles are left untouched and resolve to the first revisited id.
+    """
+    path = []
+    seen = set()
+    current = start
+    while current in merge_map and current not in seen:
+        seen.add(current)
+        path.append(current)
+        current = merge_map[current]
+    if current not in seen:
+        for node in path:
+            merge_map[node] = current
+    return current
+
+
+def _merge_closure(merge_map: dict[str, str]) -> dict[str, str]:
+    """Map every merged id straight to the id its merge chain ends at."""
+    return {source: _resolve_merge_chain(merge_map, source) for source in merge_map}
+
+
+@dataclass(slots=True)
 class EntityCorrectionState:
     canonical_name_by_id: dict[str, str]
     alias_to_id: dict[str, str]
@@ -31,14 +67,13 @@ class EntityCorrectionState:
     merge_map: dict[str, str]
     name_to_canonical: dict[str, str]
     hidden_names: set[str]
+    resolved_map: dict[str, str] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.resolved_map = _merge_closure(self.merge_map)
 
     def resolve_id(self, entity_id: str) -> str:
-        seen = set()
-        current = entity_id
-        while current in self.merge_map and current not in seen:
-            seen.add(current)
-            current = self.merge_map[current]
-        return current
+        return self.resolved_map.get(entity_id, entity_id)
 
 
 def load_entity_correction_state(session, campaign_id: str, session_id: str | None) -> EntityCorrectionState:
@@ -53,11 +88,8 @@ def load_entity_correction_state(session, campaign_id: str, session_id: str | No
     )
 
     canonical_name_by_id = {entity.id: entity.canonical_name for entity in entities}
-    alias_to_id: dict[str, str] = {}
-    for entity in entities:
-        alias_to_id[normalize_key(entity.canonical_name)] = entity.id
-    for alias in aliases:
-        alias_to_id[normalize_key(alias.alias)] = alias.entity_id
+    alias_to_id = {normalize_key(entity.canonical_name): entity.id for entity in entities}
+    alias_to_id.update({normalize_key(alias.alias): alias.entity_id for alias in aliases})
 
     hidden_ids: set[str] = set()
     merge_map: dict[str, str] = {}
@@ -97,15 +129,9 @@ def load_entity_correction_state(session, campaign_id: str, session_id: str | No
             hidden_ids.add(correction.target_id)
 
     # Resolve merge chains and remap aliases.
-    resolved_aliases: dict[str, str] = {}
-    for key, entity_id in alias_to_id.items():
-        resolved = entity_id
-        seen = set()
-        while resolved in merge_map and resolved not in seen:
-            seen.add(resolved)
-            resolved = merge_map[resolved]
-        resolved_aliases[key] = resolved
-    alias_to_id = resolved_aliases
+    alias_to_id = {
+        key: _resolve_merge_chain(merge_map, entity_id) for key, entity_id in alias_to_id.items()
+    }
 
     name_to_canonical: dict[str, str] = {}
     hidden_names: set[str] = set()
@@ -115,13 +141,13 @@ def load_entity_correction_state(session, campaign_id: str, session_id: str | No
             continue
         canonical = canonical_name_by_id.get(entity_id)
         if canonical:
-            name_to_canonical[name_key] = canonical
+            name_to_canonical[name_key] = sys.intern(canonical)
     for entity_id, name in canonical_name_by_id.items():
         key = normalize_key(name)
         if entity_id in hidden_ids:
             hidden_names.add(key)
             continue
-        name_to_canonical.setdefault(key, name)
+        name_to_canonical.setdefault(key, sys.intern(name))
 
     return EntityCorrectionState(
         canonical_name_by_id=canonical_name_by_id,
@@ -134,55 +160,55 @@ def load_entity_correction_state(session, campaign_id: str, session_id: str | No
 
 
 def apply_entity_corrections(facts, state: EntityCorrectionState) -> None:
+    if not facts.mentions and not facts.scenes and not facts.events:
+        return
+    hidden_names = state.hidden_names
+    name_to_canonical = state.name_to_canonical
+
+    def _canonical(name: str) -> str | None:
+        """Return the corrected spelling of name, or None when it names a hidden entity."""
+        key = normalize_key(name)
+        if key in hidden_names:
+            return None
+        return name_to_canonical.get(key, name)
+
     cleaned_mentions = []
     for mention in facts.mentions:
-        key = normalize_key(mention.text or "")
-        if key in state.hidden_names:
+        canonical = _canonical(mention.text or "")
+        if canonical is None:
             continue
-        canonical = state.name_to_canonical.get(key)
         if canonical:
             mention.text = canonical
         cleaned_mentions.append(mention)
     facts.mentions = cleaned_mentions
 
     for scene in facts.scenes:
-        if not scene.participants:
-            continue
-        updated = []
-        for participant in scene.participants:
-            key = normalize_key(participant)
-            if key in state.hidden_names:
-                continue
-            canonical = state.name_to_canonical.get(key, participant)
-            updated.append(canonical)
-        scene.participants = updated
+        if scene.participants:
+            scene.participants = [
+                canonical
+                for name in scene.participants
+                if (canonical := _canonical(name)) is not None
+            ]
 
     for event in facts.events:
-        if not event.entities:
-            continue
-        updated = []
-        for entity in event.entities:
-            key = normalize_key(entity)
-            if key in state.hidden_names:
-                continue
-            canonical = state.name_to_canonical.get(key, entity)
-            updated.append(canonical)
-        event.entities = updated
+        if event.entities:
+            event.entities = [
+                canonical for name in event.entities if (canonical := _canonical(name)) is not None
+            ]
 
 
-@dataclass
+@dataclass(slots=True)
 class ThreadCorrectionState:
     overrides: dict[str, dict[str, str]]
     hidden: set[str]
     merge_map: dict[str, str]
+    resolved_map: dict[str, str] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.resolved_map = _merge_closure(self.merge_map)
 
     def resolve_id(self, thread_id: str) -> str:
-        seen = set()
-        current = thread_id
-        while current in self.merge_map and current not in seen:
-            seen.add(current)
-            current = self.merge_map[current]
-        return current
+        return self.resolved_map.get(thread_id, thread_id)
 
 
 def load_thread_correction_state(session, campaign_id: str, session_id: str | None) -> ThreadCorrectionState:
@@ -191,12 +217,28 @@ def load_thread_correction_state(session, campaign_id: str, session_id: str | No
     hidden: set[str] = set()
     merge_map: dict[str, str] = {}
 
+    thread_ids = {correction.target_id for correction in corrections}
+    for correction in corrections:
+        payload = correction.payload or {}
+        if correction.action in ("thread_merge", "merge"):
+            target_thread_id = payload.get("into_id") or payload.get("target_id")
+            if target_thread_id:
+                thread_ids.add(target_thread_id)
+    campaign_thread_by_id = (
+        dict(
+            session.query(Thread.id, Thread.campaign_thread_id)
+            .filter(Thread.id.in_(thread_ids))
+            .all()
+        )
+        if thread_ids
+        else {}
+    )
+
     for correction in corrections:
         payload = correction.payload or {}
-        thread = session.query(Thread).filter_by(id=correction.target_id).first()
-        if not thread or not thread.campaign_thread_id:
+        campaign_thread_id = campaign_thread_by_id.get(correction.target_id)
+        if not campaign_thread_id:
             continue
-        campaign_thread_id = thread.campaign_thread_id
 
         if correction.action in ("thread_status", "status_update"):
             status = payload.get("status")
@@ -219,8 +261,8 @@ def load_thread_correction_state(session, campaign_id: str, session_id: str | No
             target_thread_id = payload.get("into_id") or payload.get("target_id")
             if not target_thread_id:
                 continue
-            target_thread = session.query(Thread).filter_by(id=target_thread_id).first()
-            if target_thread and target_thread.campaign_thread_id:
-                merge_map[campaign_thread_id] = target_thread.campaign_thread_id
+            target_campaign_thread_id = campaign_thread_by_id.get(target_thread_id)
+            if target_campaign_thread_id:
+                merge_map[campaign_thread_id] = target_campaign_thread_id
 
     return ThreadCorrectionState(overrides=overrides, hidden=hidden, merge_map=merge_map)
@@ -3,14 +3,20 @@ from __future__ import annotations
 from contextlib import contextmanager
 from typing import Iterator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
 from sqlalchemy.orm import Session, sessionmaker
 
 from dnd_summary.config import settings
 
 
 def _build_engine():
-    return create_engine(settings.database_url, pool_pre_ping=True)
+    url = make_url(settings.database_url)
+    options = {"pool_pre_ping": settings.db_pool_pre_ping}
+    if url.get_backend_name() != "sqlite":
+        # SQLite URLs may get a pool class that rejects queue sizing arguments.
+        options["pool_size"] = settings.db_pool_size
+        options["max_overflow"] = settings.db_max_overflow
+    return create_engine(url, **options)
 
 
 ENGINE = _build_engine()
@@ -1,13 +1,23 @@
 from __future__ import annotations
 
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import partial
 from dataclasses import dataclass
 from datetime import datetime
 
-from sqlalchemy import func, or_
+from sqlalchemy import case, func, insert, select
 
 from dnd_summary.config import settings
-from dnd_summary.embeddings import EmbeddingInput, embed_texts, text_hash
+from dnd_summary.embeddings import (
+    EmbeddingInput,
+    Vector,
+    _get_provider,
+    embed_texts,
+    stored_embedding_version,
+    text_hash,
+)
 from dnd_summary.models import (
     Embedding,
     Entity,
@@ -30,29 +40,31 @@ class EmbeddingStats:
 
 
 def _latest_run_ids_for_campaign(session, campaign_id: str) -> set[str]:
-    session_rows = session.query(Session).filter_by(campaign_id=campaign_id).all()
-    selected_by_session = {
-        row.id: row.current_run_id for row in session_rows if row.current_run_id
-    }
-    runs = (
-        session.query(Run)
-        .filter_by(campaign_id=campaign_id)
-        .order_by(Run.created_at.desc())
-        .all()
+    selected = session.scalars(
+        select(Session.current_run_id).where(
+            Session.campaign_id == campaign_id,
+            Session.current_run_id.is_not(None),
+        )
+    ).all()
+    # Newest completed run per session, falling back to the newest run of any status.
+    ranked = (
+        select(
+            Run.id,
+            func.row_number()
+            .over(
+                partition_by=Run.session_id,
+                order_by=(
+                    case((Run.status == "completed", 0), else_=1),
+                    Run.created_at.desc(),
+                ),
+            )
+            .label("rank"),
+        )
+        .where(Run.campaign_id == campaign_id)
+        .subquery()
     )
-    latest_by_session: dict[str, str] = {}
-    fallback_by_session: dict[str, str] = {}
-    for run in runs:
-        if run.session_id not in fallback_by_session:
-            fallback_by_session[run.session_id] = run.id
-        if run.status != "completed":
-            continue
-        if run.session_id not in latest_by_session:
-            latest_by_session[run.session_id] = run.id
-    for session_id, run_id in fallback_by_session.items():
-        if session_id not in latest_by_session:
-            latest_by_session[session_id] = run_id
-    return set(selected_by_session.values()) | set(latest_by_session.values())
+    latest = session.scalars(select(ranked.c.id).where(ranked.c.rank == 1)).all()
+    return set(selected) | set(latest)
 
 
 def _content_or_empty(*parts: str | None) -> str:
@@ -88,34 +100,36 @@ def _collect_embedding_inputs(
             )
         )
 
-    runs_query = session.query(Run).filter_by(campaign_id=campaign_id)
+    runs_query = session.query(Run.id, Run.session_id).filter(Run.campaign_id == campaign_id)
     if session_id:
         runs_query = runs_query.filter(Run.session_id == session_id)
     if run_ids is not None:
         runs_query = runs_query.filter(Run.id.in_(run_ids))
     scoped_runs = runs_query.all()
-    run_ids = {run.id for run in scoped_runs}
+    run_ids = {run_id for run_id, _ in scoped_runs}
 
     if not run_ids:
         return inputs
 
-    utterance_sessions = {run.session_id for run in scoped_runs}
-    utterances = (
-        session.query(Utterance)
+    utterance_sessions = {run_session_id for _, run_session_id in scoped_runs}
+    utterance_rows = (
+        session.query(Utterance.id, Utterance.session_id, Utterance.text)
         .filter(Utterance.session_id.in_(utterance_sessions))
         .order_by(Utterance.start_ms.asc())
         .all()
     )
-    for utt in utterances:
-        content = (utt.text or "").strip()
+    quote_lookup: dict[str, str] = {}
+    for utterance_id, utterance_session_id, text in utterance_rows:
+        quote_lookup[utterance_id] = text
+        content = (text or "").strip()
         if not content:
             continue
         inputs.append(
             EmbeddingInput(
                 target_type="utterance",
-                target_id=utt.id,
+                target_id=utterance_id,
                 campaign_id=campaign_id,
-                session_id=utt.session_id,
+                session_id=utterance_session_id,
                 run_id=None,
                 content=content,
             )
@@ -175,7 +189,6 @@ def _collect_embedding_inputs(
             )
         )
 
-    quote_lookup = {utt.id: utt.text for utt in utterances}
     quotes = session.query(Quote).filter(Quote.run_id.in_(run_ids)).all()
     for quote in quotes:
         content = _content_or_empty(
@@ -203,7 +216,7 @@ def _embedding_signature() -> tuple[str, str, str, int, bool]:
     return (
         settings.embedding_provider,
         settings.embedding_model,
-        settings.embedding_version,
+        stored_embedding_version(),
         settings.embedding_dimensions,
         settings.embedding_normalize,
     )
@@ -247,6 +260,21 @@ def _validate_embedding_compatibility(
             raise ValueError("Embedding normalization mismatch; use --rebuild to regenerate.")
 
 
+def _stores_pgvector(session) -> bool:
+    return Vector is not None and session.get_bind().dialect.name == "postgresql"
+
+
+def _embed_batch(texts: list[str], as_float32: bool):
+    vectors = embed_texts(texts)
+    if not as_float32:
+        return vectors
+    # pgvector keeps float4 components, so packing the batch loses nothing and
+    # replaces one boxed float per dimension with a single contiguous buffer.
+    import numpy as np
+
+    return np.asarray(vectors, dtype=np.float32)
+
+
 def build_embeddings_for_campaign(
     session,
     campaign_id: str,
@@ -256,7 +284,10 @@ def build_embeddings_for_campaign(
     rebuild: bool = False,
 ) -> EmbeddingStats:
     model = settings.embedding_model
-    version = settings.embedding_version
+    version = stored_embedding_version()
+    provider = settings.embedding_provider
+    dimensions = settings.embedding_dimensions
+    normalized = settings.embedding_normalize
     now = datetime.utcnow()
 
     if replace or rebuild:
@@ -276,19 +307,25 @@ def build_embeddings_for_campaign(
 
     _validate_embedding_compatibility(session, campaign_id, session_id, rebuild or replace)
 
-    existing_rows = (
-        session.query(Embedding.target_type, Embedding.target_id, Embedding.text_hash)
-        .filter(
-            Embedding.campaign_id == campaign_id,
-            Embedding.model == model,
-            Embedding.version == version,
-        )
-        .all()
+    existing_query = session.query(
+        Embedding.target_type, Embedding.target_id, Embedding.text_hash
+    ).filter(
+        Embedding.campaign_id == campaign_id,
+        Embedding.model == model,
+        Embedding.version == version,
     )
-    existing = {(row[0], row[1]): row[2] for row in existing_rows}
+    if session_id:
+        # Inputs for a single session carry that session id or none (entities).
+        existing_query = existing_query.filter(
+            (Embedding.session_id == session_id) | (Embedding.session_id.is_(None))
+        )
+    existing_rows = existing_query.yield_per(10_000)
+    existing = {
+        (target_type, target_id): digest for target_type, target_id, digest in existing_rows
+    }
 
     inputs = _collect_embedding_inputs(session, campaign_id, session_id, include_all_runs)
-    pending: list[EmbeddingInput] = []
+    pending: list[tuple[EmbeddingInput, str]] = []
     to_delete: list[tuple[str, str]] = []
     skipped = 0
     for entry in inputs:
@@ -300,46 +337,67 @@ def build_embeddings_for_campaign(
                 skipped += 1
                 continue
             to_delete.append(key)
-        pending.append(entry)
+        pending.append((entry, digest))
 
-    if to_delete:
-        delete_filter = [
-            (Embedding.target_type == target_type) & (Embedding.target_id == target_id)
-            for target_type, target_id in to_delete
-        ]
+    stale_ids_by_type: dict[str, list[str]] = defaultdict(list)
+    for target_type, target_id in to_delete:
+        stale_ids_by_type[target_type].append(target_id)
+    for target_type, target_ids in stale_ids_by_type.items():
         session.query(Embedding).filter(
             Embedding.campaign_id == campaign_id,
             Embedding.model == model,
             Embedding.version == version,
-            or_(*delete_filter),
+            Embedding.target_type == target_type,
+            Embedding.target_id.in_(target_ids),
         ).delete(synchronize_session=False)
 
+    # Identical content (e.g. a quote repeating its utterance) is embedded once and
+    # the vector is shared by every input carrying that text.
+    pending_by_content: dict[str, list[tuple[EmbeddingInput, str]]] = defaultdict(list)
+    for entry, digest in pending:
+        pending_by_content[entry.content].append((entry, digest))
+    unique_contents = list(pending_by_content)
+
     created = 0
     batch_size = max(settings.embedding_batch_size, 1)
-    for idx in range(0, len(pending), batch_size):
-        batch = pending[idx : idx + batch_size]
-        texts = [item.content for item in batch]
-        vectors = embed_texts(texts)
-        rows = [
-            Embedding(
-                campaign_id=item.campaign_id,
-                session_id=item.session_id,
-                run_id=item.run_id,
-                target_type=item.target_type,
-                target_id=item.target_id,
-                content=item.content,
-                text_hash=text_hash(item.content),
-                embedding=vector,
-                model=model,
-                version=version,
-                provider=settings.embedding_provider,
-                dimensions=settings.embedding_dimensions,
-                normalized=settings.embedding_normalize,
-                created_at=now,
-            )
-            for item, vector in zip(batch, vectors)
-        ]
-        session.add_all(rows)
-        created += len(rows)
+    batch_texts = [
+        unique_contents[idx : idx + batch_size]
+        for idx in range(0, len(unique_contents), batch_size)
+    ]
+    workers = max(1, min(settings.embedding_workers, len(batch_texts)))
+    embed_batch = partial(_embed_batch, as_float32=_stores_pgvector(session))
+    with ExitStack() as stack:
+        if workers > 1:
+            # Build the shared provider up front so worker threads don't race to load it.
+            _get_provider()
+            executor = stack.enter_context(ThreadPoolExecutor(max_workers=workers))
+            batch_vectors = executor.map(embed_batch, batch_texts)
+        else:
+            batch_vectors = map(embed_batch, batch_texts)
+        # Rows are inserted on this thread; the Session must not be shared with the workers.
+        for texts, vectors in zip(batch_texts, batch_vectors):
+            rows = [
+                {
+                    "campaign_id": item.campaign_id,
+                    "session_id": item.session_id,
+                    "run_id": item.run_id,
+                    "target_type": item.target_type,
+                    "target_id": item.target_id,
+                    "content": text,
+                    "text_hash": digest,
+                    "embedding": vector,
+                    "model": model,
+                    "version": version,
+                    "provider": provider,
+                    "dimensions": dimensions,
+                    "normalized": normalized,
+                    "created_at": now,
+                }
+                for text, vector in zip(texts, vectors)
+                for item, digest in pending_by_content[text]
+            ]
+            if rows:
+                session.execute(insert(Embedding), rows)
+            created += len(rows)
 
     return EmbeddingStats(created=created, skipped=skipped, deleted=deleted)
@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import hashlib
 import math
-import random
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Iterable, Sequence
 
+import numpy as np
+import numpy.typing as npt
 from sqlalchemy import JSON
 from sqlalchemy.types import TypeDecorator
 
@@ -27,31 +29,43 @@ class EmbeddingVector(TypeDecorator):
         return dialect.type_descriptor(JSON())
 
     def process_bind_param(self, value, dialect):
+        if hasattr(value, "tolist") and (dialect.name != "postgresql" or Vector is None):
+            return value.tolist()
         return value
 
     def process_result_value(self, value, dialect):
         return value
 
 
-def _hash_seed(text: str) -> int:
-    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
-    return int(digest[:16], 16)
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
 
-def _hash_embedding(text: str, dimensions: int) -> list[float]:
-    rng = random.Random(_hash_seed(text))
-    return [rng.uniform(-1.0, 1.0) for _ in range(dimensions)]
+def _hash_seed(text: str) -> int:
+    return int(text_hash(text)[:16], 16)
 
 
-def text_hash(text: str) -> str:
-    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+# Any odd increment selects a full-period PCG64 stream; each text starts at its own state.
+_HASH_PCG64_INCREMENT = 0x14057B7EF767814F
 
 
-def _normalize_vector(vector: list[float]) -> list[float]:
-    norm = math.sqrt(sum(value * value for value in vector))
-    if norm == 0.0:
-        return vector
-    return [value / norm for value in vector]
+def _hash_embeddings(texts: Sequence[str], dimensions: int) -> np.ndarray:
+    """Draw one row per text in [-1, 1) from a PCG64 state seeded by the text's hash."""
+    bit_generator = np.random.PCG64()
+    generator = np.random.Generator(bit_generator)
+    vectors = np.empty((len(texts), dimensions))
+    for row, text in zip(vectors, texts):
+        # Setting the state directly skips SeedSequence, which dominates per-text cost.
+        bit_generator.state = {
+            "bit_generator": "PCG64",
+            "state": {"state": _hash_seed(text), "inc": _HASH_PCG64_INCREMENT},
+            "has_uint32": 0,
+            "uinteger": 0,
+        }
+        generator.random(out=row)
+    vectors *= 2.0
+    vectors -= 1.0
+    return vectors
 
 
 class EmbeddingProvider:
@@ -61,10 +75,13 @@ class EmbeddingProvider:
 
 class HashEmbeddingProvider(EmbeddingProvider):
     def embed(self, texts: Sequence[str]) -> list[list[float]]:
-        vectors = [_hash_embedding(text, settings.embedding_dimensions) for text in texts]
+        if not texts:
+            return []
+        vectors = _hash_embeddings(texts, settings.embedding_dimensions)
         if settings.embedding_normalize:
-            return [_normalize_vector(vector) for vector in vectors]
-        return vectors
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors.tolist()
 
 
 class HFEmbeddingProvider(EmbeddingProvider):
@@ -94,21 +111,29 @@ class HFEmbeddingProvider(EmbeddingProvider):
             convert_to_numpy=True,
             show_progress_bar=False,
         )
-        return [vector.tolist() for vector in vectors]
+        return vectors.tolist()
 
 
 _PROVIDER: EmbeddingProvider | None = None
 _PROVIDER_KEY: tuple[str, str, str, int, bool] | None = None
+_PROVIDER_KEY_REVISION: tuple[int, tuple[str, str, str, int, bool]] | None = None
 
 
 def _provider_key() -> tuple[str, str, str, int, bool]:
-    return (
+    global _PROVIDER_KEY_REVISION
+    revision = settings.revision
+    cached = _PROVIDER_KEY_REVISION
+    if cached is not None and cached[0] == revision:
+        return cached[1]
+    key = (
         settings.embedding_provider,
         settings.embedding_model,
         settings.embedding_device,
         settings.embedding_dimensions,
         settings.embedding_normalize,
     )
+    _PROVIDER_KEY_REVISION = (revision, key)
+    return key
 
 
 def _get_provider() -> EmbeddingProvider:
@@ -128,25 +153,91 @@ def _get_provider() -> EmbeddingProvider:
     return provider
 
 
+# Bumped when a provider starts producing different vectors for the same text. The tag is
+# appended to the stored version, so only that provider's rows go stale.
+_PROVIDER_VECTOR_REVISIONS = {"hash": "pcg64"}
+
+
+def stored_embedding_version() -> str:
+    """Value written to and matched against ``Embedding.version`` for the active provider."""
+    revision = _PROVIDER_VECTOR_REVISIONS.get(settings.embedding_provider)
+    if revision is None:
+        return settings.embedding_version
+    return f"{settings.embedding_version}+{revision}"
+
+
 def embed_texts(texts: Sequence[str]) -> list[list[float]]:
     provider = _get_provider()
     return provider.embed(texts)
 
 
+@lru_cache(maxsize=256)
+def _cached_query_embedding(
+    provider_key: tuple[str, str, str, int, bool], text: str
+) -> npt.NDArray[np.float32]:
+    # Similarity math and pgvector both run in float32, so caching float32 loses nothing
+    # and keeps each entry at 4 bytes per dimension instead of a tuple of boxed floats.
+    vector = np.asarray(embed_texts([text])[0], dtype=np.float32)
+    vector.setflags(write=False)
+    return vector
+
+
+def embed_query(text: str) -> npt.NDArray[np.float32]:
+    """Embed a single search query, reusing the vector for repeated queries.
+
+    The array is shared with the cache and read-only; the similarity helpers take it as is.
+    """
+    return _cached_query_embedding(_provider_key(), text)
+
+
 def cosine_similarity(left: Sequence[float], right: Sequence[float]) -> float:
     if left is None or right is None:
         return 0.0
     if len(left) == 0 or len(right) == 0 or len(left) != len(right):
         return 0.0
-    dot = sum(a * b for a, b in zip(left, right))
-    left_norm = math.sqrt(sum(a * a for a in left))
-    right_norm = math.sqrt(sum(b * b for b in right))
-    if left_norm == 0.0 or right_norm == 0.0:
+    a = np.asarray(left, dtype=np.float32)
+    b = np.asarray(right, dtype=np.float32)
+    # Embedding-sized vectors stay in cache across the three dot products; one sqrt
+    # covers both norms.
+    squared_norms = float(a @ a) * float(b @ b)
+    if squared_norms == 0.0:
         return 0.0
-    return dot / (left_norm * right_norm)
+    return float(a @ b) / math.sqrt(squared_norms)
+
+
+def unit_vector(vector: Sequence[float]) -> np.ndarray:
+    values = np.asarray(vector, dtype=np.float32)
+    norm = math.sqrt(float(values @ values)) if len(values) else 0.0
+    return values / norm if norm else values
+
+
+def cosine_similarity_normalized(left: Sequence[float], right: Sequence[float]) -> float:
+    """Cosine similarity for vectors that are both already unit length: a plain dot product."""
+    if left is None or right is None:
+        return 0.0
+    if len(left) == 0 or len(right) == 0 or len(left) != len(right):
+        return 0.0
+    return float(np.asarray(left, dtype=np.float32) @ np.asarray(right, dtype=np.float32))
+
+
+def cosine_similarity_batch(
+    query: Sequence[float], corpus: Sequence[Sequence[float]]
+) -> np.ndarray:
+    """Cosine similarity of query against every row of a (K, D) corpus in one matrix product.
+
+    Rows with zero norm score 0.0, matching cosine_similarity.
+    """
+    unit_query = unit_vector(query)
+    matrix = np.asarray(corpus, dtype=np.float32)
+    scores = np.zeros(len(matrix), dtype=np.float32)
+    if matrix.ndim != 2 or matrix.shape[1] != len(unit_query) or not len(unit_query):
+        return scores
+    norms = np.sqrt(np.einsum("ij,ij->i", matrix, matrix))
+    np.divide(matrix @ unit_query, norms, out=scores, where=norms > 0)
+    return scores
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EmbeddingInput:
     target_type: str
     target_id: str
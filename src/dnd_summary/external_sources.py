@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
 from dataclasses import dataclass
 import json
 from pathlib import Path
 
+import orjson
+
 CHARACTER_SHEETS_DIR = "character_sheets"
 ROLLS_FILE = "rolls.jsonl"
 ROLL_KINDS = {"attack", "damage", "save", "check", "initiative", "other"}
+# Maps each parsed kind onto the shared literal, so every roll of a kind references one str.
+_CANONICAL_ROLL_KINDS = {kind: kind for kind in ROLL_KINDS}
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DiceRollInput:
     t_ms: int
     character: str | None
@@ -36,44 +41,61 @@ def find_rolls_path(session_dir: Path) -> Path | None:
     return rolls_path if rolls_path.exists() else None
 
 
+def iter_rolls(path: Path, errors: list[str]) -> Iterator[DiceRollInput]:
+    """Yield valid rolls line by line, appending per-line problems to `errors`."""
+    # Character names and dice expressions repeat across a session; rolls share one copy.
+    shared: dict[str, str] = {}
+    with path.open("rb") as handle:
+        for line_number, raw in enumerate(handle, start=1):
+            if not raw.strip():
+                continue
+            try:
+                payload = orjson.loads(raw)
+            except orjson.JSONDecodeError as exc:
+                errors.append(f"line {line_number}: {exc}")
+                continue
+            roll = _roll_from_payload(payload, line_number, errors, shared)
+            if roll is not None:
+                yield roll
+
+
+def _roll_from_payload(
+    payload: dict, line_number: int, errors: list[str], shared: dict[str, str]
+) -> DiceRollInput | None:
+    get = payload.get
+    t_ms = get("t_ms")
+    if not isinstance(t_ms, (int, float)):
+        errors.append(f"line {line_number}: missing or invalid t_ms")
+        return None
+
+    total = get("total")
+    if total is not None and not isinstance(total, int):
+        errors.append(f"line {line_number}: invalid total")
+        return None
+
+    kind = get("kind", "other")
+    kind = _CANONICAL_ROLL_KINDS.get(kind, "other") if isinstance(kind, str) else "other"
+    character = get("character")
+    if isinstance(character, str):
+        character = shared.setdefault(character, character)
+    expression = get("expression")
+    if isinstance(expression, str):
+        expression = shared.setdefault(expression, expression)
+
+    # Positional construction: keyword arguments cost a measurable share of the
+    # frozen dataclass __init__ when a session has thousands of rolls.
+    return DiceRollInput(
+        int(t_ms),
+        character,
+        kind,
+        expression,
+        total,
+        get("detail"),
+        line_number,
+    )
+
+
 def parse_rolls_jsonl(path: Path) -> tuple[list[DiceRollInput], list[str]]:
-    rolls: list[DiceRollInput] = []
     errors: list[str] = []
-    for line_number, raw in enumerate(path.read_text(encoding="utf-8").splitlines(), start=1):
-        if not raw.strip():
-            continue
-        try:
-            payload = json.loads(raw)
-        except json.JSONDecodeError as exc:
-            errors.append(f"line {line_number}: {exc}")
-            continue
-
-        t_ms = payload.get("t_ms")
-        if not isinstance(t_ms, (int, float)):
-            errors.append(f"line {line_number}: missing or invalid t_ms")
-            continue
-        t_ms = int(t_ms)
-
-        kind = payload.get("kind", "other")
-        if not isinstance(kind, str):
-            kind = "other"
-        kind = kind if kind in ROLL_KINDS else "other"
-
-        total = payload.get("total")
-        if total is not None and not isinstance(total, int):
-            errors.append(f"line {line_number}: invalid total")
-            continue
-
-        rolls.append(
-            DiceRollInput(
-                t_ms=t_ms,
-                character=payload.get("character"),
-                kind=kind,
-                expression=payload.get("expression"),
-                total=total,
-                detail=payload.get("detail"),
-                line_number=line_number,
-            )
-        )
-
+    rolls = list(iter_rolls(path, errors))
     return rolls, errors
@@ -1,19 +1,30 @@
 from __future__ import annotations
 
+import asyncio
 import random
 import time
+from dataclasses import dataclass
+from typing import Any
 
-from google import genai
 from google.genai import errors, types
 
 from dnd_summary.config import settings
+from dnd_summary.llm_cache import genai_client
+
+
+@dataclass(slots=True)
+class LLMResult:
+    text: str = ""
+    usage: Any = None
+    latency_ms: int = 0
+    error: Exception | None = None
 
 
 class LLMClient:
     def __init__(self) -> None:
         if not settings.gemini_api_key:
             raise ValueError("Missing Gemini API key (set DND_GEMINI_API_KEY).")
-        self._client = genai.Client(api_key=settings.gemini_api_key)
+        self._client = genai_client()
 
     def _is_retryable(self, exc: Exception) -> bool:
         if isinstance(exc, errors.ServerError):
@@ -23,46 +34,91 @@ class LLMClient:
             return status in {408, 429}
         return False
 
-    def _call_with_retry(self, fn):
+    def _retry_delays(self):
         delay = settings.llm_retry_min_seconds
+        while True:
+            jitter = random.uniform(0, delay)
+            yield min(delay + jitter, settings.llm_retry_max_seconds)
+            delay = min(delay * settings.llm_retry_backoff, settings.llm_retry_max_seconds)
+
+    def _call_with_retry(self, fn):
+        delays = self._retry_delays()
         for attempt in range(1, settings.llm_max_retries + 1):
             try:
                 return fn()
             except Exception as exc:
                 if attempt >= settings.llm_max_retries or not self._is_retryable(exc):
                     raise
-                jitter = random.uniform(0, delay)
-                time.sleep(min(delay + jitter, settings.llm_retry_max_seconds))
-                delay = min(delay * settings.llm_retry_backoff, settings.llm_retry_max_seconds)
+                time.sleep(next(delays))
 
-    def generate_json(
+    async def _acall_with_retry(self, fn):
+        delays = self._retry_delays()
+        for attempt in range(1, settings.llm_max_retries + 1):
+            try:
+                return await fn()
+            except Exception as exc:
+                if attempt >= settings.llm_max_retries or not self._is_retryable(exc):
+                    raise
+                await asyncio.sleep(next(delays))
+
+    def _request(
         self,
         prompt: str,
         *,
+        mime_type: str,
+        schema: types.Schema | None = None,
         system: str | None = None,
         cached_content: str | None = None,
-        return_usage: bool = False,
-    ):
-        def _call():
-            response = self._client.models.generate_content(
-                model=settings.gemini_model,
-                contents=[
-                    types.Content(role="user", parts=[types.Part.from_text(text=prompt)])
-                ],
-                config=types.GenerateContentConfig(
-                    response_mime_type="application/json",
-                    system_instruction=[system] if system else None,
-                    cached_content=cached_content,
-                ),
-            )
-            return response
-
-        response = self._call_with_retry(_call)
+    ) -> dict:
+        return {
+            "model": settings.gemini_model,
+            "contents": [
+                types.Content(role="user", parts=[types.Part.from_text(text=prompt)])
+            ],
+            "config": types.GenerateContentConfig(
+                response_mime_type=mime_type,
+                response_schema=schema,
+                system_instruction=[system] if system else None,
+                cached_content=cached_content,
+            ),
+        }
+
+    def _generate(self, prompt: str, *, return_usage: bool, **kwargs):
+        request = self._request(prompt, **kwargs)
+        response = self._call_with_retry(
+            lambda: self._client.models.generate_content(**request)
+        )
         text = response.text or ""
         if return_usage:
             return text, getattr(response, "usage_metadata", None)
         return text
 
+    async def _agenerate(self, prompt: str, *, return_usage: bool, **kwargs):
+        request = self._request(prompt, **kwargs)
+        response = await self._acall_with_retry(
+            lambda: self._client.aio.models.generate_content(**request)
+        )
+        text = response.text or ""
+        if return_usage:
+            return text, getattr(response, "usage_metadata", None)
+        return text
+
+    def generate_json(
+        self,
+        prompt: str,
+        *,
+        system: str | None = None,
+        cached_content: str | None = None,
+        return_usage: bool = False,
+    ):
+        return self._generate(
+            prompt,
+            mime_type="application/json",
+            system=system,
+            cached_content=cached_content,
+            return_usage=return_usage,
+        )
+
     def generate_text(
         self,
         prompt: str,
@@ -71,25 +127,13 @@ class LLMClient:
         cached_content: str | None = None,
         return_usage: bool = False,
     ):
-        def _call():
-            response = self._client.models.generate_content(
-                model=settings.gemini_model,
-                contents=[
-                    types.Content(role="user", parts=[types.Part.from_text(text=prompt)])
-                ],
-                config=types.GenerateContentConfig(
-                    response_mime_type="text/plain",
-                    system_instruction=[system] if system else None,
-                    cached_content=cached_content,
-                ),
-            )
-            return response
-
-        response = self._call_with_retry(_call)
-        text = response.text or ""
-        if return_usage:
-            return text, getattr(response, "usage_metadata", None)
-        return text
+        return self._generate(
+            prompt,
+            mime_type="text/plain",
+            system=system,
+            cached_content=cached_content,
+            return_usage=return_usage,
+        )
 
     def generate_json_schema(
         self,
@@ -100,23 +144,97 @@ class LLMClient:
         cached_content: str | None = None,
         return_usage: bool = False,
     ):
-        def _call():
-            response = self._client.models.generate_content(
-                model=settings.gemini_model,
-                contents=[
-                    types.Content(role="user", parts=[types.Part.from_text(text=prompt)])
-                ],
-                config=types.GenerateContentConfig(
-                    response_mime_type="application/json",
-                    response_schema=schema,
-                    system_instruction=[system] if system else None,
-                    cached_content=cached_content,
-                ),
-            )
-            return response
-
-        response = self._call_with_retry(_call)
-        text = response.text or ""
-        if return_usage:
-            return text, getattr(response, "usage_metadata", None)
-        return text
+        return self._generate(
+            prompt,
+            mime_type="application/json",
+            schema=schema,
+            system=system,
+            cached_content=cached_content,
+            return_usage=return_usage,
+        )
+
+    async def agenerate_json(
+        self,
+        prompt: str,
+        *,
+        system: str | None = None,
+        cached_content: str | None = None,
+        return_usage: bool = False,
+    ):
+        return await self._agenerate(
+            prompt,
+            mime_type="application/json",
+            system=system,
+            cached_content=cached_content,
+            return_usage=return_usage,
+        )
+
+    async def agenerate_text(
+        self,
+        prompt: str,
+        *,
+        system: str | None = None,
+        cached_content: str | None = None,
+        return_usage: bool = False,
+    ):
+        return await self._agenerate(
+            prompt,
+            mime_type="text/plain",
+            system=system,
+            cached_content=cached_content,
+            return_usage=return_usage,
+        )
+
+    async def agenerate_json_schema(
+        self,
+        prompt: str,
+        *,
+        schema: types.Schema,
+        system: str | None = None,
+        cached_content: str | None = None,
+        return_usage: bool = False,
+    ):
+        return await self._agenerate(
+            prompt,
+            mime_type="application/json",
+            schema=schema,
+            system=system,
+            cached_content=cached_content,
+            return_usage=return_usage,
+        )
+
+    async def generate_many(
+        self,
+        prompts: list[str],
+        *,
+        mime_type: str = "text/plain",
+        schema: types.Schema | None = None,
+        system: str | None = None,
+        cached_content: str | None = None,
+    ) -> list[LLMResult]:
+        """Run prompts concurrently, at most `llm_concurrency` in flight.
+
+        Results keep prompt order; a failed prompt carries its exception in `error`
+        instead of cancelling the others, so callers can record every call.
+        """
+        limit = asyncio.Semaphore(max(1, settings.llm_concurrency))
+
+        async def _run(prompt: str) -> LLMResult:
+            async with limit:
+                start = time.monotonic()
+                try:
+                    text, usage = await self._agenerate(
+                        prompt,
+                        mime_type=mime_type,
+                        schema=schema,
+                        system=system,
+                        cached_content=cached_content,
+                        return_usage=True,
+                    )
+                except Exception as exc:
+                    latency_ms = int((time.monotonic() - start) * 1000)
+                    return LLMResult(latency_ms=latency_ms, error=exc)
+                latency_ms = int((time.monotonic() - start) * 1000)
+                return LLMResult(text=text, usage=usage, latency_ms=latency_ms)
+
+        return list(await asyncio.gather(*(_run(prompt) for prompt in prompts)))
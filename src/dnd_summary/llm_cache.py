@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any
 
 from google import genai
 from google.genai import types
+from sqlalchemy import select
 
 from dnd_summary.config import settings
 from dnd_summary.models import Run, SessionExtraction
@@ -14,6 +16,16 @@ class CacheRequiredError(RuntimeError):
     pass
 
 
+@lru_cache(maxsize=4)
+def _cached_genai_client(factory, api_key: str | None) -> genai.Client:
+    return factory(api_key=api_key)
+
+
+def genai_client() -> genai.Client:
+    """Process-wide Gemini client, so repeated calls reuse its pooled HTTP connections."""
+    return _cached_genai_client(genai.Client, settings.gemini_api_key)
+
+
 def _parse_datetime(value: Any) -> datetime | None:
     if not value:
         return None
@@ -21,7 +33,12 @@ def _parse_datetime(value: Any) -> datetime | None:
         if value.tzinfo is None:
             return value.replace(tzinfo=timezone.utc)
         return value
-    text = str(value)
+    return _parse_datetime_text(str(value))
+
+
+@lru_cache(maxsize=1024)
+def _parse_datetime_text(text: str) -> datetime | None:
+    # Cache rows repeat the same expires_at strings; datetimes are immutable, so share them.
     if text.endswith("Z"):
         text = text[:-1] + "+00:00"
     try:
@@ -33,6 +50,23 @@ def _parse_datetime(value: Any) -> datetime | None:
     return parsed
 
 
+_USAGE_KEYS = (
+    "prompt_token_count",
+    "cached_content_token_count",
+    "candidates_token_count",
+    "total_token_count",
+)
+
+
+def _usage_values(usage: Any, keys: tuple[str, ...] = _USAGE_KEYS) -> tuple[int | None, ...]:
+    """Read several usage counters, deciding dict vs object access once."""
+    if usage is None:
+        return (None,) * len(keys)
+    if isinstance(usage, dict):
+        return tuple(map(usage.get, keys))
+    return tuple(getattr(usage, key, None) for key in keys)
+
+
 def _usage_value(usage: Any, key: str) -> int | None:
     if usage is None:
         return None
@@ -42,6 +76,10 @@ def _usage_value(usage: Any, key: str) -> int | None:
 
 
 def _approx_token_count(char_count: int) -> int:
+    """Gemini's ~4 chars/token rule, for prompt-size metadata only.
+
+    Costs and cache-hit checks use the exact counts from the response's usage_metadata.
+    """
     if char_count <= 0:
         return 0
     return max(1, char_count // 4)
@@ -119,31 +157,32 @@ def _find_cached_transcript(
     session,
     run: Run,
 ) -> str | None:
-    candidates = (
-        session.query(SessionExtraction)
-        .filter_by(
-            session_id=run.session_id,
-            kind="transcript_cache",
-            model=settings.gemini_model,
+    payload = SessionExtraction.payload
+    cache_name = payload["cache_name"].as_string()
+    stmt = (
+        select(cache_name, payload["expires_at"].as_string())
+        .where(
+            SessionExtraction.session_id == run.session_id,
+            SessionExtraction.kind == "transcript_cache",
+            SessionExtraction.model == settings.gemini_model,
+            payload["transcript_hash"].as_string() == run.transcript_hash,
+            payload["format_version"].as_string() == settings.transcript_format_version,
+            payload["invalidated"].as_boolean().is_not(True),
+            cache_name.is_not(None),
         )
         .order_by(SessionExtraction.created_at.desc())
-        .all()
     )
     now = datetime.now(timezone.utc)
-    for record in candidates:
-        payload = record.payload or {}
-        if payload.get("invalidated"):
-            continue
-        if payload.get("transcript_hash") != run.transcript_hash:
-            continue
-        if payload.get("format_version") != settings.transcript_format_version:
-            continue
-        expires_at = _parse_datetime(payload.get("expires_at"))
-        if expires_at and expires_at <= now:
-            continue
-        cache_name = payload.get("cache_name")
-        if cache_name:
-            return cache_name
+    # expires_at is free-form JSON text, so parse it here rather than casting in SQL; stream
+    # rows and stop at the first live cache instead of buffering every candidate.
+    result = session.execute(stmt.execution_options(yield_per=8))
+    try:
+        for name, expires_at in result:
+            expires = _parse_datetime(expires_at)
+            if name and not (expires and expires <= now):
+                return name
+    finally:
+        result.close()
     return None
 
 
@@ -163,6 +202,13 @@ def ensure_transcript_cache(
             raise CacheRequiredError("Explicit transcript cache required but disabled.")
         return None, build_transcript_block(transcript_text, cached=False)
 
+    if (
+        not settings.require_transcript_cache
+        and _approx_token_count(len(transcript_text)) < settings.cache_min_tokens
+    ):
+        # Too small to be worth a cache write plus hourly storage; send it inline.
+        return None, build_transcript_block(transcript_text, cached=False)
+
     cache_name = _find_cached_transcript(session, run)
     if cache_name:
         return cache_name, build_transcript_block("", cached=True)
@@ -178,7 +224,7 @@ def ensure_transcript_cache(
             raise CacheRequiredError("Missing Gemini API key for transcript cache.")
         return None, build_transcript_block(transcript_text, cached=False)
 
-    client = genai.Client(api_key=settings.gemini_api_key)
+    client = genai_client()
     cached_text = build_transcript_block(transcript_text, cached=False)
     ttl = f"{settings.cache_ttl_seconds}s"
     display_name = f"{run.session_id}:{run.id}:transcript"
@@ -197,6 +243,7 @@ def ensure_transcript_cache(
             ),
         )
         token_count = _usage_value(getattr(cache, "usage_metadata", None), "total_token_count")
+        token_estimate = _approx_token_count(len(cached_text))
         session.add(
             SessionExtraction(
                 run_id=run.id,
@@ -214,9 +261,12 @@ def ensure_transcript_cache(
                     else None,
                     "format_version": settings.transcript_format_version,
                     "token_count": token_count,
+                    "token_estimate": token_estimate,
                     "storage_hours": round(settings.cache_ttl_seconds / 3600, 4),
+                    # Fall back to the local estimate rather than dropping the cost when
+                    # the create response carries no usage metadata.
                     "storage_cost_usd": cache_storage_cost(
-                        token_count, settings.cache_ttl_seconds
+                        token_count or token_estimate, settings.cache_ttl_seconds
                     ),
                 },
                 created_at=datetime.utcnow(),
@@ -249,9 +299,10 @@ def record_llm_usage(
 ) -> None:
     if usage is None:
         return
-    prompt_tokens = _usage_value(usage, "prompt_token_count") or 0
-    cached_tokens = _usage_value(usage, "cached_content_token_count") or 0
-    output_tokens = _usage_value(usage, "candidates_token_count") or 0
+    prompt_tokens, cached_tokens, output_tokens, total_tokens = _usage_values(usage)
+    prompt_tokens = prompt_tokens or 0
+    cached_tokens = cached_tokens or 0
+    output_tokens = output_tokens or 0
     non_cached_tokens = max(prompt_tokens - cached_tokens, 0)
     input_cost = _cost_for_tokens(non_cached_tokens, settings.llm_input_cost_per_million)
     cached_cost = _cost_for_tokens(cached_tokens, settings.llm_cached_cost_per_million)
@@ -262,10 +313,11 @@ def record_llm_usage(
         "prompt_token_count": prompt_tokens,
         "cached_content_token_count": cached_tokens,
         "candidates_token_count": output_tokens,
-        "total_token_count": _usage_value(usage, "total_token_count"),
+        "total_token_count": total_tokens,
         "non_cached_prompt_token_count": non_cached_tokens,
         "cache_name": cache_name,
-        "cache_hit": cache_hit_from_usage(usage, cache_name),
+        # Same rule as cache_hit_from_usage, reusing the counter read above.
+        "cache_hit": bool(cache_name) and cached_tokens > 0,
         "cache_required": settings.require_transcript_cache,
         "input_cost_usd": _round_cost(input_cost),
         "cached_cost_usd": _round_cost(cached_cost),
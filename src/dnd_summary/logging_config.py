@@ -4,20 +4,39 @@ import json
 import logging
 from datetime import datetime, timezone
 
+import orjson
+
 from dnd_summary.config import settings
 
 
 class JsonFormatter(logging.Formatter):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._now = datetime.now
+        self._utc = timezone.utc
+
     def format(self, record: logging.LogRecord) -> str:
         payload = {
-            "ts": datetime.now(timezone.utc).isoformat(),
+            # orjson renders aware datetimes in the same ISO 8601 form as isoformat().
+            "ts": self._now(self._utc),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
         }
         if record.exc_info:
-            payload["exc_info"] = self.formatException(record.exc_info)
-        return json.dumps(payload, ensure_ascii=True)
+            # Same caching as logging.Formatter: a record emitted to several handlers
+            # formats its traceback once.
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+            payload["exc_info"] = record.exc_text
+        try:
+            # Non-ASCII text is written as raw UTF-8 rather than \u escapes.
+            return orjson.dumps(payload).decode("utf-8")
+        except (orjson.JSONEncodeError, TypeError):
+            # orjson rejects lone surrogates (e.g. undecodable bytes from surrogateescape);
+            # the stdlib encoder escapes them, so the record is still logged.
+            payload["ts"] = payload["ts"].isoformat()
+            return json.dumps(payload, ensure_ascii=True)
 
 
 def setup_logging() -> None:
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from dnd_summary.config import settings
+
+T = TypeVar("T")
+
+
+class CampaignLookupCache(Generic[T]):
+    """Thread-safe LRU of small per-campaign lookups with a TTL.
+
+    Values are shared between callers and must be treated as read-only. Local writers call
+    ``invalidate_after_commit`` so the entry is dropped once their write is visible, but
+    that only reaches this process: other API workers and the CLI writing to the same
+    database keep serving their cached value for up to ``campaign_lookup_cache_ttl_seconds``.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self._maxsize = maxsize
+        self._entries: OrderedDict[str, tuple[float, T]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_load(self, campaign_id: str, loader: Callable[[], T]) -> T:
+        ttl = settings.campaign_lookup_cache_ttl_seconds
+        if ttl <= 0:
+            return loader()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(campaign_id)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(campaign_id)
+                return entry[1]
+        value = loader()
+        with self._lock:
+            self._entries[campaign_id] = (now + ttl, value)
+            self._entries.move_to_end(campaign_id)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, campaign_id: str | None = None) -> None:
+        with self._lock:
+            if campaign_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(campaign_id, None)
+
+    def invalidate_after_commit(self, session: Session, campaign_id: str) -> None:
+        """Invalidate ``campaign_id`` when ``session`` commits.
+
+        Dropping the entry before commit lets a concurrent reader re-cache the old rows
+        until the TTL expires.
+        """
+        key = ("campaign_lookup_cache", id(self))
+        pending = session.info.get(key)
+        if pending is None:
+            pending = session.info[key] = set()
+
+            def _invalidate(committed: Session) -> None:
+                for pending_id in committed.info.pop(key, ()):
+                    self.invalidate(pending_id)
+
+            event.listen(session, "after_commit", _invalidate, once=True)
+        pending.add(campaign_id)
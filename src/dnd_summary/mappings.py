@@ -1,18 +1,37 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+from sqlalchemy import lambda_stmt, select
 from sqlalchemy.orm import Session
 
+from dnd_summary.lookup_cache import CampaignLookupCache
 from dnd_summary.models import Entity, Participant, ParticipantCharacter
 
+_CHARACTER_MAP_CACHE: CampaignLookupCache[dict[str, str]] = CampaignLookupCache()
+
 
 def load_character_map(session: Session, campaign_id: str) -> dict[str, str]:
-    stmt = (
-        select(Participant.display_name, Entity.canonical_name)
+    return _CHARACTER_MAP_CACHE.get_or_load(
+        campaign_id,
+        lambda: _query_character_map(session, campaign_id),
+    )
+
+
+def invalidate_character_map(campaign_id: str | None = None) -> None:
+    _CHARACTER_MAP_CACHE.invalidate(campaign_id)
+
+
+def invalidate_character_map_after_commit(session: Session, campaign_id: str) -> None:
+    _CHARACTER_MAP_CACHE.invalidate_after_commit(session, campaign_id)
+
+
+def _query_character_map(session: Session, campaign_id: str) -> dict[str, str]:
+    # lambda_stmt caches the built statement and its cache key by code location, so
+    # repeat lookups only bind campaign_id instead of rebuilding the three-way join.
+    stmt = lambda_stmt(
+        lambda: select(Participant.display_name, Entity.canonical_name)
         .select_from(ParticipantCharacter)
         .join(Participant, ParticipantCharacter.participant_id == Participant.id)
         .join(Entity, ParticipantCharacter.entity_id == Entity.id)
-        .where(Participant.campaign_id == campaign_id)
     )
-    rows = session.execute(stmt).all()
-    return {row[0]: row[1] for row in rows}
+    stmt += lambda s: s.where(Participant.campaign_id == campaign_id)
+    return dict(session.execute(stmt).all())
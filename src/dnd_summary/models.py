@@ -15,6 +15,7 @@ from sqlalchemy import (
     Text,
     UniqueConstraint,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 from dnd_summary.embeddings import EmbeddingVector
@@ -223,7 +224,11 @@ class SessionExtraction(Base):
     model: Mapped[str] = mapped_column(String, nullable=False)
     prompt_id: Mapped[str] = mapped_column(String, nullable=False)
     prompt_version: Mapped[str] = mapped_column(String, nullable=False)
-    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    # JSONB on Postgres: cache lookups and usage reports filter and aggregate payload keys
+    # in SQL, which JSONB reads without reparsing the document.
+    payload: Mapped[dict] = mapped_column(
+        JSON().with_variant(JSONB(), "postgresql"), nullable=False
+    )
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
 
@@ -338,6 +343,12 @@ class Thread(Base):
     confidence: Mapped[float | None] = mapped_column(Float, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
+    updates = relationship(
+        "ThreadUpdate",
+        order_by="(ThreadUpdate.created_at.asc(), ThreadUpdate.id.asc())",
+        viewonly=True,
+    )
+
 
 class CampaignThread(Base):
     __tablename__ = "campaign_threads"
@@ -560,3 +571,9 @@ class Embedding(Base):
             name="uq_embedding_target_model_version",
         ),
     )
+
+
+# Resolve string ForeignKey/relationship targets once at import, so the first query in a
+# short-lived worker or CLI run doesn't pay for mapper configuration and config errors
+# surface immediately.
+Base.registry.configure()
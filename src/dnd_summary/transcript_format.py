@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from collections import Counter, defaultdict
-from typing import Iterable
+from typing import Iterable, Iterator, Sequence
 
 from dnd_summary.schemas import EvidenceSpan, EventExtraction, QuoteExtraction, SessionFacts
 
@@ -14,32 +14,52 @@ def _timecode(ms: int) -> str:
     return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
 
 
-def format_transcript(
-    utterances: Iterable,
+def _iter_transcript_lines(
+    utterances: Sequence,
     character_map: dict[str, str],
-) -> tuple[str, dict[str, str]]:
-    counts = Counter()
-    for utt in utterances:
-        counts[_timecode(utt.start_ms)] += 1
-
+) -> Iterator[tuple[str, str, str]]:
+    timecodes = [_timecode(utt.start_ms) for utt in utterances]
+    counts = Counter(timecodes)
     indices: dict[str, int] = defaultdict(int)
-    lines: list[str] = []
-    key_to_id: dict[str, str] = {}
 
-    for utt in utterances:
-        timecode = _timecode(utt.start_ms)
+    for utt, timecode in zip(utterances, timecodes):
         if counts[timecode] > 1:
             indices[timecode] += 1
             key = f"{timecode}#{indices[timecode]}"
         else:
             key = timecode
         speaker = character_map.get(utt.participant.display_name, utt.participant.display_name)
-        lines.append(f"[{key}] {speaker}: {utt.text}")
-        key_to_id[key] = utt.id
+        yield key, utt.id, f"[{key}] {speaker}: {utt.text}"
+
 
+def format_transcript(
+    utterances: Sequence,
+    character_map: dict[str, str],
+) -> tuple[str, dict[str, str]]:
+    lines: list[str] = []
+    key_to_id: dict[str, str] = {}
+    for key, utt_id, line in _iter_transcript_lines(utterances, character_map):
+        lines.append(line)
+        key_to_id[key] = utt_id
     return "\n".join(lines), key_to_id
 
 
+def format_transcript_lines(
+    utterances: Sequence,
+    character_map: dict[str, str],
+) -> tuple[list[str], dict[str, str]]:
+    """Like ``format_transcript`` but returns display lines and utterance id -> timecode key.
+
+    Lines match ``format_transcript(...)[0].splitlines()`` without building the joined text.
+    """
+    lines: list[str] = []
+    utterance_timecodes: dict[str, str] = {}
+    for key, utt_id, line in _iter_transcript_lines(utterances, character_map):
+        lines.extend(line.splitlines())
+        utterance_timecodes[utt_id] = key
+    return lines, utterance_timecodes
+
+
 def _map_utterance_id(value: str, id_map: dict[str, str]) -> str:
     return id_map.get(value, value)
 
@@ -1,16 +1,25 @@
 from __future__ import annotations
 
 import asyncio
+from types import SimpleNamespace
 
 from dnd_summary.activities.resolve import (
     _entity_ids_from_evidence,
     _normalize_entity_tokens,
     resolve_entities_activity,
 )
-from dnd_summary.corrections import normalize_key
+from dnd_summary.corrections import (
+    EntityCorrectionState,
+    ThreadCorrectionState,
+    _resolve_merge_chain,
+    apply_entity_corrections,
+    load_thread_correction_state,
+    normalize_key,
+)
 from dnd_summary.models import Correction, Entity, EntityMention, EventEntity, SceneEntity, ThreadEntity
 from tests.factories import (
     create_campaign,
+    create_campaign_thread,
     create_event,
     create_entity,
     create_entity_alias,
@@ -27,6 +36,111 @@ def test_normalize_key_trims_spaces():
     assert normalize_key("  Goblin King ") == "goblin king"
 
 
+def test_normalize_key_collapses_non_space_whitespace():
+    assert normalize_key("goblin\tking") == "goblin king"
+    assert normalize_key("goblin\u00a0king\n") == "goblin king"
+    assert normalize_key("goblin king") == "goblin king"
+
+
+def test_normalize_key_returns_shared_string_for_equal_keys():
+    assert normalize_key("Goblin  King") is normalize_key("goblin king ")
+
+
+def test_resolve_merge_chain_compresses_paths_and_tolerates_cycles():
+    merge_map = {"a": "b", "b": "c", "c": "d"}
+    assert _resolve_merge_chain(merge_map, "a") == "d"
+    assert merge_map == {"a": "d", "b": "d", "c": "d"}
+
+    cyclic = {"x": "a", "a": "b", "b": "a"}
+    assert _resolve_merge_chain(cyclic, "x") == "a"
+    assert cyclic == {"x": "a", "a": "b", "b": "a"}
+
+
+def test_correction_states_resolve_ids_through_precomputed_closure():
+    thread_state = ThreadCorrectionState(
+        overrides={}, hidden=set(), merge_map={"t1": "t2", "t2": "t3"}
+    )
+    assert thread_state.resolved_map == {"t1": "t3", "t2": "t3"}
+    assert thread_state.resolve_id("t1") == "t3"
+    assert thread_state.resolve_id("t9") == "t9"
+
+    entity_state = EntityCorrectionState(
+        canonical_name_by_id={},
+        alias_to_id={},
+        hidden_ids=set(),
+        merge_map={"e1": "e2", "e2": "e1"},
+        name_to_canonical={},
+        hidden_names=set(),
+    )
+    assert entity_state.resolve_id("e1") == "e1"
+    assert entity_state.resolve_id("e2") == "e2"
+
+
+def test_apply_entity_corrections_renames_and_drops_hidden_names():
+    state = EntityCorrectionState(
+        canonical_name_by_id={},
+        alias_to_id={},
+        hidden_ids=set(),
+        merge_map={},
+        name_to_canonical={"green menace": "Goblin King"},
+        hidden_names={"bob"},
+    )
+    facts = SimpleNamespace(
+        mentions=[SimpleNamespace(text="Green  Menace"), SimpleNamespace(text="Bob")],
+        scenes=[SimpleNamespace(participants=["bob", "Alice", "green menace"])],
+        events=[SimpleNamespace(entities=["BOB"]), SimpleNamespace(entities=[])],
+    )
+
+    apply_entity_corrections(facts, state)
+
+    assert [mention.text for mention in facts.mentions] == ["Goblin King"]
+    assert facts.scenes[0].participants == ["Alice", "Goblin King"]
+    assert [event.entities for event in facts.events] == [[], []]
+
+
+def test_load_thread_correction_state_maps_threads_to_campaign_threads(db_session):
+    campaign = create_campaign(db_session)
+    session_obj = create_session(db_session, campaign=campaign)
+    run = create_run(db_session, campaign=campaign, session_obj=session_obj)
+    source_ct = create_campaign_thread(db_session, campaign=campaign, canonical_title="Old")
+    target_ct = create_campaign_thread(db_session, campaign=campaign, canonical_title="New")
+    source = create_thread(db_session, run=run, session_obj=session_obj, title="Old")
+    target = create_thread(db_session, run=run, session_obj=session_obj, title="New")
+    source.campaign_thread_id = source_ct.id
+    target.campaign_thread_id = target_ct.id
+    db_session.add_all(
+        [
+            Correction(
+                campaign_id=campaign.id,
+                target_type="thread",
+                target_id=target.id,
+                action="thread_status",
+                payload={"status": "resolved"},
+            ),
+            Correction(
+                campaign_id=campaign.id,
+                target_type="thread",
+                target_id=source.id,
+                action="thread_merge",
+                payload={"into_id": target.id},
+            ),
+            Correction(
+                campaign_id=campaign.id,
+                target_type="thread",
+                target_id="missing",
+                action="thread_hide",
+            ),
+        ]
+    )
+    db_session.flush()
+
+    state = load_thread_correction_state(db_session, campaign.id, None)
+
+    assert state.overrides == {target_ct.id: {"status": "resolved"}}
+    assert state.merge_map == {source_ct.id: target_ct.id}
+    assert state.hidden == set()
+
+
 def test_entity_ids_from_evidence_collects_ids():
     lookup = {"utt-1": {"e1"}, "utt-2": {"e2"}}
     ids = _entity_ids_from_evidence(
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from dnd_summary.activities import summary as summary_module
+from dnd_summary.activities.summary import SUMMARY_VARIANTS, write_summary_activity
+from dnd_summary.llm import LLMResult
+from dnd_summary.llm_cache import CacheRequiredError
+from dnd_summary.models import LLMCall, SessionExtraction
+from tests.factories import (
+    create_campaign,
+    create_run,
+    create_session,
+    create_session_extraction,
+)
+
+
+def _seed_run(db_session):
+    campaign = create_campaign(db_session)
+    session_obj = create_session(db_session, campaign=campaign)
+    run = create_run(db_session, campaign=campaign, session_obj=session_obj)
+    create_session_extraction(
+        db_session, run=run, session_obj=session_obj, kind="session_facts", payload={}
+    )
+    create_session_extraction(
+        db_session, run=run, session_obj=session_obj, kind="summary_plan", payload={"beats": []}
+    )
+    db_session.commit()
+    return run, session_obj
+
+
+def _fake_client(monkeypatch, results_for):
+    batches: list[int] = []
+
+    class FakeClient:
+        async def generate_many(self, prompts, *, cached_content=None):
+            batches.append(len(prompts))
+            return [results_for(len(batches), index) for index in range(len(prompts))]
+
+    monkeypatch.setattr(summary_module, "LLMClient", FakeClient)
+    return batches
+
+
+def test_write_summary_records_every_call_before_raising(
+    db_session, monkeypatch, settings_overrides
+):
+    settings_overrides(enable_explicit_cache=False, require_transcript_cache=False)
+    run, session_obj = _seed_run(db_session)
+
+    def results_for(batch, index):
+        if index == 1:
+            return LLMResult(error=RuntimeError("boom"))
+        return LLMResult(text="A quiet session.", usage={"total_token_count": 10})
+
+    _fake_client(monkeypatch, results_for)
+
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(write_summary_activity({"run_id": run.id, "session_id": session_obj.id}))
+
+    db_session.expire_all()
+    calls = db_session.query(LLMCall).filter_by(run_id=run.id).all()
+    statuses = {call.kind: call.status for call in calls}
+    assert len(calls) == len(SUMMARY_VARIANTS)
+    assert statuses[SUMMARY_VARIANTS[1]["kind"]] == "error"
+    assert list(statuses.values()).count("success") == len(SUMMARY_VARIANTS) - 1
+    usage_rows = db_session.query(SessionExtraction).filter_by(kind="llm_usage").count()
+    assert usage_rows == len(SUMMARY_VARIANTS) - 1
+
+
+def test_write_summary_probes_required_cache_with_one_variant(
+    db_session, monkeypatch, settings_overrides
+):
+    settings_overrides(require_transcript_cache=True)
+    run, session_obj = _seed_run(db_session)
+    monkeypatch.setattr(
+        summary_module,
+        "ensure_transcript_cache",
+        lambda session, run, text: ("cachedContents/abc", ""),
+    )
+    batches = _fake_client(
+        monkeypatch, lambda batch, index: LLMResult(text="Uncached.", usage={})
+    )
+
+    with pytest.raises(CacheRequiredError):
+        asyncio.run(write_summary_activity({"run_id": run.id, "session_id": session_obj.id}))
+
+    assert batches == [1]
+    db_session.expire_all()
+    call = db_session.query(LLMCall).filter_by(run_id=run.id).one()
+    assert call.status == "error"
+    assert call.kind == SUMMARY_VARIANTS[0]["kind"]
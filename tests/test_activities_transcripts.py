@@ -3,13 +3,16 @@ from __future__ import annotations
 import asyncio
 import json
 from pathlib import Path
+from types import SimpleNamespace
 
 from dnd_summary.activities.transcripts import (
+    _roll_aligner,
     _ensure_participants,
     _find_transcript_source,
     ingest_transcript_activity,
 )
 from dnd_summary.campaign_config import CampaignConfig, CharacterConfig, ParticipantConfig
+from dnd_summary.external_sources import parse_rolls_jsonl
 from dnd_summary.models import (
     Campaign,
     CharacterSheetSnapshot,
@@ -34,17 +37,74 @@ def test_find_transcript_source_prefers_canonical(tmp_path: Path):
     assert src.path.endswith("transcript.jsonl")
 
 
+def test_parse_rolls_jsonl_streams_lines_and_reports_errors(tmp_path: Path):
+    rolls_path = tmp_path / "rolls.jsonl"
+    rolls_path.write_bytes(
+        b'{"t_ms": 1000, "kind": "attack", "total": 19, "character": "H\xc3\xa9ro"}\n'
+        b"\n"
+        b"{not json}\n"
+        b'{"kind": "save"}\n'
+        b'{"t_ms": 2500.7, "kind": "bogus", "total": "x"}\n'
+        b'{"t_ms": 3000.9, "kind": "bogus"}'
+    )
+
+    rolls, errors = parse_rolls_jsonl(rolls_path)
+
+    assert [(roll.line_number, roll.t_ms, roll.kind) for roll in rolls] == [
+        (1, 1000, "attack"),
+        (6, 3000, "other"),
+    ]
+    assert rolls[0].character == "H\u00e9ro"
+    assert [error.split(":")[0] for error in errors] == ["line 3", "line 4", "line 5"]
+
+
+def test_parse_rolls_jsonl_shares_repeated_strings(tmp_path: Path):
+    rolls_path = tmp_path / "rolls.jsonl"
+    rolls_path.write_text(
+        "\n".join(
+            json.dumps({"t_ms": t_ms, "character": "Hero", "kind": "attack", "expression": "1d20"})
+            for t_ms in (100, 200)
+        ),
+        encoding="utf-8",
+    )
+
+    (first, second), errors = parse_rolls_jsonl(rolls_path)
+
+    assert errors == []
+    assert first.character is second.character
+    assert first.expression is second.expression
+    assert first.kind == "attack"
+    assert first.kind is second.kind
+
+
+def test_roll_aligner_prefers_spanning_then_nearest_utterance():
+    utterances = [
+        SimpleNamespace(id="a", start_ms=0, end_ms=1000),
+        SimpleNamespace(id="b", start_ms=500, end_ms=2000),
+        SimpleNamespace(id="c", start_ms=3000, end_ms=4000),
+        SimpleNamespace(id="d", start_ms=5000, end_ms=6000),
+    ]
+    align = _roll_aligner(utterances)
+
+    assert align(700) == "a"
+    assert align(1500) == "b"
+    assert align(2400) == "b"
+    assert align(4500) == "c"
+    assert align(9000) == "d"
+    assert _roll_aligner([])(100) is None
+
+
 def test_ensure_participants_creates_entities(db_session):
     campaign = create_campaign(db_session)
     config = CampaignConfig(
-        participants=[
+        participants=(
             ParticipantConfig(
                 display_name="Lia",
                 role="player",
-                speaker_aliases=["lia"],
-                character=CharacterConfig(name="Lia Sun", kind="pc", aliases=["Sun"]),
-            )
-        ]
+                speaker_aliases=("lia",),
+                character=CharacterConfig(name="Lia Sun", kind="pc", aliases=("Sun",)),
+            ),
+        )
     )
 
     participants = _ensure_participants(db_session, campaign, config)
@@ -306,6 +306,7 @@ def test_set_current_run(api_client, db_session, settings_overrides):
     runs = response.json()
     assert runs[0]["id"] == run.id
     assert runs[0]["is_current"] is True
+    assert runs[0]["created_at"] == run.created_at.isoformat()
 
 
 def test_export_and_delete_session(api_client, db_session, settings_overrides, tmp_path):
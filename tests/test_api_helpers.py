@@ -1,11 +1,33 @@
 from __future__ import annotations
 
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from dnd_summary import api as api_module
 from dnd_summary.api import (
+    _batch_dense_scores,
     _entity_alias_changes,
     _entity_correction_maps,
+    _iter_json_object,
+    _query_spoiler_map,
+    _quote_utterance_lookup,
+    _run_readonly_queries,
     _thread_correction_maps,
+    _thread_event_utterance_ids,
+)
+from dnd_summary.models import Campaign, Correction, SpoilerTag
+from tests.factories import (
+    create_campaign,
+    create_event,
+    create_participant,
+    create_quote,
+    create_run,
+    create_session,
+    create_thread,
+    create_utterance,
 )
-from dnd_summary.models import Correction
 
 
 def test_entity_correction_maps_collects_changes():
@@ -98,3 +120,155 @@ def test_thread_correction_maps_handles_rename_and_status():
     assert title_map == {"t4": "New Title"}
     assert status_map == {"t5": "completed"}
     assert summary_map == {"t6": "Done"}
+
+
+def test_run_readonly_queries_returns_results_by_name(db_session):
+    campaign = create_campaign(db_session, slug="alpha")
+    db_session.commit()
+
+    loaded = _run_readonly_queries(
+        {
+            "campaign": lambda db: db.query(Campaign).filter_by(id=campaign.id).first(),
+            "count": lambda db: db.query(Campaign).count(),
+        }
+    )
+
+    assert loaded["campaign"].slug == "alpha"
+    assert loaded["count"] == 1
+
+
+def test_run_readonly_queries_propagates_errors(db_engine):
+    def _fail(db):
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        _run_readonly_queries({"ok": lambda db: 1, "fail": _fail})
+
+
+def test_bundle_executor_is_shared_and_bounded_by_pool_size(settings_overrides):
+    settings_overrides(db_pool_size=3)
+
+    executor = api_module._bundle_executor()
+
+    assert api_module._bundle_executor() is executor
+    assert executor._max_workers == 2
+
+
+def test_iter_json_object_chunks_lists(monkeypatch):
+    monkeypatch.setattr(api_module, "BUNDLE_STREAM_CHUNK_SIZE", 2)
+    payload = {"id": "s1", "lines": ["a", "b", "c", "d", "e"], "empty": [], "meta": {"k": 1}}
+
+    chunks = list(_iter_json_object(payload))
+
+    assert json.loads(b"".join(chunks)) == payload
+    assert b'"c","d"' in chunks
+
+
+def test_thread_event_utterance_ids_matches_title_tokens_in_sql(db_session):
+    campaign = create_campaign(db_session)
+    session_obj = create_session(db_session, campaign=campaign)
+    run = create_run(db_session, campaign=campaign, session_obj=session_obj)
+    thread = create_thread(db_session, run=run, session_obj=session_obj, title="Relic_Hunt")
+    create_event(
+        db_session,
+        run=run,
+        session_obj=session_obj,
+        summary="The RELIC_HUNT reaches the crypt",
+        evidence=[{"utterance_id": "u1"}],
+    )
+    create_event(
+        db_session,
+        run=run,
+        session_obj=session_obj,
+        event_type="thread_update",
+        summary="Progress",
+        evidence=[{"utterance_id": "u2"}],
+    )
+    create_event(
+        db_session,
+        run=run,
+        session_obj=session_obj,
+        summary="A relicXhunt is not a match",
+        evidence=[{"utterance_id": "u3"}],
+    )
+    create_event(
+        db_session,
+        run=run,
+        session_obj=session_obj,
+        summary="Unrelated brawl",
+        evidence=[{"utterance_id": "u4"}],
+    )
+    db_session.commit()
+
+    ids = _thread_event_utterance_ids(db_session, thread)
+
+    assert ids == {"u1", "u2"}
+
+
+def test_query_spoiler_map_groups_by_target_type(db_session):
+    campaign = create_campaign(db_session)
+    db_session.add_all(
+        [
+            SpoilerTag(
+                campaign_id=campaign.id,
+                target_type="event",
+                target_id="e1",
+                reveal_session_number=2,
+            ),
+            SpoilerTag(
+                campaign_id=campaign.id,
+                target_type="thread",
+                target_id="t1",
+                reveal_session_number=3,
+            ),
+        ]
+    )
+    db_session.commit()
+
+    spoilers = _query_spoiler_map(db_session, campaign.id)
+
+    assert spoilers == {"event": {"e1": 2}, "thread": {"t1": 3}}
+
+
+def test_quote_utterance_lookup_fetches_only_unsliced_quote_utterances(db_session):
+    campaign = create_campaign(db_session)
+    session_obj = create_session(db_session, campaign=campaign)
+    run = create_run(db_session, campaign=campaign, session_obj=session_obj)
+    participant = create_participant(db_session, campaign=campaign)
+    for utterance_id in ("u1", "u2", "u3"):
+        create_utterance(
+            db_session,
+            session_obj=session_obj,
+            participant=participant,
+            text=f"text {utterance_id}",
+            utterance_id=utterance_id,
+        )
+    quotes = [
+        create_quote(db_session, run=run, session_obj=session_obj, utterance_id="u1"),
+        create_quote(
+            db_session, run=run, session_obj=session_obj, utterance_id="u2", clean_text="Cleaned"
+        ),
+    ]
+    db_session.commit()
+
+    assert _quote_utterance_lookup(db_session, quotes) == {"u1": "text u1"}
+    assert _quote_utterance_lookup(db_session, []) == {}
+
+
+def test_batch_dense_scores_matches_pairwise_cosine():
+    query = [1.0, 0.0, 1.0]
+    entries = [
+        SimpleNamespace(id="same", embedding=[2.0, 0.0, 2.0]),
+        SimpleNamespace(id="orthogonal", embedding=[0.0, 3.0, 0.0]),
+        SimpleNamespace(id="zero", embedding=[0.0, 0.0, 0.0]),
+        SimpleNamespace(id="short", embedding=[1.0, 0.0]),
+        SimpleNamespace(id="missing", embedding=None),
+    ]
+
+    scores = _batch_dense_scores(entries, query)
+
+    assert scores["same"] == pytest.approx(1.0)
+    assert scores["orthogonal"] == pytest.approx(0.0)
+    assert scores["zero"] == 0.0
+    assert scores["short"] == 0.0
+    assert scores["missing"] == 0.0
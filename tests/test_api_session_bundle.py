@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+from fastapi import status
+
+from dnd_summary import api as api_module
+from dnd_summary.models import Correction, DiceRoll, EntityMention, SpoilerTag
+from tests.factories import (
+    create_artifact,
+    create_campaign,
+    create_entity,
+    create_event,
+    create_membership,
+    create_mention,
+    create_participant,
+    create_quote,
+    create_run,
+    create_run_step,
+    create_scene,
+    create_session,
+    create_thread,
+    create_thread_update,
+    create_user,
+    create_utterance,
+)
+
+
+def test_session_bundle_groups_thread_updates(api_client, db_session):
+    campaign = create_campaign(db_session, slug="alpha")
+    session_obj = create_session(db_session, campaign=campaign)
+    run = create_run(db_session, campaign=campaign, session_obj=session_obj)
+    relic = create_thread(db_session, run=run, session_obj=session_obj, title="Find the relic")
+    bandits = create_thread(db_session, run=run, session_obj=session_obj, title="Bandit camp")
+    create_thread_update(
+        db_session, run=run, session_obj=session_obj, thread=relic, note="Found a map"
+    )
+    create_thread_update(
+        db_session, run=run, session_obj=session_obj, thread=relic, note="Reached the crypt"
+    )
+    db_session.commit()
+
+    response = api_client.get(f"/sessions/{session_obj.id}/bundle")
+
+    assert response.status_code == status.HTTP_200_OK
+    threads = {thread["id"]: thread for thread in response.json()["threads"]}
+    assert threads[relic.id]["created_at"] == relic.created_at.isoformat()
+    assert [update["note"] for update in threads[relic.id]["updates"]] == [
+        "Found a map",
+        "Reached the crypt",
+    ]
+    assert threads[bandits.id]["updates"] == []
+
+
+def test_session_bundle_filters_hidden_and_spoiler_rows(
+    api_client, db_session, settings_overrides
+):
+    settings_overrides(auth_enabled=True)
+    campaign = create_campaign(db_session, slug="alpha")
+    player = create_user(db_session, display_name="Player")
+    create_membership(db_session, campaign=campaign, user=player, role="player")
+    session_obj = create_session(db_session, campaign=campaign, session_number=1)
+    run = create_run(db_session, campaign=campaign, session_obj=session_obj)
+    visible_event = create_event(db_session, run=run, session_obj=session_obj, summary="Ambush")
+    spoiler_event = create_event(db_session, run=run, session_obj=session_obj, summary="Betrayal")
+    visible_thread = create_thread(db_session, run=run, session_obj=session_obj, title="Relic")
+    hidden_thread = create_thread(db_session, run=run, session_obj=session_obj, title="Noise")
+    db_session.add_all(
+        [
+            SpoilerTag(
+                campaign_id=campaign.id,
+                target_type="event",
+                target_id=spoiler_event.id,
+                reveal_session_number=2,
+            ),
+            Correction(
+                campaign_id=campaign.id,
+                session_id=session_obj.id,
+                target_type="thread",
+                target_id=hidden_thread.id,
+                action="thread_hide",
+            ),
+        ]
+    )
+    db_session.commit()
+
+    response = api_client.get(
+        f"/sessions/{session_obj.id}/bundle",
+        headers={"X-User-Id": player.id},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    payload = response.json()
+    assert [event["id"] for event in payload["events"]] == [visible_event.id]
+    assert [thread["id"] for thread in payload["threads"]] == [visible_thread.id]
+
+
+def test_session_bundle_drops_redacted_utterances(api_client, db_session):
+    campaign = create_campaign(db_session, slug="alpha")
+    session_obj = create_session(db_session, campaign=campaign)
+    create_run(db_session, campaign=campaign, session_obj=session_obj)
+    participant = create_participant(db_session, campaign=campaign, display_name="DM")
+    kept = create_utterance(
+        db_session, session_obj=session_obj, participant=participant, start_ms=0, text="Roll."
+    )
+    redacted = create_utterance(
+        db_session, session_obj=session_obj, participant=participant, start_ms=5000, text="Secret"
+    )
+    db_session.add_all(
+        [
+            DiceRoll(
+                campaign_id=campaign.id,
+                session_id=session_obj.id,
+                utterance_id=redacted.id,
+                source_path="rolls.jsonl",
+                source_hash="abc",
+                roll_index=1,
+                t_ms=5000,
+                kind="attack",
+            ),
+            Correction(
+                campaign_id=campaign.id,
+                session_id=session_obj.id,
+                target_type="utterance",
+                target_id=redacted.id,
+                action="redact",
+            ),
+        ]
+    )
+    db_session.commit()
+
+    response = api_client.get(f"/sessions/{session_obj.id}/bundle")
+
+    assert response.status_code == status.HTTP_200_OK
+    payload = response.json()
+    assert payload["transcript"]["lines"] == ["[00:00:00] DM: Roll."]
+    assert payload["transcript"]["utterance_timecodes"] == {kept.id: "00:00:00"}
+    roll = payload["dice_rolls"][0]
+    assert roll["utterance_id"] is None
+    assert roll["utterance_timecode"] is None
+    assert roll["evidence"] == []
+
+
+def test_session_bundle_lists_each_mentioned_entity_once(api_client, db_session):
+    campaign = create_campaign(db_session, slug="alpha")
+    session_obj = create_session(db_session, campaign=campaign)
+    run = create_run(db_session, campaign=campaign, session_obj=session_obj)
+    goblin = create_entity(db_session, campaign=campaign, name="Goblin")
+    create_entity(db_session, campaign=campaign, name="Unmentioned")
+    for _ in range(2):
+        mention = create_mention(db_session, run=run, session_obj=session_obj)
+        db_session.add(
+            EntityMention(
+                run_id=run.id,
+                session_id=session_obj.id,
+                mention_id=mention.id,
+                entity_id=goblin.id,
+            )
+        )
+    db_session.commit()
+
+    response = api_client.get(f"/sessions/{session_obj.id}/bundle")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [entity["id"] for entity in response.json()["entities"]] == [goblin.id]
+
+
+def test_session_bundle_honours_if_none_match(api_client, db_session):
+    campaign = create_campaign(db_session, slug="alpha")
+    session_obj = create_session(db_session, campaign=campaign)
+    run = create_run(db_session, campaign=campaign, session_obj=session_obj)
+    thread = create_thread(db_session, run=run, session_obj=session_obj, title="Relic")
+    db_session.commit()
+
+    first = api_client.get(f"/sessions/{session_obj.id}/bundle")
+    etag = first.headers["etag"]
+
+    cached = api_client.get(
+        f"/sessions/{session_obj.id}/bundle", headers={"If-None-Match": etag}
+    )
+    assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+    assert cached.headers["etag"] == etag
+
+    db_session.add(
+        Correction(
+            campaign_id=campaign.id,
+            session_id=session_obj.id,
+            target_type="thread",
+            target_id=thread.id,
+            action="thread_hide",
+        )
+    )
+    db_session.commit()
+
+    refreshed = api_client.get(
+        f"/sessions/{session_obj.id}/bundle", headers={"If-None-Match": etag}
+    )
+    assert refreshed.status_code == status.HTTP_200_OK
+    assert refreshed.headers["etag"] != etag
+    assert refreshed.json()["threads"] == []
+
+
+def test_session_bundle_etag_changes_when_run_step_finishes(api_client, db_session):
+    campaign = create_campaign(db_session, slug="alpha")
+    session_obj = create_session(db_session, campaign=campaign)
+    run = create_run(db_session, campaign=campaign, session_obj=session_obj)
+    step = create_run_step(db_session, run=run, session_obj=session_obj, name="extract")
+    db_session.commit()
+
+    etag = api_client.get(f"/sessions/{session_obj.id}/bundle").headers["etag"]
+
+    step.status = "completed"
+    db_session.commit()
+
+    refreshed = api_client.get(
+        f"/sessions/{session_obj.id}/bundle", headers={"If-None-Match": etag}
+    )
+    assert refreshed.status_code == status.HTTP_200_OK
+    assert refreshed.json()["run_steps"][0]["status"] == "completed"
+
+
+def test_session_bundle_etag_changes_when_rolls_are_imported(api_client, db_session):
+    campaign = create_campaign(db_session, slug="alpha")
+    session_obj = create_session(db_session, campaign=campaign)
+    create_run(db_session, campaign=campaign, session_obj=session_obj)
+    db_session.commit()
+
+    etag = api_client.get(f"/sessions/{session_obj.id}/bundle").headers["etag"]
+
+    db_session.add(
+        DiceRoll(
+            campaign_id=campaign.id,
+            session_id=session_obj.id,
+            source_path="rolls.jsonl",
+            source_hash="abc",
+            roll_index=0,
+            t_ms=1000,
+            kind="attack",
+        )
+    )
+    db_session.commit()
+
+    refreshed = api_client.get(
+        f"/sessions/{session_obj.id}/bundle", headers={"If-None-Match": etag}
+    )
+    assert refreshed.status_code == status.HTTP_200_OK
+    assert len(refreshed.json()["dice_rolls"]) == 1
+
+
+def test_session_bundle_etag_ignores_cached_spoiler_map(api_client, db_session):
+    campaign = create_campaign(db_session, slug="alpha")
+    session_obj = create_session(db_session, campaign=campaign)
+    run = create_run(db_session, campaign=campaign, session_obj=session_obj)
+    thread = create_thread(db_session, run=run, session_obj=session_obj, title="Relic")
+    db_session.commit()
+
+    etag = api_client.get(f"/sessions/{session_obj.id}/bundle").headers["etag"]
+    api_module._spoiler_map(db_session, campaign.id)
+    db_session.add(
+        SpoilerTag(
+            campaign_id=campaign.id,
+            target_type="thread",
+            target_id=thread.id,
+            reveal_session_number=99,
+        )
+    )
+    db_session.commit()
+
+    refreshed = api_client.get(
+        f"/sessions/{session_obj.id}/bundle", headers={"If-None-Match": etag}
+    )
+    assert refreshed.status_code == status.HTTP_200_OK
+
+
+def test_session_bundle_projects_artifacts_and_scenes(api_client, db_session):
+    campaign = create_campaign(db_session, slug="alpha")
+    session_obj = create_session(db_session, campaign=campaign)
+    run = create_run(db_session, campaign=campaign, session_obj=session_obj)
+    artifact = create_artifact(db_session, run=run, session_obj=session_obj)
+    scene = create_scene(
+        db_session,
+        run=run,
+        session_obj=session_obj,
+        summary="Crypt",
+        participants=["Lia"],
+    )
+    db_session.commit()
+
+    payload = api_client.get(f"/sessions/{session_obj.id}/bundle").json()
+
+    assert payload["artifacts"] == [
+        {"id": artifact.id, "kind": "summary_text", "path": "/tmp/summary.txt", "meta": None}
+    ]
+    assert payload["scenes"] == [
+        {
+            "id": scene.id,
+            "title": None,
+            "summary": "Crypt",
+            "location": None,
+            "start_ms": 0,
+            "end_ms": 1000,
+            "participants": ["Lia"],
+            "evidence": [],
+        }
+    ]
+
+
+def test_session_bundle_quotes_use_utterance_text(api_client, db_session):
+    campaign = create_campaign(db_session, slug="alpha")
+    session_obj = create_session(db_session, campaign=campaign)
+    run = create_run(db_session, campaign=campaign, session_obj=session_obj)
+    participant = create_participant(db_session, campaign=campaign)
+    kept = create_utterance(
+        db_session,
+        session_obj=session_obj,
+        participant=participant,
+        text="  We ride at dawn, friends  ",
+        utterance_id="u1",
+    )
+    redacted = create_utterance(
+        db_session,
+        session_obj=session_obj,
+        participant=participant,
+        text="Secret plans",
+        utterance_id="u2",
+    )
+    quote = create_quote(
+        db_session,
+        run=run,
+        session_obj=session_obj,
+        utterance_id=kept.id,
+        char_start=2,
+        char_end=17,
+    )
+    create_quote(db_session, run=run, session_obj=session_obj, utterance_id=redacted.id)
+    db_session.add(
+        Correction(
+            campaign_id=campaign.id,
+            session_id=session_obj.id,
+            target_type="utterance",
+            target_id=redacted.id,
+            action="redact",
+        )
+    )
+    db_session.commit()
+
+    payload = api_client.get(f"/sessions/{session_obj.id}/bundle").json()
+
+    assert [(q["id"], q["display_text"]) for q in payload["quotes"]] == [
+        (quote.id, "We ride at dawn")
+    ]
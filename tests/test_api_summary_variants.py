@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from datetime import datetime
+
 from fastapi import status
 
 from tests.factories import create_campaign, create_run, create_session, create_session_extraction
@@ -59,3 +61,31 @@ def test_session_bundle_includes_summary_variants(api_client, db_session):
     payload = response.json()
     assert payload["summary"] == "Main summary"
     assert payload["summary_variants"]["summary_player"] == "Player recap"
+
+
+def test_summary_endpoint_skips_empty_latest_variant(api_client, db_session):
+    campaign = create_campaign(db_session, slug="gamma")
+    session_obj = create_session(db_session, campaign=campaign)
+    run = create_run(db_session, campaign=campaign, session_obj=session_obj)
+    older = create_session_extraction(
+        db_session,
+        run=run,
+        session_obj=session_obj,
+        kind="summary_player",
+        payload={"text": "Player recap"},
+    )
+    newer = create_session_extraction(
+        db_session,
+        run=run,
+        session_obj=session_obj,
+        kind="summary_player",
+        payload={"text": ""},
+    )
+    older.created_at = datetime(2024, 1, 1)
+    newer.created_at = datetime(2024, 1, 2)
+    db_session.commit()
+
+    response = api_client.get(f"/sessions/{session_obj.id}/summary")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["variants"] == {"summary_player": "Player recap"}
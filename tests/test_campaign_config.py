@@ -38,6 +38,7 @@ def test_load_campaign_config_parses_participants(tmp_path, settings_overrides):
     assert config.system == "5e"
     assert config.participants
     assert config.participants[0].display_name == "Lia"
+    assert config.participants[0].speaker_aliases == ("liah",)
     assert config.participants[0].character is not None
     assert config.participants[0].character.name == "Lia Sun"
 
@@ -48,3 +49,22 @@ def test_load_campaign_config_parses_participants(tmp_path, settings_overrides):
     character_map = character_map_from_config(config)
     assert character_map["Lia"] == "Lia Sun"
     assert "DM" not in character_map
+
+
+def test_load_campaign_config_reuses_parse_until_file_changes(tmp_path, settings_overrides):
+    settings_overrides(transcripts_root=str(tmp_path))
+    campaign_dir = tmp_path / "campaigns" / "beta"
+    campaign_dir.mkdir(parents=True)
+    config_path = campaign_dir / "campaign.json"
+    config_path.write_text(json.dumps({"name": "Beta"}), encoding="utf-8")
+
+    first = load_campaign_config("beta")
+    assert load_campaign_config("beta") is first
+
+    config_path.write_text(json.dumps({"name": "Beta Reloaded"}), encoding="utf-8")
+    reloaded = load_campaign_config("beta")
+    assert reloaded is not None
+    assert reloaded.name == "Beta Reloaded"
+
+    config_path.unlink()
+    assert load_campaign_config("beta") is None
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import subprocess
+import sys
+
+from google import genai
+from google.genai import errors
 from typer.testing import CliRunner
 
-from dnd_summary.cli import app
+from dnd_summary.cli import _parse_datetime, app
 from dnd_summary.models import Embedding, SessionExtraction
 from tests.factories import (
     create_campaign,
+    create_entity,
     create_event,
     create_participant,
     create_run,
@@ -18,12 +24,81 @@ from tests.factories import (
 runner = CliRunner()
 
 
+def test_cli_import_defers_config_and_sqlalchemy():
+    code = (
+        "import sys, dnd_summary.cli; "
+        "print('dnd_summary.config' in sys.modules, 'sqlalchemy' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.split() == ["False", "False"]
+
+
+def test_help_lists_commands():
+    result = runner.invoke(app, ["--help"])
+
+    assert result.exit_code == 0
+    assert "inspect-usage" in result.output
+    assert "list-caches" in result.output
+
+
+def test_run_session_uses_temporal_settings(monkeypatch, settings_overrides):
+    from temporalio.client import Client
+
+    settings_overrides(
+        temporal_address="temporal:7233",
+        temporal_namespace="dnd",
+        temporal_task_queue="summaries",
+    )
+    seen = {}
+
+    class FakeHandle:
+        id = "wf-1"
+        run_id = "run-1"
+
+    class FakeClient:
+        async def start_workflow(self, *args, **kwargs):
+            seen["task_queue"] = kwargs["task_queue"]
+            return FakeHandle()
+
+    async def fake_connect(address, namespace):
+        seen["address"] = address
+        seen["namespace"] = namespace
+        return FakeClient()
+
+    monkeypatch.setattr(Client, "connect", fake_connect)
+
+    result = runner.invoke(app, ["run-session", "alpha", "s1"])
+
+    assert result.exit_code == 0
+    assert seen == {"address": "temporal:7233", "namespace": "dnd", "task_queue": "summaries"}
+
+
 def test_show_config_outputs_defaults():
     result = runner.invoke(app, ["show-config"])
     assert result.exit_code == 0
     assert "database_url=" in result.output
 
 
+def test_show_config_lists_fields_in_order(settings_overrides):
+    settings_overrides(temporal_address="temporal:7233", transcripts_root="/data/transcripts")
+
+    result = runner.invoke(app, ["show-config"])
+
+    lines = result.output.splitlines()
+    assert [line.split("=", 1)[0] for line in lines] == [
+        "database_url",
+        "temporal_address",
+        "temporal_namespace",
+        "temporal_task_queue",
+        "transcripts_root",
+    ]
+    assert "temporal_address=temporal:7233" in lines
+    assert "transcripts_root=/data/transcripts" in lines
+
+
 def test_inspect_usage_summarizes_tokens(db_session):
     campaign = create_campaign(db_session, slug="alpha")
     session_obj = create_session(db_session, campaign=campaign, slug="session_1")
@@ -46,13 +121,29 @@ def test_inspect_usage_summarizes_tokens(db_session):
             "total_cost_usd": 0.03,
         },
     )
+    create_session_extraction(
+        db_session,
+        run=run,
+        session_obj=session_obj,
+        kind="llm_usage",
+        payload={"call_kind": "extract", "prompt_token_count": 40, "total_token_count": 60},
+    )
+    create_session_extraction(
+        db_session,
+        run=run,
+        session_obj=session_obj,
+        kind="llm_usage",
+        payload={"prompt_token_count": 10, "total_token_count": 10},
+    )
     db_session.commit()
 
     result = runner.invoke(app, ["inspect-usage", "alpha", "session_1"])
 
     assert result.exit_code == 0
+    assert "totals prompt=150 cached=20 non_cached=80 output=50 total=220" in result.output
     assert "by_call_kind:" in result.output
-    assert "extract" in result.output
+    assert "- extract: prompt=140 cached=20 non_cached=80 output=50 total=210" in result.output
+    assert "- unknown: prompt=10 cached=0" in result.output
 
 
 def test_list_caches_lists_records(db_session):
@@ -74,6 +165,76 @@ def test_list_caches_lists_records(db_session):
     assert "alpha/session_1" in result.output
 
 
+def test_list_caches_skips_invalidated_and_expired(db_session):
+    campaign = create_campaign(db_session, slug="alpha")
+    for slug, payload in (
+        ("session_1", {"cache_name": "cache-live"}),
+        ("session_2", {"cache_name": "cache-dropped", "invalidated": True}),
+        ("session_3", {"cache_name": "cache-old", "expires_at": "2000-01-01T00:00:00Z"}),
+    ):
+        session_obj = create_session(db_session, campaign=campaign, slug=slug)
+        run = create_run(db_session, campaign=campaign, session_obj=session_obj)
+        create_session_extraction(
+            db_session, run=run, session_obj=session_obj, kind="transcript_cache", payload=payload
+        )
+    db_session.commit()
+
+    result = runner.invoke(app, ["list-caches"])
+
+    assert result.exit_code == 0
+    assert "cache-live" in result.output
+    assert "cache-dropped" not in result.output
+    assert "cache-old" not in result.output
+
+    result = runner.invoke(app, ["list-caches", "--include-expired"])
+
+    assert "cache-dropped" in result.output
+    assert "cache-old" in result.output
+
+
+def test_parse_datetime_normalizes_to_utc():
+    zulu = _parse_datetime("2024-01-01T00:00:00Z")
+    naive = _parse_datetime("2024-01-01T00:00:00")
+
+    assert zulu == naive
+    assert zulu.utcoffset().total_seconds() == 0
+    assert _parse_datetime("2024-01-01T00:00:00Z") is zulu
+    assert _parse_datetime("not a date") is None
+    assert _parse_datetime(None) is None
+
+
+def test_list_caches_verifies_remote_caches(db_session, settings_overrides, monkeypatch):
+    settings_overrides(gemini_api_key="key")
+    campaign = create_campaign(db_session, slug="alpha")
+    for slug, cache_name in (("session_1", "cache-ok"), ("session_2", "cache-gone")):
+        session_obj = create_session(db_session, campaign=campaign, slug=slug)
+        run = create_run(db_session, campaign=campaign, session_obj=session_obj)
+        create_session_extraction(
+            db_session,
+            run=run,
+            session_obj=session_obj,
+            kind="transcript_cache",
+            payload={"cache_name": cache_name},
+        )
+    db_session.commit()
+
+    class Caches:
+        def get(self, name):
+            if name == "cache-gone":
+                raise errors.ClientError(404, {"error": {"message": "not found"}})
+
+    class Client:
+        caches = Caches()
+
+    monkeypatch.setattr(genai, "Client", lambda api_key=None: Client())
+
+    result = runner.invoke(app, ["list-caches", "--verify-remote"])
+
+    assert result.exit_code == 0
+    lines = dict(line.split("\t")[2:] for line in result.output.splitlines())
+    assert lines == {"cache-ok": "remote=ok", "cache-gone": "remote=missing"}
+
+
 def test_clear_caches_marks_invalidated(db_session, settings_overrides):
     settings_overrides(gemini_api_key=None)
     campaign = create_campaign(db_session, slug="alpha")
@@ -156,3 +317,15 @@ def test_resume_partial_dry_run(db_session):
 
     assert result.exit_code == 0
     assert "Resume dry-run" in result.output
+
+
+def test_list_entities_prints_one_line_per_entity(db_session):
+    campaign = create_campaign(db_session, slug="alpha")
+    create_entity(db_session, campaign=campaign, name="Lia", entity_type="character")
+    create_entity(db_session, campaign=campaign, name="Goblin", entity_type="monster")
+    db_session.commit()
+
+    result = runner.invoke(app, ["list-entities", "alpha"])
+
+    assert result.exit_code == 0
+    assert result.output == "character\tLia\nmonster\tGoblin\n"
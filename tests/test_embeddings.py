@@ -1,10 +1,32 @@
 from __future__ import annotations
 
+import hashlib
+from datetime import datetime, timedelta
+
 import numpy as np
 import pytest
 
-from dnd_summary.embedding_index import build_embeddings_for_campaign
-from dnd_summary.embeddings import cosine_similarity, embed_texts
+from dnd_summary import api
+from dnd_summary import embedding_index
+from dnd_summary.embedding_index import (
+    _collect_embedding_inputs,
+    _embed_batch,
+    _latest_run_ids_for_campaign,
+    build_embeddings_for_campaign,
+)
+from dnd_summary.embeddings import (
+    EmbeddingVector,
+    _hash_embeddings,
+    _hash_seed,
+    cosine_similarity,
+    cosine_similarity_batch,
+    cosine_similarity_normalized,
+    embed_query,
+    embed_texts,
+    stored_embedding_version,
+    text_hash,
+    unit_vector,
+)
 from dnd_summary.models import Embedding
 from tests.factories import (
     create_campaign,
@@ -12,6 +34,7 @@ from tests.factories import (
     create_entity,
     create_event,
     create_participant,
+    create_quote,
     create_run,
     create_session,
     create_utterance,
@@ -27,6 +50,74 @@ def test_embed_texts_hash_is_deterministic(settings_overrides):
     assert cosine_similarity(first, second) == pytest.approx(1.0)
 
 
+@pytest.mark.parametrize(
+    "latest_run_ids", [_latest_run_ids_for_campaign, api._latest_run_ids_for_campaign]
+)
+def test_latest_run_ids_prefer_newest_completed_run(db_session, latest_run_ids):
+    campaign = create_campaign(db_session, slug="alpha")
+    first = create_session(db_session, campaign=campaign, slug="session_1")
+    second = create_session(db_session, campaign=campaign, slug="session_2", session_number=2)
+    base = datetime(2024, 1, 1)
+
+    def run_at(session_obj, minutes, status):
+        run = create_run(db_session, campaign=campaign, session_obj=session_obj, status=status)
+        run.created_at = base + timedelta(minutes=minutes)
+        return run
+
+    run_at(first, 0, "completed")
+    completed = run_at(first, 1, "completed")
+    run_at(first, 2, "failed")
+    run_at(second, 0, "failed")
+    newest_failed = run_at(second, 1, "running")
+    pinned = run_at(second, 2, "completed")
+    db_session.flush()
+    assert latest_run_ids(db_session, campaign.id) == {completed.id, pinned.id}
+
+    pinned.status = "failed"
+    second.current_run_id = pinned.id
+    db_session.flush()
+    assert latest_run_ids(db_session, campaign.id) == {completed.id, pinned.id}
+
+    second.current_run_id = None
+    pinned.created_at = base - timedelta(minutes=1)
+    db_session.flush()
+    assert latest_run_ids(db_session, campaign.id) == {completed.id, newest_failed.id}
+
+
+def test_collect_embedding_inputs_uses_utterance_text_for_quotes(db_session):
+    campaign = create_campaign(db_session, slug="alpha")
+    session_obj = create_session(db_session, campaign=campaign)
+    run = create_run(db_session, campaign=campaign, session_obj=session_obj)
+    participant = create_participant(db_session, campaign=campaign)
+    utterance = create_utterance(
+        db_session, session_obj=session_obj, participant=participant, text=" Roll for it "
+    )
+    quote = create_quote(db_session, run=run, session_obj=session_obj, utterance_id=utterance.id)
+    db_session.flush()
+
+    inputs = {
+        (entry.target_type, entry.target_id): entry
+        for entry in _collect_embedding_inputs(db_session, campaign.id, None, True)
+    }
+
+    assert inputs[("utterance", utterance.id)].content == "Roll for it"
+    assert inputs[("utterance", utterance.id)].session_id == session_obj.id
+    assert inputs[("quote", quote.id)].content == "Roll for it"
+
+
+def test_embed_batch_packs_float32_for_pgvector(settings_overrides, db_engine):
+    settings_overrides(embedding_dimensions=8)
+
+    packed = _embed_batch(["hello", "world"], as_float32=True)
+    plain = _embed_batch(["hello", "world"], as_float32=False)
+
+    assert packed.dtype == np.float32
+    assert packed.shape == (2, 8)
+    assert plain == embed_texts(["hello", "world"])
+    bound = EmbeddingVector().process_bind_param(packed[0], db_engine.dialect)
+    assert bound == pytest.approx(plain[0], abs=1e-6)
+
+
 def test_build_embeddings_for_campaign_creates_rows(db_session, settings_overrides):
     settings_overrides(embedding_dimensions=8)
     campaign = create_campaign(db_session, slug="alpha")
@@ -52,10 +143,129 @@ def test_build_embeddings_for_campaign_creates_rows(db_session, settings_overrid
     assert rows
     assert rows[0].text_hash
     assert rows[0].provider == "hash"
+    assert rows[0].version == "v1+pcg64"
     assert rows[0].dimensions == 8
     assert rows[0].normalized is True
 
 
+def test_build_embeddings_stores_content_hash_and_skips_unchanged(
+    db_session, settings_overrides
+):
+    settings_overrides(embedding_dimensions=8)
+    campaign = create_campaign(db_session, slug="alpha")
+    create_entity(db_session, campaign=campaign, name="Goblin", entity_type="monster")
+    create_entity(db_session, campaign=campaign, name="Dragon", entity_type="monster")
+    db_session.commit()
+
+    first = build_embeddings_for_campaign(db_session, campaign.id, include_all_runs=True)
+    db_session.commit()
+    second = build_embeddings_for_campaign(db_session, campaign.id, include_all_runs=True)
+
+    rows = db_session.query(Embedding).filter_by(campaign_id=campaign.id).all()
+    assert first.created == len(rows) > 0
+    assert all(row.text_hash == text_hash(row.content) for row in rows)
+    assert second.created == 0
+    assert second.skipped == len(rows)
+
+
+def test_build_embeddings_for_one_session_skips_its_existing_rows(
+    db_session, settings_overrides
+):
+    settings_overrides(embedding_dimensions=8)
+    campaign = create_campaign(db_session, slug="alpha")
+    participant = create_participant(db_session, campaign=campaign)
+    create_entity(db_session, campaign=campaign, name="Goblin", entity_type="monster")
+    sessions = []
+    for number in (1, 2):
+        session_obj = create_session(
+            db_session, campaign=campaign, slug=f"session_{number}", session_number=number
+        )
+        create_run(db_session, campaign=campaign, session_obj=session_obj)
+        create_utterance(
+            db_session, session_obj=session_obj, participant=participant, text=f"Line {number}"
+        )
+        sessions.append(session_obj)
+    db_session.commit()
+    build_embeddings_for_campaign(db_session, campaign.id, include_all_runs=True)
+    db_session.commit()
+
+    stats = build_embeddings_for_campaign(
+        db_session, campaign.id, session_id=sessions[0].id, include_all_runs=True
+    )
+
+    assert stats.created == 0
+    assert stats.skipped == 2
+
+
+def test_build_embeddings_with_workers_keeps_vectors_aligned(db_session, settings_overrides):
+    settings_overrides(embedding_dimensions=8, embedding_batch_size=1, embedding_workers=3)
+    campaign = create_campaign(db_session, slug="alpha")
+    for name in ("Goblin", "Dragon", "Lich", "Owlbear"):
+        create_entity(db_session, campaign=campaign, name=name, entity_type="monster")
+    db_session.commit()
+
+    stats = build_embeddings_for_campaign(db_session, campaign.id, include_all_runs=True)
+
+    rows = db_session.query(Embedding).filter_by(campaign_id=campaign.id).all()
+    assert stats.created == len(rows) == 4
+    for row in rows:
+        assert row.embedding == embed_texts([row.content])[0]
+
+
+def test_build_embeddings_embeds_duplicate_content_once(
+    db_session, settings_overrides, monkeypatch
+):
+    settings_overrides(embedding_dimensions=8)
+    campaign = create_campaign(db_session, slug="alpha")
+    session_obj = create_session(db_session, campaign=campaign)
+    run = create_run(db_session, campaign=campaign, session_obj=session_obj)
+    participant = create_participant(db_session, campaign=campaign)
+    utterance = create_utterance(
+        db_session, session_obj=session_obj, participant=participant, text="Roll for it"
+    )
+    create_quote(db_session, run=run, session_obj=session_obj, utterance_id=utterance.id)
+    db_session.commit()
+    embedded: list[str] = []
+
+    def _record(texts):
+        embedded.extend(texts)
+        return embed_texts(texts)
+
+    monkeypatch.setattr(embedding_index, "embed_texts", _record)
+
+    stats = build_embeddings_for_campaign(db_session, campaign.id, include_all_runs=True)
+
+    rows = db_session.query(Embedding).filter_by(campaign_id=campaign.id).all()
+    assert embedded == ["Roll for it"]
+    assert stats.created == 2
+    assert {row.target_type for row in rows} == {"utterance", "quote"}
+    assert rows[0].embedding == rows[1].embedding
+
+
+def test_build_embeddings_replaces_rows_with_changed_content(db_session, settings_overrides):
+    settings_overrides(embedding_dimensions=8)
+    campaign = create_campaign(db_session, slug="alpha")
+    goblin = create_entity(db_session, campaign=campaign, name="Goblin", entity_type="monster")
+    dragon = create_entity(db_session, campaign=campaign, name="Dragon", entity_type="monster")
+    db_session.commit()
+    build_embeddings_for_campaign(db_session, campaign.id, include_all_runs=True)
+    db_session.commit()
+
+    goblin.canonical_name = "Goblin King"
+    db_session.commit()
+    stats = build_embeddings_for_campaign(db_session, campaign.id, include_all_runs=True)
+    db_session.commit()
+
+    rows = {
+        row.target_id: row
+        for row in db_session.query(Embedding).filter_by(campaign_id=campaign.id).all()
+    }
+    assert stats.created == 1
+    assert stats.skipped == 1
+    assert set(rows) == {goblin.id, dragon.id}
+    assert "Goblin King" in rows[goblin.id].content
+
+
 def test_build_embeddings_rejects_mismatch_without_rebuild(db_session, settings_overrides):
     settings_overrides(embedding_dimensions=8, embedding_model="model-a")
     campaign = create_campaign(db_session, slug="alpha")
@@ -77,6 +287,14 @@ def test_build_embeddings_rejects_mismatch_without_rebuild(db_session, settings_
         build_embeddings_for_campaign(db_session, campaign.id)
 
 
+def test_stored_embedding_version_only_tags_changed_providers(settings_overrides):
+    settings_overrides(embedding_provider="hash", embedding_version="v1")
+    assert stored_embedding_version() == "v1+pcg64"
+
+    settings_overrides(embedding_provider="hf")
+    assert stored_embedding_version() == "v1"
+
+
 def test_build_embeddings_rebuild_allows_mismatch(db_session, settings_overrides):
     settings_overrides(embedding_dimensions=8, embedding_model="model-a")
     campaign = create_campaign(db_session, slug="alpha")
@@ -115,3 +333,112 @@ def test_cosine_similarity_handles_numpy():
     vec = np.array([1.0, 0.0, 0.0])
 
     assert cosine_similarity(vec, vec) == pytest.approx(1.0)
+
+
+def test_cosine_similarity_matches_reference_and_handles_zero_vectors():
+    left = [0.2, -0.5, 0.9, 0.1]
+    right = [0.4, 0.3, -0.2, 0.8]
+    dot = sum(a * b for a, b in zip(left, right))
+    expected = dot / (sum(a * a for a in left) ** 0.5 * sum(b * b for b in right) ** 0.5)
+
+    assert cosine_similarity(left, right) == pytest.approx(expected, abs=1e-6)
+    assert cosine_similarity([0.0, 0.0], [1.0, 0.0]) == 0.0
+    assert cosine_similarity([1.0], [1.0, 0.0]) == 0.0
+
+
+def test_cosine_similarity_normalized_matches_cosine_for_unit_vectors():
+    left = [3.0, 4.0, 0.0]
+    right = [1.0, 2.0, 2.0]
+
+    assert np.linalg.norm(unit_vector(left)) == pytest.approx(1.0)
+    assert cosine_similarity_normalized(unit_vector(left), unit_vector(right)) == pytest.approx(
+        cosine_similarity(left, right), abs=1e-6
+    )
+    assert unit_vector([0.0, 0.0]).tolist() == [0.0, 0.0]
+    assert cosine_similarity_normalized([], []) == 0.0
+
+
+def test_cosine_similarity_batch_matches_pairwise():
+    query = [0.3, -0.1, 0.8]
+    corpus = [[0.1, 0.2, 0.3], [-0.5, 0.4, 0.0], [0.0, 0.0, 0.0]]
+
+    scores = cosine_similarity_batch(query, corpus)
+
+    assert scores.tolist() == pytest.approx(
+        [cosine_similarity(row, query) for row in corpus], abs=1e-6
+    )
+    assert cosine_similarity_batch(query, [[1.0, 2.0]]).tolist() == [0.0]
+
+
+def test_hash_digests_stay_sha256_compatible():
+    digest = hashlib.sha256("hello".encode("utf-8")).hexdigest()
+
+    assert text_hash("hello") == digest
+    assert _hash_seed("hello") == int(digest[:16], 16)
+
+
+def test_hash_embeddings_rows_do_not_depend_on_batch():
+    batch = _hash_embeddings(["goblin", "dragon"], 16)
+    single = _hash_embeddings(["dragon"], 16)
+
+    assert batch.shape == (2, 16)
+    assert np.array_equal(batch[1], single[0])
+    assert not np.array_equal(batch[0], batch[1])
+    assert ((batch >= -1.0) & (batch < 1.0)).all()
+
+
+def test_embed_query_reuses_vectors_per_provider_settings(settings_overrides, monkeypatch):
+    from dnd_summary import embeddings
+
+    settings_overrides(embedding_dimensions=8)
+    embeddings._cached_query_embedding.cache_clear()
+    calls: list[list[str]] = []
+    original = embeddings.embed_texts
+
+    def _record(texts):
+        calls.append(list(texts))
+        return original(texts)
+
+    monkeypatch.setattr(embeddings, "embed_texts", _record)
+
+    first = embed_query("where is the goblin")
+    second = embed_query("where is the goblin")
+    settings_overrides(embedding_dimensions=4)
+    resized = embed_query("where is the goblin")
+
+    assert second is first
+    assert not first.flags.writeable
+    assert len(resized) == 4
+    assert calls == [["where is the goblin"], ["where is the goblin"]]
+    embeddings._cached_query_embedding.cache_clear()
+
+
+def test_embed_query_caches_compact_float32_vectors(settings_overrides):
+    from dnd_summary import embeddings
+
+    settings_overrides(embedding_dimensions=8)
+    embeddings._cached_query_embedding.cache_clear()
+
+    vector = embed_query("goblin lair")
+    cached = embeddings._cached_query_embedding(embeddings._provider_key(), "goblin lair")
+
+    assert vector is cached
+    assert cached.dtype == np.float32
+    assert not cached.flags.writeable
+    assert vector.tolist() == pytest.approx(embed_texts(["goblin lair"])[0], rel=1e-6)
+    embeddings._cached_query_embedding.cache_clear()
+
+
+def test_provider_key_is_reused_until_settings_change(settings_overrides):
+    from dnd_summary import embeddings
+
+    settings_overrides(embedding_dimensions=8)
+    first = embeddings._provider_key()
+
+    assert embeddings._provider_key() is first
+
+    settings_overrides(embedding_dimensions=4)
+    resized = embeddings._provider_key()
+
+    assert resized is not first
+    assert resized[3] == 4
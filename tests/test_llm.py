@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from dnd_summary.llm import LLMClient
+
+
+class _FakeAsyncModels:
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.peak = 0
+
+    async def generate_content(self, *, model, contents, config):
+        prompt = contents[0].parts[0].text
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if prompt == "boom":
+                raise RuntimeError("bad prompt")
+            return SimpleNamespace(text=prompt.upper(), usage_metadata={"prompt": prompt})
+        finally:
+            self.in_flight -= 1
+
+
+def test_generate_many_bounds_concurrency_and_keeps_order(settings_overrides):
+    settings_overrides(gemini_api_key="test-key", llm_concurrency=2)
+    client = LLMClient()
+    models = _FakeAsyncModels()
+    client._client = SimpleNamespace(aio=SimpleNamespace(models=models))
+
+    results = asyncio.run(client.generate_many(["a", "boom", "c", "d"]))
+
+    assert [result.text for result in results] == ["A", "", "C", "D"]
+    assert results[0].usage == {"prompt": "a"}
+    assert isinstance(results[1].error, RuntimeError)
+    assert all(result.error is None for i, result in enumerate(results) if i != 1)
+    assert models.peak == 2
+
+
+def test_async_retries_sleep_without_blocking_other_calls(settings_overrides):
+    settings_overrides(
+        gemini_api_key="test-key",
+        llm_concurrency=4,
+        llm_max_retries=2,
+        llm_retry_min_seconds=0.2,
+        llm_retry_max_seconds=0.2,
+    )
+    client = LLMClient()
+    attempts: dict[str, int] = {}
+
+    class _FlakyModels:
+        async def generate_content(self, *, model, contents, config):
+            prompt = contents[0].parts[0].text
+            attempts[prompt] = attempts.get(prompt, 0) + 1
+            if attempts[prompt] == 1:
+                raise RuntimeError("transient")
+            return SimpleNamespace(text=prompt, usage_metadata=None)
+
+    client._client = SimpleNamespace(aio=SimpleNamespace(models=_FlakyModels()))
+    client._is_retryable = lambda exc: True
+
+    async def _run():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        results = await client.generate_many(["a", "b", "c", "d"])
+        return results, loop.time() - start
+
+    results, elapsed = asyncio.run(_run())
+
+    assert [result.text for result in results] == ["a", "b", "c", "d"]
+    assert attempts == {"a": 2, "b": 2, "c": 2, "d": 2}
+    # Four independent 0.2s backoffs overlap instead of adding up to 0.8s.
+    assert elapsed < 0.6
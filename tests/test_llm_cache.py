@@ -1,16 +1,21 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+from types import SimpleNamespace
 
 import pytest
+from sqlalchemy import event
 
 from dnd_summary.llm_cache import (
     CacheRequiredError,
+    _find_cached_transcript,
     _parse_datetime,
+    _usage_values,
     build_text_metrics,
     cache_hit_from_usage,
     cache_storage_cost,
     ensure_transcript_cache,
+    genai_client,
     record_llm_usage,
 )
 from dnd_summary.models import SessionExtraction
@@ -46,6 +51,9 @@ def test_parse_datetime_handles_strings():
     value = _parse_datetime("2024-01-01T00:00:00Z")
     assert value is not None
     assert value.tzinfo is not None
+    assert _parse_datetime("2024-01-01T00:00:00Z") is value
+    assert _parse_datetime("2024-01-01T00:00:00") == value
+    assert _parse_datetime("not a date") is None
 
 
 def test_build_text_metrics_counts_characters():
@@ -61,12 +69,37 @@ def test_cache_hit_from_usage_handles_dict():
     assert cache_hit_from_usage(usage, None) is False
 
 
+def test_usage_values_reads_dicts_objects_and_none():
+    keys = ("prompt_token_count", "total_token_count")
+
+    assert _usage_values({"prompt_token_count": 7}, keys) == (7, None)
+    assert _usage_values(SimpleNamespace(prompt_token_count=3, total_token_count=9), keys) == (3, 9)
+    assert _usage_values(None, keys) == (None, None)
+
+
 def test_cache_storage_cost_handles_zero():
     assert cache_storage_cost(None, 3600) is None
     assert cache_storage_cost(0, 3600) is None
     assert cache_storage_cost(100, 0) is None
 
 
+def test_genai_client_is_shared_per_api_key(settings_overrides, monkeypatch):
+    created: list[str | None] = []
+
+    def _factory(api_key=None):
+        created.append(api_key)
+        return object()
+
+    monkeypatch.setattr("dnd_summary.llm_cache.genai.Client", _factory)
+    settings_overrides(gemini_api_key="key-a")
+    first = genai_client()
+    assert genai_client() is first
+
+    settings_overrides(gemini_api_key="key-b")
+    assert genai_client() is not first
+    assert created == ["key-a", "key-b"]
+
+
 def test_ensure_transcript_cache_disabled(db_session, settings_overrides):
     settings_overrides(enable_explicit_cache=False, require_transcript_cache=False)
     campaign = create_campaign(db_session)
@@ -126,6 +159,30 @@ def test_ensure_transcript_cache_returns_existing(db_session, settings_overrides
     assert "cached" in block
 
 
+def test_find_cached_transcript_skips_stale_records(db_session, settings_overrides):
+    settings_overrides(gemini_model="test-model", transcript_format_version="timecode_v1")
+    campaign = create_campaign(db_session)
+    session_obj = create_session(db_session, campaign=campaign)
+    run = create_run(db_session, campaign=campaign, session_obj=session_obj, transcript_hash="hash")
+    base = {"transcript_hash": "hash", "format_version": "timecode_v1"}
+    payloads = [
+        {**base, "cache_name": "cache-valid", "expires_at": "2999-01-01T00:00:00Z"},
+        {**base, "cache_name": "cache-expired", "expires_at": "2000-01-01T00:00:00Z"},
+        {**base, "cache_name": "cache-invalidated", "invalidated": True},
+        {**base, "cache_name": "cache-other-hash", "transcript_hash": "other"},
+        {**base, "cache_name": "cache-old-format", "format_version": "v0"},
+        {**base, "cache_name": None},
+    ]
+    for offset, payload in enumerate(payloads):
+        record = create_session_extraction(
+            db_session, run=run, session_obj=session_obj, kind="transcript_cache", payload=payload
+        )
+        record.created_at = datetime(2024, 1, 1, 0, offset)
+    db_session.commit()
+
+    assert _find_cached_transcript(db_session, run) == "cache-valid"
+
+
 def test_ensure_transcript_cache_creates_new(db_session, settings_overrides, monkeypatch):
     settings_overrides(enable_explicit_cache=True, require_transcript_cache=False, gemini_api_key="key")
     campaign = create_campaign(db_session)
@@ -149,6 +206,63 @@ def test_ensure_transcript_cache_creates_new(db_session, settings_overrides, mon
         .one()
     )
     assert record.payload["cache_name"] == "cache-123"
+    assert record.payload["token_count"] == 200
+    assert record.payload["token_estimate"] >= 1
+    assert record.payload["storage_cost_usd"] == cache_storage_cost(200, 3600)
+
+
+def test_ensure_transcript_cache_estimates_cost_without_usage(
+    db_session, settings_overrides, monkeypatch
+):
+    settings_overrides(
+        enable_explicit_cache=True,
+        require_transcript_cache=False,
+        gemini_api_key="key",
+        cache_ttl_seconds=3600,
+    )
+    campaign = create_campaign(db_session)
+    session_obj = create_session(db_session, campaign=campaign)
+    run = create_run(db_session, campaign=campaign, session_obj=session_obj, transcript_hash="hash")
+    db_session.commit()
+    cache = DummyCache()
+    cache.usage_metadata = None
+    monkeypatch.setattr(
+        "dnd_summary.llm_cache.genai.Client",
+        lambda api_key=None: DummyClient(cache),
+    )
+
+    ensure_transcript_cache(db_session, run, "x" * 4000)
+
+    payload = db_session.query(SessionExtraction).filter_by(kind="transcript_cache").one().payload
+    assert payload["token_count"] is None
+    assert payload["token_estimate"] > 1000
+    assert payload["storage_cost_usd"] == cache_storage_cost(payload["token_estimate"], 3600)
+
+
+def test_ensure_transcript_cache_skips_small_transcripts(
+    db_session, settings_overrides, monkeypatch
+):
+    settings_overrides(
+        enable_explicit_cache=True,
+        require_transcript_cache=False,
+        gemini_api_key="key",
+        cache_min_tokens=100,
+    )
+    campaign = create_campaign(db_session)
+    session_obj = create_session(db_session, campaign=campaign)
+    run = create_run(db_session, campaign=campaign, session_obj=session_obj, transcript_hash="hash")
+    db_session.commit()
+
+    def _unexpected(api_key=None):
+        raise AssertionError("cache should not be created")
+
+    monkeypatch.setattr("dnd_summary.llm_cache.genai.Client", _unexpected)
+
+    cache_name, block = ensure_transcript_cache(db_session, run, "hello")
+
+    assert cache_name is None
+    assert block.endswith("hello")
+    assert db_session.query(SessionExtraction).count() == 0
 
 
 def test_record_llm_usage_persists_costs(db_session):
@@ -181,3 +295,37 @@ def test_record_llm_usage_persists_costs(db_session):
     )
     assert record.payload["call_kind"] == "extract"
     assert record.payload["cache_hit"] is True
+
+
+def test_record_llm_usage_rows_flush_as_one_insert(db_session, db_engine):
+    campaign = create_campaign(db_session)
+    session_obj = create_session(db_session, campaign=campaign)
+    run = create_run(db_session, campaign=campaign, session_obj=session_obj, transcript_hash="hash")
+    db_session.commit()
+
+    for kind in ("summary_text", "summary_player", "summary_dm"):
+        record_llm_usage(
+            db_session,
+            run_id=run.id,
+            session_id=session_obj.id,
+            prompt_id=kind,
+            prompt_version="1",
+            call_kind=kind,
+            usage={"prompt_token_count": 10, "candidates_token_count": 5},
+            cache_name=None,
+        )
+
+    statements: list[tuple[str, bool]] = []
+
+    def _capture(_conn, _cursor, statement, _params, _context, executemany):
+        statements.append((statement, executemany))
+
+    event.listen(db_engine, "before_cursor_execute", _capture)
+    try:
+        db_session.flush()
+    finally:
+        event.remove(db_engine, "before_cursor_execute", _capture)
+
+    inserts = [entry for entry in statements if entry[0].startswith("INSERT")]
+    assert len(inserts) == 1
+    assert inserts[0][1] is True
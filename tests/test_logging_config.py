@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import json
+import logging
+import sys
+from datetime import datetime
+
+from dnd_summary.logging_config import JsonFormatter
+
+
+def _record(message: str, exc_info=None) -> logging.LogRecord:
+    return logging.LogRecord("dnd_summary.test", logging.INFO, __file__, 1, message, None, exc_info)
+
+
+def test_json_formatter_emits_one_json_object():
+    line = JsonFormatter().format(_record("Saw the dragon é"))
+
+    payload = json.loads(line)
+    assert payload["level"] == "INFO"
+    assert payload["logger"] == "dnd_summary.test"
+    assert payload["message"] == "Saw the dragon é"
+    assert datetime.fromisoformat(payload["ts"]).utcoffset().total_seconds() == 0
+    assert "exc_info" not in payload
+
+
+def test_json_formatter_includes_exception_text():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = _record("failed", exc_info=sys.exc_info())
+
+    payload = json.loads(JsonFormatter().format(record))
+
+    assert "ValueError: boom" in payload["exc_info"]
+
+
+def test_json_formatter_reuses_cached_exception_text(monkeypatch):
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = _record("failed", exc_info=sys.exc_info())
+    formatter = JsonFormatter()
+    first = json.loads(formatter.format(record))
+
+    def _fail(_exc_info):
+        raise AssertionError("traceback formatted twice")
+
+    monkeypatch.setattr(formatter, "formatException", _fail)
+    second = json.loads(formatter.format(record))
+
+    assert second["exc_info"] == first["exc_info"] == record.exc_text
+
+
+def test_json_formatter_falls_back_on_lone_surrogates():
+    line = JsonFormatter().format(_record("bad byte \udcff"))
+
+    payload = json.loads(line)
+    assert payload["message"] == "bad byte \udcff"
+    assert datetime.fromisoformat(payload["ts"]).utcoffset().total_seconds() == 0
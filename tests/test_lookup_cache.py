@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from dnd_summary.lookup_cache import CampaignLookupCache
+
+
+def test_lookup_cache_reuses_loaded_value():
+    cache: CampaignLookupCache[dict] = CampaignLookupCache()
+    calls: list[str] = []
+
+    def _load() -> dict:
+        calls.append("load")
+        return {"a": 1}
+
+    assert cache.get_or_load("c1", _load) == {"a": 1}
+    assert cache.get_or_load("c1", _load) == {"a": 1}
+    assert calls == ["load"]
+
+    cache.invalidate("c1")
+    cache.get_or_load("c1", _load)
+    assert calls == ["load", "load"]
+
+
+def test_lookup_cache_evicts_least_recently_used():
+    cache: CampaignLookupCache[str] = CampaignLookupCache(maxsize=2)
+    cache.get_or_load("c1", lambda: "one")
+    cache.get_or_load("c2", lambda: "two")
+    cache.get_or_load("c1", lambda: "stale")
+    cache.get_or_load("c3", lambda: "three")
+
+    assert cache.get_or_load("c1", lambda: "reloaded") == "one"
+    assert cache.get_or_load("c2", lambda: "reloaded") == "reloaded"
+
+
+def test_lookup_cache_disabled_with_zero_ttl(settings_overrides):
+    settings_overrides(campaign_lookup_cache_ttl_seconds=0)
+    cache: CampaignLookupCache[int] = CampaignLookupCache()
+    values = iter([1, 2])
+
+    assert cache.get_or_load("c1", lambda: next(values)) == 1
+    assert cache.get_or_load("c1", lambda: next(values)) == 2
+
+
+def test_lookup_cache_invalidates_after_commit(db_session):
+    cache: CampaignLookupCache[str] = CampaignLookupCache()
+    cache.get_or_load("c1", lambda: "old")
+
+    cache.invalidate_after_commit(db_session, "c1")
+    cache.invalidate_after_commit(db_session, "c1")
+    assert cache.get_or_load("c1", lambda: "early") == "old"
+
+    db_session.commit()
+    assert cache.get_or_load("c1", lambda: "new") == "new"
+
+    db_session.commit()
+    assert cache.get_or_load("c1", lambda: "newer") == "new"
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dnd_summary.mappings import load_character_map
+from dnd_summary.mappings import invalidate_character_map, load_character_map
 from dnd_summary.models import ParticipantCharacter
 from tests.factories import create_campaign, create_entity, create_participant
 
@@ -15,3 +15,35 @@ def test_load_character_map_returns_player_characters(db_session):
     mapping = load_character_map(db_session, campaign.id)
 
     assert mapping == {"Lia": "Lia Sun"}
+
+
+def test_load_character_map_is_cached_until_invalidated(db_session):
+    campaign = create_campaign(db_session)
+    participant = create_participant(db_session, campaign=campaign, display_name="Lia")
+    entity = create_entity(db_session, campaign=campaign, name="Lia Sun", entity_type="character")
+    db_session.commit()
+
+    assert load_character_map(db_session, campaign.id) == {}
+
+    db_session.add(ParticipantCharacter(participant_id=participant.id, entity_id=entity.id))
+    db_session.commit()
+
+    assert load_character_map(db_session, campaign.id) == {}
+    invalidate_character_map(campaign.id)
+    assert load_character_map(db_session, campaign.id) == {"Lia": "Lia Sun"}
+
+
+def test_load_character_map_binds_each_campaign(db_session):
+    maps = {}
+    for slug, player, character in (("one", "Lia", "Lia Sun"), ("two", "Bo", "Bo Stone")):
+        campaign = create_campaign(db_session, slug=slug, name=slug)
+        participant = create_participant(db_session, campaign=campaign, display_name=player)
+        entity = create_entity(
+            db_session, campaign=campaign, name=character, entity_type="character"
+        )
+        db_session.add(ParticipantCharacter(participant_id=participant.id, entity_id=entity.id))
+        maps[campaign.id] = {player: character}
+    db_session.commit()
+
+    for campaign_id, expected in maps.items():
+        assert load_character_map(db_session, campaign_id) == expected
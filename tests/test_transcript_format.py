@@ -10,6 +10,7 @@ from dnd_summary.schemas import (
 )
 from dnd_summary.transcript_format import (
     format_transcript,
+    format_transcript_lines,
     map_event_extraction_utterance_ids,
     map_quote_extraction_utterance_ids,
     map_session_facts_utterance_ids,
@@ -47,6 +48,23 @@ def test_format_transcript_generates_timecode_keys():
     assert id_map["00:00:01"] == "utt-3"
 
 
+def test_format_transcript_lines_matches_joined_transcript():
+    alice = DummyParticipant(display_name="Alice")
+    bob = DummyParticipant(display_name="Bob")
+    utterances = [
+        DummyUtterance(id="utt-1", start_ms=0, text="Hello", participant=alice),
+        DummyUtterance(id="utt-2", start_ms=0, text="Hi\nthere", participant=bob),
+        DummyUtterance(id="utt-3", start_ms=1000, text="Yo", participant=alice),
+    ]
+
+    lines, timecodes = format_transcript_lines(utterances, {"Alice": "Lia Sun"})
+    transcript, id_map = format_transcript(utterances, {"Alice": "Lia Sun"})
+
+    assert lines == transcript.splitlines()
+    assert lines[0] == "[00:00:00#1] Lia Sun: Hello"
+    assert timecodes == {utt_id: key for key, utt_id in id_map.items()}
+
+
 def test_map_session_facts_updates_evidence_ids():
     id_map = {"00:00:00": "utt-1", "00:00:01#1": "utt-2"}
     facts = SessionFacts(